@@ -12,12 +12,23 @@ INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PA
 IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
 TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, CancelledError, wait
+from itertools import islice
+
 from knapsack.greedyNdKnapsack import greedyKnapsackNdSolver
+from knapsack.integerScaling import integerScaling, integerScalingNd, integerScalingPartition
+from knapsack.meetInTheMiddle import meetInTheMiddleSolver
 from knapsack.paretoPoint import paretoPoint0
 from knapsack.subsKnapsack import *
 from knapsack.knapsack import *
 from knapsack.knapsackNd import *
 from knapsack.subsetSumParetoSolver import subsetSumParetoSolver
+from knapsack.subsetSumBitsetSolver import subsetSumBitsetSolver
 from knapsack.wPoint import *
 from flags.flags import *
 
@@ -25,7 +36,7 @@ from flags.flags import *
 from partition.partitionN import partitionSolver
 
 
-def subsKnapsack(size, items, iterCounter):
+def subsKnapsack(size, items, iterCounter, useBitset=False, cancellation=None):
     """
     The subset sum knapsack API.
 
@@ -35,20 +46,34 @@ def subsKnapsack(size, items, iterCounter):
     :type items: items int or decimal
     :param iterCounter: iteration counter
     :type iterCounter: array
+    :param useBitset: solve int instances using shift-or over big int reachability set instead of DP
+    :type useBitset: bool
+    :param cancellation: event like object, the solver raises CancelledError at the next item layer once it is set
+    :type cancellation: threading.Event
 
     :return: bestValue, bestItems
     """
-    solver = subsetSumKnapsackSolver(size, items, iterCounter, forceUseLimits=False)
+    scaling = integerScaling(size, items)
+    isScaled = doUseIntegerScaling and scaling.tryScale()
+
+    solverType = subsetSumBitsetSolver if useBitset else subsetSumKnapsackSolver
+
+    solver = solverType(scaling.scaledSize, scaling.scaledItems, iterCounter, forceUseLimits=False)
 
     solver.printInfo = printPct
+    solver.cancellation = cancellation
     solver.printSuperIncreasingInfo = verbose
     solver.doSolveSuperInc = doSolveSuperInc
     solver.doUseLimits = doUseLimits
 
     bestValue, bestItems = solver.solve()
+
+    if isScaled:
+        return scaling.restoreItems(bestItems)
+
     return bestValue, bestItems
 
-def knapsack(size, items, values, iterCounter):
+def knapsack(size, items, values, iterCounter, useDenseDp=True, useItemReduction=False, useDominanceReduction=False, cancellation=None, observer=None):
     """
     The 1/0 knapsack API.
 
@@ -64,22 +89,49 @@ def knapsack(size, items, values, iterCounter):
     :param iterCounter: iteration counter
     :type iterCounter: array
 
+    :param useDenseDp: solves int instances, which sparse DP layers would fill densely, by the rolling profit array indexed by capacity, False turns it off
+    :type useDenseDp: bool
+
+    :param useItemReduction: removes items fixed in or out by the greedy solution bounds before solving
+    :type useItemReduction: bool
+
+    :param useDominanceReduction: removes dominated items and collapses duplicate items before solving
+    :type useDominanceReduction: bool
+
+    :param cancellation: event like object, the solver raises CancelledError at the next item layer once it is set
+    :type cancellation: threading.Event
+
+    :param observer: the solver calls observer.onLayer once per item layer of DP or pareto loop
+    :type observer: layerObserver
+
     :return: bestValue, bestSize, bestItems, bestValues
     """
 
-    solver = knapsackSolver(size, items, values, iterCounter, forceUseLimits=False)
+    scaling = integerScaling(size, items, values)
+    isScaled = doUseIntegerScaling and scaling.tryScale()
+
+    solver = knapsackSolver(scaling.scaledSize, scaling.scaledItems, scaling.scaledValues, iterCounter, forceUseLimits=False)
 
     solver.forceUseDpSolver = True
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
+    solver.useDenseDp = useDenseDp
+    solver.useItemReduction = useItemReduction
+    solver.useDominanceReduction = useDominanceReduction
     solver.printSuperIncreasingInfo = verbose
     solver.doSolveSuperInc = doSolveSuperInc
     solver.doUseLimits = doUseLimits
 
     bestValue, bestSize, bestItems, bestValues, bestIndexes = solver.solve()
+
+    if isScaled:
+        return scaling.restore(bestIndexes)
+
     return bestValue, bestSize, bestItems, bestValues
 
 
-def hybridKnapsack(size, items, values, iterCounter):
+def hybridKnapsack(size, items, values, iterCounter, useExpandingCore=False, useMeetInTheMiddle=False, useDenseDp=True, useItemReduction=False, useDominanceReduction=False, cancellation=None, observer=None):
     """
     The KB hybrid 1/0 knapsack API. For worst case it calls Pareto solver.
 
@@ -95,22 +147,90 @@ def hybridKnapsack(size, items, values, iterCounter):
     :param iterCounter: iteration counter
     :type iterCounter: array
 
+    :param useExpandingCore: solves int instances by the expanding core around the greedy break item
+    :type useExpandingCore: bool
+
+    :param useMeetInTheMiddle: solves instances up to 60 items with more than 2^20 possible points by meet in the middle
+    :type useMeetInTheMiddle: bool
+
+    :param useDenseDp: solves int instances, which sparse DP layers would fill densely, by the rolling profit array indexed by capacity, False turns it off
+    :type useDenseDp: bool
+
+    :param useItemReduction: removes items fixed in or out by the greedy solution bounds before solving
+    :type useItemReduction: bool
+
+    :param useDominanceReduction: removes dominated items and collapses duplicate items before solving
+    :type useDominanceReduction: bool
+
+    :param cancellation: event like object, the solver raises CancelledError at the next item layer once it is set
+    :type cancellation: threading.Event
+
+    :param observer: the solver calls observer.onLayer once per item layer of DP or pareto loop
+    :type observer: layerObserver
+
     :return: bestValue, bestSize, bestItems, bestValues
     """
 
-    solver = knapsackSolver(size, items, values, iterCounter, forceUseLimits=False)
+    scaling = integerScaling(size, items, values)
+    isScaled = doUseIntegerScaling and scaling.tryScale()
+
+    solver = knapsackSolver(scaling.scaledSize, scaling.scaledItems, scaling.scaledValues, iterCounter, forceUseLimits=False)
 
     solver.forceUseDpSolver = False
+    solver.useExpandingCore = useExpandingCore
+    solver.useMeetInTheMiddle = useMeetInTheMiddle
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
+    solver.useDenseDp = useDenseDp
+    solver.useItemReduction = useItemReduction
+    solver.useDominanceReduction = useDominanceReduction
     solver.printSuperIncreasingInfo = verbose
     solver.doSolveSuperInc = doSolveSuperInc
     solver.doUseLimits = doUseLimits
 
     bestValue, bestSize, bestItems, bestValues, bestIndexes = solver.solve()
+
+    if isScaled:
+        return scaling.restore(bestIndexes)
+
     return bestValue, bestSize, bestItems, bestValues
 
 
-def paretoKnapsack(size, items, values, iterCounter, useRatioSort=False):
+def meetInTheMiddleKnapsack(size, items, values, iterCounter, cancellation=None):
+    """
+    The Horowitz-Sahni meet in the middle 1/0 knapsack API. It enumerates pareto fronts of two item halves,
+    so it is exponential in N / 2 and does not depend on weight values. Use it for small N and huge or rational weights.
+
+    :param size: size of knapsack
+    :type size: int or decimal
+
+    :param items: knapsack items
+    :type items: items int or decimal
+
+    :param values: knapsack values
+    :type values: items int or decimal
+
+    :param iterCounter: iteration counter
+    :type iterCounter: array
+
+    :param cancellation: event like object, the solver raises CancelledError at the next item of half fronts once it is set
+    :type cancellation: threading.Event
+
+    :return: bestValue, bestSize, bestItems, bestValues
+    """
+
+    solver = meetInTheMiddleSolver(size, items, values, iterCounter)
+
+    solver.printInfo = printPct
+    solver.cancellation = cancellation
+
+    bestValue, bestSize, bestIndexes = solver.solve()
+
+    return bestValue, bestSize, [items[i] for i in bestIndexes], [values[i] for i in bestIndexes]
+
+
+def paretoKnapsack(size, items, values, iterCounter, useRatioSort=False, useColumnFront=False, useVectorizedMerge=False, useUpperBoundPruning=False, useItemReduction=False, useDominanceReduction=False, parallelShardCount=0, parallelExecutor=None, cancellation=None, observer=None, timeLimit=0, iterationLimit=0):
     """
     The KB Pareto solver API.
 
@@ -129,23 +249,79 @@ def paretoKnapsack(size, items, values, iterCounter, useRatioSort=False):
     :param useRatioSort: which sorting behaviour use ratio or dimension ASC
     :type useRatioSort: bool
 
-    :return: bestValue, bestSize, bestItems, bestValues, bestIndexes
+    :param useColumnFront: keep pareto fronts as weight, profit and source link columns instead of point objects
+    :type useColumnFront: bool
+
+    :param useVectorizedMerge: keep pareto fronts as columns and merge them by NumPy array kernels, needs numpy installed
+    :type useVectorizedMerge: bool
+
+    :param useUpperBoundPruning: drop points that cannot beat the best profit with LP relaxation bound of items left
+    :type useUpperBoundPruning: bool
+
+    :param useItemReduction: removes items fixed in or out by the greedy solution bounds before solving
+    :type useItemReduction: bool
+
+    :param useDominanceReduction: removes dominated items and collapses duplicate items before solving
+    :type useDominanceReduction: bool
+
+    :param parallelShardCount: number of item shards which pareto fronts are built in separate processes, 0 is serial
+    :type parallelShardCount: int
+
+    :param parallelExecutor: process pool to reuse for shards, the new pool is created for each solve if it is not given
+    :type parallelExecutor: concurrent.futures.ProcessPoolExecutor
+
+    :param cancellation: event like object, the solver raises CancelledError at the next item layer once it is set
+    :type cancellation: threading.Event
+
+    :param observer: the solver calls observer.onLayer once per item layer of DP or pareto loop
+    :type observer: layerObserver
+
+    :param timeLimit: seconds to solve, the best solution found so far is returned once it is exceeded, 0 is unlimited
+    :type timeLimit: float
+
+    :param iterationLimit: iterations to solve, the best solution found so far is returned once it is exceeded, 0 is unlimited
+    :type iterationLimit: int
+
+    :return: bestValue, bestSize, bestItems, bestValues, and isOptimal flag if timeLimit or iterationLimit is given
     """
 
-    paretoItems = [wPoint1(item) for item in items]
+    scaling = integerScaling(size, items, values)
+    isScaled = doUseIntegerScaling and scaling.tryScale()
+
+    paretoItems = [wPoint1(item) for item in scaling.scaledItems]
 
-    solver = knapsackParetoSolver(paretoItems, values, range(len(values)), wPoint1(size), paretoPoint1(0, 0),
+    solver = knapsackParetoSolver(paretoItems, scaling.scaledValues, range(len(values)), wPoint1(scaling.scaledSize), paretoPoint1(0, 0),
                                   wPoint1(0), iterCounter)
 
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
+    solver.useItemReduction = useItemReduction
+    solver.useDominanceReduction = useDominanceReduction
     solver.forceUsePareto = True
     solver.useRatioSort = useRatioSort
+    solver.useColumnFront = useColumnFront
+    solver.useVectorizedMerge = useVectorizedMerge
+    solver.useUpperBoundPruning = useUpperBoundPruning
+    solver.parallelShardCount = parallelShardCount
+    solver.parallelExecutor = parallelExecutor
+    solver.deadline = time.perf_counter() + timeLimit if timeLimit else 0
+    solver.iterationLimit = iterationLimit
 
     bestValue, bestSize, bestItems, bestValues, bestIndexes = solver.solve()
-    return bestValue, bestSize.getDimension(0), bestItems, bestValues
+
+    if isScaled:
+        result = scaling.restore(bestIndexes)
+    else:
+        result = bestValue, bestSize.getDimension(0), bestItems, bestValues
+
+    if timeLimit or iterationLimit:
+        return result + (solver.isOptimal,)
+
+    return result
 
 
-def hybridParetoKnapsack(size, items, values, iterCounter, useRatioSort=False):
+def hybridParetoKnapsack(size, items, values, iterCounter, useRatioSort=False, useColumnFront=False, useVectorizedMerge=False, useUpperBoundPruning=False, useItemReduction=False, useDominanceReduction=False, cancellation=None, observer=None):
     """
     The hybrid KB/Pareto solver API. It calls KB solver for worst cases of Pareto.
 
@@ -164,23 +340,58 @@ def hybridParetoKnapsack(size, items, values, iterCounter, useRatioSort=False):
     :param useRatioSort: which sorting behaviour use ratio or dimension ASC
     :type useRatioSort: bool
 
+    :param useColumnFront: keep pareto fronts as weight, profit and source link columns instead of point objects
+    :type useColumnFront: bool
+
+    :param useVectorizedMerge: keep pareto fronts as columns and merge them by NumPy array kernels, needs numpy installed
+    :type useVectorizedMerge: bool
+
+    :param useUpperBoundPruning: drop points that cannot beat the best profit with LP relaxation bound of items left
+    :type useUpperBoundPruning: bool
+
+    :param useItemReduction: removes items fixed in or out by the greedy solution bounds before solving
+    :type useItemReduction: bool
+
+    :param useDominanceReduction: removes dominated items and collapses duplicate items before solving
+    :type useDominanceReduction: bool
+
+    :param cancellation: event like object, the solver raises CancelledError at the next item layer once it is set
+    :type cancellation: threading.Event
+
+    :param observer: the solver calls observer.onLayer once per item layer of DP or pareto loop
+    :type observer: layerObserver
+
     :return: bestValue, bestSize, bestItems, bestValues, bestIndexes
     """
 
-    paretoItems = [wPoint1(item) for item in items]
+    scaling = integerScaling(size, items, values)
+    isScaled = doUseIntegerScaling and scaling.tryScale()
 
-    solver = knapsackParetoSolver(paretoItems, values, range(len(values)), wPoint1(size), paretoPoint1(0, 0),
+    paretoItems = [wPoint1(item) for item in scaling.scaledItems]
+
+    solver = knapsackParetoSolver(paretoItems, scaling.scaledValues, range(len(values)), wPoint1(scaling.scaledSize), paretoPoint1(0, 0),
                                   wPoint1(0), iterCounter)
 
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
+    solver.useItemReduction = useItemReduction
+    solver.useDominanceReduction = useDominanceReduction
     solver.forceUsePareto = False
     solver.useRatioSort = useRatioSort
+    solver.useColumnFront = useColumnFront
+    solver.useVectorizedMerge = useVectorizedMerge
+    solver.useUpperBoundPruning = useUpperBoundPruning
 
     bestValue, bestSize, bestItems, bestValues, bestIndexes = solver.solve()
+
+    if isScaled:
+        return scaling.restore(bestIndexes)
+
     return bestValue, bestSize.getDimension(0), bestItems, bestValues
 
 
-def subsParetoKnapsack(size, items, iterCounter):
+def subsParetoKnapsack(size, items, iterCounter, cancellation=None, observer=None):
     """
     The subset sum knapsack KB pareto API.
 
@@ -191,21 +402,36 @@ def subsParetoKnapsack(size, items, iterCounter):
     :param iterCounter: iteration counter
     :type iterCounter: array
 
+    :param cancellation: event like object, the solver raises CancelledError at the next item layer once it is set
+    :type cancellation: threading.Event
+
+    :param observer: the solver calls observer.onLayer once per item layer of DP or pareto loop
+    :type observer: layerObserver
+
     :return: bestValue, bestItems
     """
 
-    solver = subsetSumParetoSolver(size, items, iterCounter, forceUseLimits=False)
+    scaling = integerScaling(size, items)
+    isScaled = doUseIntegerScaling and scaling.tryScale()
+
+    solver = subsetSumParetoSolver(scaling.scaledSize, scaling.scaledItems, iterCounter, forceUseLimits=False)
 
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
     solver.printSuperIncreasingInfo = verbose
     solver.doSolveSuperInc = doSolveSuperInc
     solver.doUseLimits = doUseLimits
 
     bestValue, bestItems = solver.solve()
+
+    if isScaled:
+        return scaling.restoreItems(bestItems)
+
     return bestValue, bestItems
 
 
-def knapsackNd(constraints, items, values, iterCounter):
+def knapsackNd(constraints, items, values, iterCounter, useItemReduction=False, useDominanceReduction=False, cancellation=None, observer=None):
     """
     The N dimensional DP knapsack solver API.
 
@@ -221,23 +447,46 @@ def knapsackNd(constraints, items, values, iterCounter):
     :param iterCounter: iteration counter
     :type iterCounter: array
 
+    :param useItemReduction: removes items fixed in or out by the greedy solution bounds before solving
+    :type useItemReduction: bool
+
+    :param useDominanceReduction: removes dominated items and collapses duplicate items before solving
+    :type useDominanceReduction: bool
+
+    :param cancellation: event like object, the solver raises CancelledError at the next item layer once it is set
+    :type cancellation: threading.Event
+
+    :param observer: the solver calls observer.onLayer once per item layer of DP or pareto loop
+    :type observer: layerObserver
+
     :return: bestValue, bestSize, bestItems, bestValues
     """
 
-    solver = knapsackNSolver(constraints, items, values, iterCounter, wPoint([0] * constraints.getSize()), forceUseLimits=False)
+    scaling = integerScalingNd(constraints, items, values)
+    isScaled = doUseIntegerScaling and scaling.tryScale()
+
+    solver = knapsackNSolver(scaling.scaledConstraints, scaling.scaledItems, scaling.scaledValues, iterCounter, wPoint([0] * constraints.getSize()), forceUseLimits=False)
 
     solver.forceUseDpSolver = True
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
+    solver.useItemReduction = useItemReduction
+    solver.useDominanceReduction = useDominanceReduction
     solver.printDpInfo = printPct
     solver.printSuperIncreasingInfo = verbose
     solver.doSolveSuperInc = doSolveSuperInc
     solver.doUseLimits = doUseLimits
 
     bestValue, bestSize, bestItems, bestValues = solver.solve()
+
+    if isScaled:
+        return scaling.restore(bestItems, bestValues)
+
     return bestValue, bestSize, bestItems, bestValues
 
 
-def hybridKnapsackNd(constraints, items, values, iterCounter):
+def hybridKnapsackNd(constraints, items, values, iterCounter, useItemReduction=False, useDominanceReduction=False, cancellation=None, observer=None):
     """
     The N dimensional DP knapsack solver API. For worst case calls the pareto solvers for each dimension and performs DP
     over union of each dimension results. Exits when each dimension gives less than maximum found.
@@ -254,22 +503,45 @@ def hybridKnapsackNd(constraints, items, values, iterCounter):
     :param iterCounter: iteration counter
     :type iterCounter: array
 
+    :param useItemReduction: removes items fixed in or out by the greedy solution bounds before solving
+    :type useItemReduction: bool
+
+    :param useDominanceReduction: removes dominated items and collapses duplicate items before solving
+    :type useDominanceReduction: bool
+
+    :param cancellation: event like object, the solver raises CancelledError at the next item layer once it is set
+    :type cancellation: threading.Event
+
+    :param observer: the solver calls observer.onLayer once per item layer of DP or pareto loop
+    :type observer: layerObserver
+
     :return: bestValue, bestSize, bestItems, bestValues
     """
 
-    solver = knapsackNSolver(constraints, items, values, iterCounter, wPoint([0] * constraints.getSize()), forceUseLimits=False)
+    scaling = integerScalingNd(constraints, items, values)
+    isScaled = doUseIntegerScaling and scaling.tryScale()
+
+    solver = knapsackNSolver(scaling.scaledConstraints, scaling.scaledItems, scaling.scaledValues, iterCounter, wPoint([0] * constraints.getSize()), forceUseLimits=False)
 
     solver.forceUseDpSolver = False
     solver.useParetoAsNGreedySolver = True
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
+    solver.useItemReduction = useItemReduction
+    solver.useDominanceReduction = useDominanceReduction
     solver.printSuperIncreasingInfo = verbose
     solver.doSolveSuperInc = doSolveSuperInc
     solver.doUseLimits = doUseLimits
 
     bestValue, bestSize, bestItems, bestValues = solver.solve()
+
+    if isScaled:
+        return scaling.restore(bestItems, bestValues)
+
     return bestValue, bestSize, bestItems, bestValues
 
-def greedyKnapsackNd(constraints, items, values, iterCounter):
+def greedyKnapsackNd(constraints, items, values, iterCounter, parallelWorkersCount=0, timeLimit=0, iterationLimit=0, cancellation=None):
     """
     The N dimensional greedy knapsack solver API.
 
@@ -285,21 +557,53 @@ def greedyKnapsackNd(constraints, items, values, iterCounter):
     :param iterCounter: iteration counter
     :type iterCounter: array
 
-    :return: bestValue, bestSize, bestItems, bestValues
+    :param parallelWorkersCount: number of processes which solve dimensions and attempts in parallel, 0 is sequential
+    :type parallelWorkersCount: int
+
+    :param timeLimit: seconds to solve, no new attempt is started once it is exceeded, 0 is unlimited
+    :type timeLimit: float
+
+    :param iterationLimit: iterations to solve, no new attempt is started once it is exceeded, 0 is unlimited
+    :type iterationLimit: int
+
+    :param cancellation: event like object, the solver raises CancelledError at the next dimension or attempt once it is set
+    :type cancellation: threading.Event
+
+    :return: bestValue, bestSize, bestItems, bestValues, and isOptimal flag if timeLimit or iterationLimit is given
     """
 
-    solver = greedyKnapsackNdSolver(constraints, items, values, iterCounter, wPoint([0] * constraints.getSize()))
+    scaling = integerScalingNd(constraints, items, values)
+    isScaled = doUseIntegerScaling and scaling.tryScale()
+
+    solver = greedyKnapsackNdSolver(scaling.scaledConstraints, scaling.scaledItems, scaling.scaledValues, iterCounter, wPoint([0] * constraints.getSize()))
 
     solver.printInfo = printPct
     solver.printSuperIncreasingInfo = verbose
     solver.doSolveSuperInc = doSolveSuperInc
     solver.doUseLimits = doUseLimits
+    solver.deadline = time.perf_counter() + timeLimit if timeLimit else 0
+    solver.iterationLimit = iterationLimit
+    solver.cancellation = cancellation
+
+    if parallelWorkersCount > 0:
+        with ProcessPoolExecutor(max_workers=parallelWorkersCount) as executor:
+            solver.executor = executor
+            solver.speculativeAttemptsCount = parallelWorkersCount
+
+            bestValue, bestSize, bestItems, bestValues = solver.solve()
+    else:
+        bestValue, bestSize, bestItems, bestValues = solver.solve()
+
+    if isScaled:
+        bestValue, bestSize, bestItems, bestValues = scaling.restore(bestItems, bestValues)
+
+    if timeLimit or iterationLimit:
+        return bestValue, bestSize, bestItems, bestValues, solver.isOptimal
 
-    bestValue, bestSize, bestItems, bestValues = solver.solve()
     return bestValue, bestSize, bestItems, bestValues
 
 
-def partitionN(items, sizesOrPartitions, groupSize, iterCounter, optimizationLimit=-1):
+def partitionN(items, sizesOrPartitions, groupSize, iterCounter, optimizationLimit=-1, useBitsetGrouping=False, multiStartCount=0, multiStartSeed=0, timeLimit=0, iterationLimit=0, cancellation=None):
     """
     The N partition solver API. It divides items given by equal sums. Number of partitions with equal sums is given by parameter.
     The array of custom sums can be passed instead of partitions. We can set up the count of items in group via parameter.
@@ -319,20 +623,54 @@ def partitionN(items, sizesOrPartitions, groupSize, iterCounter, optimizationLim
     :param optimizationLimit: iteration counter
     :type optimizationLimit: int
 
-    :return: quotients, reminder, optimizationCount
+    :param useBitsetGrouping: use bitset subset sum solver for int grouping without group size
+    :type useBitsetGrouping: bool
+
+    :param multiStartCount: number of independently seeded optimization runs in the process pool, the first run that empties reminder wins
+    :type multiStartCount: int
+
+    :param multiStartSeed: master seed of optimization runs, the same seed gives the same partition
+    :type multiStartSeed: int
+
+    :param timeLimit: seconds to solve, reminder optimization stops once it is exceeded, 0 is unlimited
+    :type timeLimit: float
+
+    :param iterationLimit: iterations to solve, reminder optimization stops once it is exceeded, 0 is unlimited
+    :type iterationLimit: int
+
+    :param cancellation: event like object, the solver raises CancelledError at the next grouping layer or optimization attempt once it is set
+    :type cancellation: threading.Event
+
+    :return: quotients, reminder, optimizationCount, and isOptimal flag which is true for the empty reminder if timeLimit or iterationLimit is given
     """
 
-    solver = partitionSolver(items, sizesOrPartitions, groupSize, iterCounter, optimizationLimit)
+    scaling = integerScalingPartition(items, sizesOrPartitions)
+    isScaled = doUseIntegerScaling and scaling.tryScale()
+
+    solver = partitionSolver(scaling.scaledItems, scaling.scaledSizesOrPartitions, groupSize, iterCounter, optimizationLimit)
 
     solver.printOptimizationInfo = True
     solver.printInfo = printPct
     solver.useHybridParetoGrouping = False
+    solver.useBitsetGrouping = useBitsetGrouping
+    solver.multiStartCount = multiStartCount
+    solver.multiStartSeed = multiStartSeed
+    solver.deadline = time.perf_counter() + timeLimit if timeLimit else 0
+    solver.iterationLimit = iterationLimit
+    solver.cancellation = cancellation
 
     quotients, reminder, optimizationCount = solver.solve()
+
+    if isScaled:
+        quotients, reminder = scaling.restore(quotients, reminder)
+
+    if timeLimit or iterationLimit:
+        return quotients, reminder, optimizationCount, len(reminder) == 0
+
     return quotients, reminder, optimizationCount
 
 
-def hybridPartitionN(items, sizesOrPartitions, groupSize, iterCounter, optimizationLimit=-1):
+def hybridPartitionN(items, sizesOrPartitions, groupSize, iterCounter, optimizationLimit=-1, cancellation=None):
     """
     The N hybrid partition solver API. It divides items given by equal sums. Number of partitions with equal sums is given by parameter.
     The array of custom sums can be passed instead of partitions. We can set up the count of items in group via parameter.
@@ -354,13 +692,364 @@ def hybridPartitionN(items, sizesOrPartitions, groupSize, iterCounter, optimizat
 
     :return: quotients, reminder, optimizationCount
     """
-    solver = partitionSolver(items, sizesOrPartitions, groupSize, iterCounter, optimizationLimit)
+    scaling = integerScalingPartition(items, sizesOrPartitions)
+    isScaled = doUseIntegerScaling and scaling.tryScale()
+
+    solver = partitionSolver(scaling.scaledItems, scaling.scaledSizesOrPartitions, groupSize, iterCounter, optimizationLimit)
 
     solver.printOptimizationInfo = True
     solver.printInfo = printPct
     solver.useHybridParetoGrouping = True
+    solver.cancellation = cancellation
 
     quotients, reminder, optimizationCount = solver.solve()
+
+    if isScaled:
+        quotients, reminder = scaling.restore(quotients, reminder)
+
     return quotients, reminder, optimizationCount
 
+
+def knapsackBatch(instances, executor=None, chunkSize=16, ordered=True, workerCount=0, **knapsackOptions):
+    """
+    The batch 1/0 knapsack API. It solves independent instances in the process pool.
+
+    :param instances: iterable of size, items, values tuples, it is read lazily
+    :type instances: iterable
+
+    :param executor: process pool to use, the pool of cpu count workers is created for the batch if none
+    :type executor: concurrent.futures.Executor
+
+    :param chunkSize: number of instances sent to the worker process at once
+    :type chunkSize: int
+
+    :param ordered: yield results in order of instances, otherwise as chunks complete
+    :type ordered: bool
+
+    :param workerCount: number of pool workers, two chunks per worker are kept in flight, 0 is cpu count
+    :type workerCount: int
+
+    :param knapsackOptions: keyword options of the knapsack API
+
+    :return: generator of instance index, (bestValue, bestSize, bestItems, bestValues), iterations
+    """
+
+    return solveBatch(knapsack, instances, executor, chunkSize, ordered, workerCount, knapsackOptions)
+
+
+def paretoKnapsackBatch(instances, executor=None, chunkSize=16, ordered=True, workerCount=0, **paretoKnapsackOptions):
+    """
+    The batch KB Pareto solver API. It solves independent instances in the process pool.
+
+    :param instances: iterable of size, items, values tuples, it is read lazily
+    :type instances: iterable
+
+    :param executor: process pool to use, the pool of cpu count workers is created for the batch if none
+    :type executor: concurrent.futures.Executor
+
+    :param chunkSize: number of instances sent to the worker process at once
+    :type chunkSize: int
+
+    :param ordered: yield results in order of instances, otherwise as chunks complete
+    :type ordered: bool
+
+    :param workerCount: number of pool workers, two chunks per worker are kept in flight, 0 is cpu count
+    :type workerCount: int
+
+    :param paretoKnapsackOptions: keyword options of the paretoKnapsack API
+
+    :return: generator of instance index, (bestValue, bestSize, bestItems, bestValues), iterations
+    """
+
+    return solveBatch(paretoKnapsack, instances, executor, chunkSize, ordered, workerCount, paretoKnapsackOptions)
+
+
+def partitionNBatch(instances, executor=None, chunkSize=16, ordered=True, workerCount=0, **partitionOptions):
+    """
+    The batch N partition solver API. It solves independent instances in the process pool.
+
+    :param instances: iterable of items, sizesOrPartitions, groupSize tuples, it is read lazily
+    :type instances: iterable
+
+    :param executor: process pool to use, the pool of cpu count workers is created for the batch if none
+    :type executor: concurrent.futures.Executor
+
+    :param chunkSize: number of instances sent to the worker process at once
+    :type chunkSize: int
+
+    :param ordered: yield results in order of instances, otherwise as chunks complete
+    :type ordered: bool
+
+    :param workerCount: number of pool workers, two chunks per worker are kept in flight, 0 is cpu count
+    :type workerCount: int
+
+    :param partitionOptions: keyword options of the partitionN API
+
+    :return: generator of instance index, (quotients, reminder, optimizationCount), iterations
+    """
+
+    return solveBatch(partitionN, instances, executor, chunkSize, ordered, workerCount, partitionOptions)
+
+
+async def subsKnapsackAsync(size, items, iterCounter, executor=None, **options):
+    """
+    The async subset sum knapsack API. The solver runs in the thread pool, it stops at the next item layer once the task is cancelled.
+
+    :param executor: thread pool to run the solver, the default executor of the event loop if none
+    :type executor: concurrent.futures.ThreadPoolExecutor
+
+    :param options: keyword options of the subsKnapsack API
+
+    :return: bestValue, bestItems
+    """
+
+    return await solveAsync(subsKnapsack, (size, items, iterCounter), options, executor)
+
+
+async def knapsackAsync(size, items, values, iterCounter, executor=None, **options):
+    """
+    The async 1/0 knapsack API. The solver runs in the thread pool, it stops at the next item layer once the task is cancelled.
+
+    :param executor: thread pool to run the solver, the default executor of the event loop if none
+    :type executor: concurrent.futures.ThreadPoolExecutor
+
+    :param options: keyword options of the knapsack API
+
+    :return: bestValue, bestSize, bestItems, bestValues
+    """
+
+    return await solveAsync(knapsack, (size, items, values, iterCounter), options, executor)
+
+
+async def hybridKnapsackAsync(size, items, values, iterCounter, executor=None, **options):
+    """
+    The async hybrid 1/0 knapsack API. The solver runs in the thread pool, it stops at the next item layer once the task is cancelled.
+
+    :param executor: thread pool to run the solver, the default executor of the event loop if none
+    :type executor: concurrent.futures.ThreadPoolExecutor
+
+    :param options: keyword options of the hybridKnapsack API
+
+    :return: bestValue, bestSize, bestItems, bestValues
+    """
+
+    return await solveAsync(hybridKnapsack, (size, items, values, iterCounter), options, executor)
+
+
+async def paretoKnapsackAsync(size, items, values, iterCounter, executor=None, **options):
+    """
+    The async KB Pareto solver API. The solver runs in the thread pool, it stops at the next item layer once the task is cancelled.
+
+    :param executor: thread pool to run the solver, the default executor of the event loop if none
+    :type executor: concurrent.futures.ThreadPoolExecutor
+
+    :param options: keyword options of the paretoKnapsack API
+
+    :return: bestValue, bestSize, bestItems, bestValues
+    """
+
+    return await solveAsync(paretoKnapsack, (size, items, values, iterCounter), options, executor)
+
+
+async def hybridParetoKnapsackAsync(size, items, values, iterCounter, executor=None, **options):
+    """
+    The async hybrid KB Pareto solver API. The solver runs in the thread pool, it stops at the next item layer once the task is cancelled.
+
+    :param executor: thread pool to run the solver, the default executor of the event loop if none
+    :type executor: concurrent.futures.ThreadPoolExecutor
+
+    :param options: keyword options of the hybridParetoKnapsack API
+
+    :return: bestValue, bestSize, bestItems, bestValues
+    """
+
+    return await solveAsync(hybridParetoKnapsack, (size, items, values, iterCounter), options, executor)
+
+
+async def subsParetoKnapsackAsync(size, items, iterCounter, executor=None, **options):
+    """
+    The async subset sum Pareto solver API. The solver runs in the thread pool, it stops at the next item layer once the task is cancelled.
+
+    :param executor: thread pool to run the solver, the default executor of the event loop if none
+    :type executor: concurrent.futures.ThreadPoolExecutor
+
+    :param options: keyword options of the subsParetoKnapsack API
+
+    :return: bestValue, bestItems
+    """
+
+    return await solveAsync(subsParetoKnapsack, (size, items, iterCounter), options, executor)
+
+
+async def knapsackNdAsync(constraints, items, values, iterCounter, executor=None, **options):
+    """
+    The async N dimensional knapsack API. The solver runs in the thread pool, it stops at the next item layer once the task is cancelled.
+
+    :param executor: thread pool to run the solver, the default executor of the event loop if none
+    :type executor: concurrent.futures.ThreadPoolExecutor
+
+    :param options: keyword options of the knapsackNd API
+
+    :return: bestValue, bestSize, bestItems, bestValues
+    """
+
+    return await solveAsync(knapsackNd, (constraints, items, values, iterCounter), options, executor)
+
+
+async def hybridKnapsackNdAsync(constraints, items, values, iterCounter, executor=None, **options):
+    """
+    The async hybrid N dimensional knapsack API. The solver runs in the thread pool, it stops at the next item layer once the task is cancelled.
+
+    :param executor: thread pool to run the solver, the default executor of the event loop if none
+    :type executor: concurrent.futures.ThreadPoolExecutor
+
+    :param options: keyword options of the hybridKnapsackNd API
+
+    :return: bestValue, bestSize, bestItems, bestValues
+    """
+
+    return await solveAsync(hybridKnapsackNd, (constraints, items, values, iterCounter), options, executor)
+
+
+async def meetInTheMiddleKnapsackAsync(size, items, values, iterCounter, executor=None, **options):
+    """
+    The async meet in the middle 1/0 knapsack API. The solver runs in the thread pool, it stops at the next item of half fronts once the task is cancelled.
+
+    :param executor: thread pool to run the solver, the default executor of the event loop if none
+    :type executor: concurrent.futures.ThreadPoolExecutor
+
+    :param options: keyword options of the meetInTheMiddleKnapsack API
+
+    :return: bestValue, bestSize, bestItems, bestValues
+    """
+
+    return await solveAsync(meetInTheMiddleKnapsack, (size, items, values, iterCounter), options, executor)
+
+
+async def greedyKnapsackNdAsync(constraints, items, values, iterCounter, executor=None, **options):
+    """
+    The async N dimensional greedy knapsack API. The solver runs in the thread pool, it stops at the next dimension or attempt once the task is cancelled.
+
+    :param executor: thread pool to run the solver, the default executor of the event loop if none
+    :type executor: concurrent.futures.ThreadPoolExecutor
+
+    :param options: keyword options of the greedyKnapsackNd API
+
+    :return: bestValue, bestSize, bestItems, bestValues, and isOptimal flag if timeLimit or iterationLimit is given
+    """
+
+    return await solveAsync(greedyKnapsackNd, (constraints, items, values, iterCounter), options, executor)
+
+
+async def partitionNAsync(items, sizesOrPartitions, groupSize, iterCounter, executor=None, **options):
+    """
+    The async N partition API. The solver runs in the thread pool, it stops at the next grouping layer or optimization attempt once the task is cancelled.
+
+    :param executor: thread pool to run the solver, the default executor of the event loop if none
+    :type executor: concurrent.futures.ThreadPoolExecutor
+
+    :param options: keyword options of the partitionN API
+
+    :return: quotients, reminder, optimizationCount, and isOptimal flag if timeLimit or iterationLimit is given
+    """
+
+    return await solveAsync(partitionN, (items, sizesOrPartitions, groupSize, iterCounter), options, executor)
+
+
+async def hybridPartitionNAsync(items, sizesOrPartitions, groupSize, iterCounter, executor=None, **options):
+    """
+    The async N hybrid partition API. The solver runs in the thread pool, it stops at the next grouping layer or optimization attempt once the task is cancelled.
+
+    :param executor: thread pool to run the solver, the default executor of the event loop if none
+    :type executor: concurrent.futures.ThreadPoolExecutor
+
+    :param options: keyword options of the hybridPartitionN API
+
+    :return: quotients, reminder, optimizationCount
+    """
+
+    return await solveAsync(hybridPartitionN, (items, sizesOrPartitions, groupSize, iterCounter), options, executor)
+
 # </ PUBLIC API >
+
+
+def solveBatchChunk(solve, chunk, options):
+    """
+    Solves the chunk of instances in the worker process, each instance gets its own iteration counter.
+
+    :return: list of instance index, result, iterations
+    """
+
+    results = []
+
+    for index, instance in chunk:
+        iterCounter = [0]
+        result = solve(*instance, iterCounter, **options)
+        results.append((index, result, iterCounter[0]))
+
+    return results
+
+
+def solveBatch(solve, instances, executor, chunkSize, ordered, workerCount, options):
+
+    workerCount = workerCount or os.cpu_count() or 1
+
+    ownExecutor = executor is None
+
+    if ownExecutor:
+        executor = ProcessPoolExecutor(max_workers=workerCount)
+
+    indexedInstances = enumerate(instances)
+
+    # keeps two chunks per worker in flight, so the instances iterator is not read ahead of the pool.
+    maxPendingCount = 2 * workerCount
+
+    pending = deque()
+
+    def submitChunks():
+        while len(pending) < maxPendingCount:
+            chunk = list(islice(indexedInstances, max(1, chunkSize)))
+            if not chunk:
+                break
+            pending.append(executor.submit(solveBatchChunk, solve, chunk, options))
+
+    try:
+        submitChunks()
+
+        while pending:
+
+            if ordered:
+                yield from pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+
+            submitChunks()
+    finally:
+        if ownExecutor:
+            executor.shutdown(cancel_futures=True)
+
+
+def solveCancellable(solve, args, options):
+    try:
+        return solve(*args, **options)
+    except CancelledError:
+        # the traceback keeps solver frames alive, so fronts and DP tables are released once it is dropped here.
+        return None
+
+
+async def solveAsync(solve, args, options, executor):
+
+    cancellation = threading.Event()
+
+    loop = asyncio.get_running_loop()
+
+    try:
+        return await loop.run_in_executor(executor, solveCancellable, solve, args, dict(options, cancellation=cancellation))
+    except asyncio.CancelledError:
+        # the event loop does not wait for the solver thread, it stops at the next item layer.
+        cancellation.set()
+        raise
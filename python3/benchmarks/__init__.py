@@ -0,0 +1,3 @@
+__all__ = ["pisingerBenchmark"]
+
+from benchmarks import *
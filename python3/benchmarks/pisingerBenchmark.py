@@ -0,0 +1,250 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from API.main import knapsack, hybridKnapsack, paretoKnapsack, hybridParetoKnapsack, knapsackNd
+from knapsack.instanceFile import readPisingerInstances
+from knapsack.wPoint import wPoint
+
+pisingerDir = os.path.join(f"{Path(os.path.dirname(__file__)).parent.parent}", "testData", "hardinstances_pisinger")
+
+
+def getIntSize(size):
+    # some solver paths return the 1D size as wPoint1.
+    return size.getDimension(0) if hasattr(size, "getDimension") else size
+
+
+def solveKnapsack(capacity, weights, values, iterCounter):
+    bestValue, bestSize, bestItems, bestValues = knapsack(capacity, weights, values, iterCounter)
+    return bestValue, getIntSize(bestSize)
+
+
+def solveHybridKnapsack(capacity, weights, values, iterCounter):
+    bestValue, bestSize, bestItems, bestValues = hybridKnapsack(capacity, weights, values, iterCounter)
+    return bestValue, getIntSize(bestSize)
+
+
+def solveParetoKnapsack(capacity, weights, values, iterCounter):
+    bestValue, bestSize, bestItems, bestValues = paretoKnapsack(capacity, weights, values, iterCounter)
+    return bestValue, getIntSize(bestSize)
+
+
+def solveHybridParetoKnapsack(capacity, weights, values, iterCounter):
+    bestValue, bestSize, bestItems, bestValues = hybridParetoKnapsack(capacity, weights, values, iterCounter)
+    return bestValue, getIntSize(bestSize)
+
+
+def solveKnapsack2d(capacity, weights, values, iterCounter):
+    # the same instance in 2 equal dimensions, the optimum is the same.
+    bestValue, bestSize, bestItems, bestValues = knapsackNd(wPoint((capacity, capacity)), [wPoint((w, w)) for w in weights], values, iterCounter)
+    return bestValue, max(bestSize.getDimension(0), bestSize.getDimension(1))
+
+
+benchmarkSolvers = {
+    "knapsack": solveKnapsack,
+    "hybridKnapsack": solveHybridKnapsack,
+    "paretoKnapsack": solveParetoKnapsack,
+    "hybridParetoKnapsack": solveHybridParetoKnapsack,
+    "knapsack2d": solveKnapsack2d,
+}
+
+defaultSolvers = ["knapsack", "hybridKnapsack", "paretoKnapsack", "hybridParetoKnapsack"]
+
+
+def benchmarkInstance(solve, capacity, weights, values, repeat, measureMemory):
+    """
+    Solves the instance repeat times, and once more under tracemalloc to get the peak memory, so tracing does not
+    slow down timed runs.
+
+    :return: bestValue, bestSize, median seconds, iterations, peak memory bytes
+    """
+
+    times = []
+
+    for r in range(repeat):
+        iterCounter = [0]
+
+        t1 = time.perf_counter()
+        bestValue, bestSize = solve(capacity, weights, values, iterCounter)
+        times.append(time.perf_counter() - t1)
+
+    peakMemory = 0
+
+    if measureMemory:
+        tracemalloc.start()
+
+        try:
+            solve(capacity, weights, values, [0])
+            peakMemory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return bestValue, bestSize, statistics.median(times), iterCounter[0], peakMemory
+
+
+def runBenchmark(solverNames=None, classes=(11, 12, 13, 14, 15), sizes=(20, 50), coefficientRange=1000, caseCount=5, repeat=3, measureMemory=True, dataDir=None, verbose=False):
+    """
+    Runs solvers on first caseCount instances of knapPI_<class>_<size>_<coefficientRange> files.
+    Results are checked against the z optimum of each instance.
+
+    :return: dict of solver/file keys to cases, failed, seconds, iterations, peakMemory
+    """
+
+    results = {}
+
+    for className in classes:
+        for size in sizes:
+
+            fileName = f"knapPI_{className}_{size}_{coefficientRange}"
+
+            instances = []
+
+            for instance in readPisingerInstances(os.path.join(dataDir or pisingerDir, f"{fileName}.csv")):
+
+                if len(instances) >= caseCount:
+                    break
+
+                instances.append(instance)
+
+            for solverName in solverNames or defaultSolvers:
+
+                solve = benchmarkSolvers[solverName]
+
+                result = {"cases": 0, "failed": 0, "seconds": 0.0, "iterations": 0, "peakMemory": 0}
+
+                for name, capacity, optimum, weights, values in instances:
+
+                    bestValue, bestSize, seconds, iterations, peakMemory = benchmarkInstance(solve, capacity, weights, values, repeat, measureMemory)
+
+                    result["cases"] += 1
+                    result["seconds"] += seconds
+                    result["iterations"] += iterations
+                    result["peakMemory"] = max(result["peakMemory"], peakMemory)
+
+                    if bestValue != optimum or bestSize > capacity:
+                        result["failed"] += 1
+
+                        if verbose:
+                            print(f"ERROR: {solverName} {name}: value {bestValue}, expected {optimum}, size {bestSize}, capacity {capacity}")
+
+                results[f"{solverName}/{fileName}"] = result
+
+                if verbose:
+                    print(f"| {solverName} | {fileName} | {result['cases']} | {result['failed']} | {round(result['seconds'], 4)} | {round(result['iterations'])} | {result['peakMemory']} |")
+
+    return results
+
+
+def compareWithBaseline(results, baseline, timeThreshold=1.5, iterationsThreshold=1.0, memoryThreshold=1.25, timeSlack=0.01):
+    """
+    Compares results with the baseline ones. The value is the regression if it exceeds the baseline value multiplied
+    by the threshold, seconds also get the timeSlack added to skip noise of short runs. Keys missing in the baseline
+    or run with the other number of cases are skipped.
+
+    :return: list of regression messages
+    """
+
+    regressions = []
+
+    for key, result in results.items():
+
+        if result["failed"] > 0:
+            regressions.append(f"{key}: {result['failed']} of {result['cases']} cases do not match the optimum")
+
+        expected = baseline.get(key)
+
+        if expected is None or expected["cases"] != result["cases"]:
+            continue
+
+        if result["seconds"] > expected["seconds"] * timeThreshold + timeSlack:
+            regressions.append(f"{key}: seconds {round(result['seconds'], 4)}, baseline {round(expected['seconds'], 4)}")
+
+        if result["iterations"] > expected["iterations"] * iterationsThreshold:
+            regressions.append(f"{key}: iterations {result['iterations']}, baseline {expected['iterations']}")
+
+        if result["peakMemory"] > expected["peakMemory"] * memoryThreshold:
+            regressions.append(f"{key}: peak memory {result['peakMemory']}, baseline {expected['peakMemory']}")
+
+    return regressions
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Runs solvers on hardinstances_pisinger instances and compares results with the baseline.")
+
+    parser.add_argument("--solvers", nargs="+", default=defaultSolvers, choices=sorted(benchmarkSolvers))
+    parser.add_argument("--classes", nargs="+", type=int, default=[11, 12, 13, 14, 15])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[20, 50])
+    parser.add_argument("--range", type=int, default=1000, dest="coefficientRange")
+    parser.add_argument("--cases", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--baseline", default=os.path.join(os.path.dirname(__file__), "pisingerBaseline.json"))
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--output")
+    parser.add_argument("--time-threshold", type=float, default=1.5)
+    parser.add_argument("--iterations-threshold", type=float, default=1.0)
+    parser.add_argument("--memory-threshold", type=float, default=1.25)
+
+    args = parser.parse_args(argv)
+
+    print(f"| solver | file | cases | failed | seconds | iterations | peak memory |")
+
+    results = runBenchmark(args.solvers, args.classes, args.sizes, args.coefficientRange, args.cases, args.repeat, not args.no_memory, verbose=True)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+
+    if args.write_baseline:
+        baseline = {}
+
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+
+        baseline.update(results)
+
+        with open(args.baseline, "w") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+
+        print(f"Baseline written: {args.baseline}")
+        return 0
+
+    baseline = {}
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    regressions = compareWithBaseline(results, baseline, args.time_threshold, args.iterations_threshold, args.memory_threshold)
+
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Measures memory per point, addition and set insertion throughput of the pareto point types, and a 1D pareto solve.
+# The script only uses constructors and operators every revision of the point types has, so the same script
+# measures the dict backed points too: --revision <rev> runs it on the python3 tree of that git revision,
+# for example --revision 329f7cc^ for the points before slots were introduced.
+
+
+def createPointFactories():
+
+    from knapsack.paretoPoint import paretoPoint, paretoPoint1, paretoPoint2
+
+    return {
+        "paretoPoint1": lambda rnd: paretoPoint1(rnd.randint(1, 1 << 30), rnd.randint(1, 1 << 30)),
+        "paretoPoint2": lambda rnd: paretoPoint2(rnd.randint(1, 1 << 30), rnd.randint(1, 1 << 30), rnd.randint(1, 1 << 30)),
+        "paretoPoint (3d)": lambda rnd: paretoPoint((rnd.randint(1, 1 << 30), rnd.randint(1, 1 << 30), rnd.randint(1, 1 << 30)), rnd.randint(1, 1 << 30)),
+    }
+
+
+def measurePointType(createPoint, count, seed):
+
+    rnd = random.Random(seed)
+
+    points = [createPoint(rnd) for i in range(count)]
+    items = [createPoint(rnd) for i in range(count)]
+
+    # the memory of the points created by addition, the way solvers create them.
+    tracemalloc.start()
+
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        sums = [p + i for p, i in zip(points, items)]
+        bytesPerPoint = (tracemalloc.get_traced_memory()[0] - before) / count
+    finally:
+        tracemalloc.stop()
+
+    del sums
+
+    t1 = time.perf_counter()
+    sums = [p + i for p, i in zip(points, items)]
+    addRate = count / (time.perf_counter() - t1)
+
+    t1 = time.perf_counter()
+    pointSet = set(sums)
+    setRate = count / (time.perf_counter() - t1)
+
+    return bytesPerPoint, addRate, setRate, hasattr(sums[0], "__dict__")
+
+
+def measureParetoSolve(itemCount, seed, repeat):
+
+    from API.main import paretoKnapsack
+
+    rnd = random.Random(seed)
+
+    items = [rnd.randint(1000, 100000) for i in range(itemCount)]
+    values = [rnd.randint(1000, 100000) for i in range(itemCount)]
+
+    times = []
+
+    for r in range(repeat):
+        t1 = time.perf_counter()
+        paretoKnapsack(sum(items) // 2, items, values, [0])
+        times.append(time.perf_counter() - t1)
+
+    return min(times)
+
+
+def runOnRevision(revision, argv):
+
+    root = subprocess.run(["git", "rev-parse", "--show-toplevel"], capture_output=True, text=True, check=True).stdout.strip()
+
+    with tempfile.TemporaryDirectory() as tempDir:
+
+        archive = subprocess.run(["git", "-C", root, "archive", revision, "python3"], capture_output=True, check=True).stdout
+        subprocess.run(["tar", "-x", "-C", tempDir], input=archive, check=True)
+
+        treeDir = os.path.join(tempDir, "python3")
+
+        return subprocess.run([sys.executable, os.path.abspath(__file__)] + argv, cwd=treeDir, env=dict(os.environ, PYTHONPATH=treeDir)).returncode
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Measures memory and throughput of pareto point types.")
+
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--items", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--revision")
+
+    args = parser.parse_args(argv)
+
+    if args.revision:
+        return runOnRevision(args.revision, ["--count", str(args.count), "--items", str(args.items), "--repeat", str(args.repeat), "--seed", str(args.seed)])
+
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    print(f"| type | bytes/point | add M/s | set M/s | instance dict |")
+
+    for name, createPoint in createPointFactories().items():
+
+        bytesPerPoint, addRate, setRate, hasDict = measurePointType(createPoint, args.count, args.seed)
+
+        print(f"| {name} | {round(bytesPerPoint)} | {round(addRate / 1e6, 2)} | {round(setRate / 1e6, 2)} | {hasDict} |")
+
+    print(f"{args.items} item 1D pareto solve: {round(measureParetoSolve(args.items, args.seed, args.repeat), 3)}s")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
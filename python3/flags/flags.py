@@ -15,6 +15,7 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR TH
 
 doSolveSuperInc = True
 doUseLimits = True
+doUseIntegerScaling = True
 printToFile = True
 printPct = False
 verbose = True
@@ -0,0 +1,66 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from array import array
+from bisect import bisect_left
+
+
+class decisionHistory:
+    """
+    Keeps the take decision of each DP layer instead of the layer itself. The layer i is stored as the points
+    where the item i was taken, points where it was skipped cost nothing.
+
+    Int points are kept in the sorted int64 array and searched by bisect, other points in the frozenset.
+    """
+
+    def __init__(self, count):
+        self.layers = [None] * (count + 1)
+
+    def __len__(self):
+        return len(self.layers)
+
+    def setLayer(self, i, takenPoints):
+
+        if all(type(p) is int for p in takenPoints):
+            try:
+                self.layers[i] = array('q', sorted(takenPoints))
+                return
+            except OverflowError:
+                pass
+
+        self.layers[i] = frozenset(takenPoints)
+
+    def isTaken(self, i, point):
+
+        layer = self.layers[i]
+
+        if layer is None:
+            return False
+
+        if type(layer) is array:
+            if type(point) is not int:
+                return False
+
+            index = bisect_left(layer, point)
+            return index < len(layer) and layer[index] == point
+
+        return point in layer
+
+    def getSize(self):
+        """
+        Returns the count of points kept.
+        """
+
+        return sum(len(layer) for layer in self.layers if layer is not None)
@@ -0,0 +1,207 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from collections import defaultdict
+
+
+class dominanceReduction:
+    """
+    Removes dominated items and collapses duplicates of 1-0 knapsack items.
+
+    The item i dominates the item j if it is not heavier in any dimension and brings no less profit,
+    identical items are ordered by index. Swapping j for i never makes the solution worse, so some optimal solution
+    takes j only with all items dominating it. The item is removed if it does not fit together with them.
+
+    Duplicates of the same (weight, value) pair are the bounded knapsack item with multiplicity k,
+    it is split into 1, 2, 4, ... copies bundles, which give any count of copies up to k. So the solver sees
+    O(log k) bundles instead of k items, each bundle maps back to original indexes of its copies.
+
+    1D dominance sums are counted by the Fenwick tree over profit ranks in O(N log N), N dimensional ones in O(N ^ 2).
+    """
+
+    def __init__(self, constraint, items, values, collapseDuplicates=True):
+        self.constraint = constraint
+        self.items = items
+        self.values = values
+        self.collapseDuplicates = collapseDuplicates
+        self.fixedIn = []
+        self.fixedOut = []
+        self.groups = [[i] for i in range(len(items))]
+        self.reducedItems = items
+        self.reducedValues = values
+
+    def getFixedCount(self):
+        return len(self.items) - len(self.groups)
+
+    def getWeights(self):
+
+        constraint = self.constraint
+
+        if hasattr(constraint, "getSize"):
+            size = constraint.getSize()
+            return [tuple(item.getDimension(d) for d in range(size)) for item in self.items], tuple(constraint.getDimension(d) for d in range(size))
+
+        return [(item,) for item in self.items], (self.constraint,)
+
+    def canReduce(self, weights):
+
+        numberTypes = set(type(w) for dims in weights for w in dims)
+
+        if len(numberTypes - {int}) > 1:
+            return False
+
+        return all(w >= 0 for dims in weights for w in dims)
+
+    def getDominatingSums1D(self, weights, iterCounter):
+
+        count = len(weights)
+        values = self.values
+
+        order = sorted(range(count), key=lambda i: (weights[i][0], -values[i], i))
+
+        profitRanks = {p: r for r, p in enumerate(sorted(set(values), reverse=True), start=1)}
+
+        tree = [0] * (len(profitRanks) + 1)
+        sums = [None] * count
+
+        for j in order:
+
+            rank = profitRanks[values[j]]
+
+            # all items visited are not heavier than j, ones with rank <= j rank bring no less profit.
+            s, r = 0, rank
+            while r > 0:
+                s += tree[r]
+                r -= r & -r
+
+            sums[j] = (s,)
+
+            r = rank
+            while r < len(tree):
+                tree[r] += weights[j][0]
+                r += r & -r
+
+        iterCounter[0] += count * len(tree).bit_length()
+
+        return sums
+
+    def getDominatingSumsNd(self, weights, iterCounter):
+
+        count = len(weights)
+        values = self.values
+
+        sums = []
+
+        for j in range(count):
+
+            dims = weights[j]
+            s = [0] * len(dims)
+
+            for i in range(count):
+
+                if i == j or values[i] < values[j] or any(a > b for a, b in zip(weights[i], dims)):
+                    continue
+
+                if weights[i] == dims and values[i] == values[j] and i > j:
+                    continue
+
+                for d in range(len(dims)):
+                    s[d] += weights[i][d]
+
+            sums.append(s)
+
+        iterCounter[0] += count * count
+
+        return sums
+
+    def multiply(self, item, k):
+
+        if k == 1:
+            return item
+
+        if hasattr(item, "getSize"):
+            return item.createNew([item.getDimension(d) * k for d in range(item.getSize())])
+
+        return item * k
+
+    def reduce(self, iterCounter):
+        """
+        Fills the groups of original indexes of reduced items. Returns True if the item count was reduced.
+        """
+
+        count = len(self.items)
+
+        weights, capacities = self.getWeights()
+
+        if count == 0 or not self.canReduce(weights):
+            return False
+
+        if len(capacities) == 1:
+            sums = self.getDominatingSums1D(weights, iterCounter)
+        else:
+            sums = self.getDominatingSumsNd(weights, iterCounter)
+
+        kept = []
+
+        for j in range(count):
+            if any(s + w > c for s, w, c in zip(sums[j], weights[j], capacities)):
+                self.fixedOut.append(j)
+            else:
+                kept.append(j)
+
+        groups = [[j] for j in kept]
+
+        if self.collapseDuplicates:
+
+            duplicates = defaultdict(list)
+
+            for j in kept:
+                duplicates[(weights[j], self.values[j])].append(j)
+
+            groups = []
+
+            for indexes in duplicates.values():
+
+                start, bundle = 0, 1
+
+                while start < len(indexes):
+                    bundle = min(bundle, len(indexes) - start)
+                    groups.append(indexes[start: start + bundle])
+                    start += bundle
+                    bundle *= 2
+
+        iterCounter[0] += count
+
+        if len(groups) == count:
+            return False
+
+        self.groups = groups
+        self.reducedItems = [self.multiply(self.items[g[0]], len(g)) for g in groups]
+        self.reducedValues = [self.values[g[0]] * len(g) for g in groups]
+
+        return True
+
+    def getReducedConstraint(self):
+        return self.constraint
+
+    def getReducedItems(self):
+        return self.reducedItems, self.reducedValues
+
+    def restoreIndexes(self, indexes):
+        """
+        Maps indexes of reduced items to original indexes of their copies.
+        """
+
+        return [j for i in indexes for j in self.groups[i]]
@@ -0,0 +1,208 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from fractions import Fraction
+
+from .sourceLink import sourceLinkArena
+
+
+class expandingCoreSolver:
+    """
+    The 1-0 knapsack solver for int items in the spirit of Pisinger's expanding core algorithm.
+
+    Items are ordered by profit to weight ratio DESC and the greedy solution takes all items before the break item.
+    The core [s, t] starts empty at the break item, items before it are fixed to be taken, items after it are fixed
+    to be skipped. Each step moves the core bounds by one item: the item t + 1 may be added to each state, the item s - 1
+    may be removed from it. States are kept as the pareto front of (weight, profit) pairs, the weight may exceed the
+    capacity because removing items may fix it later.
+
+    The state is dropped when the ratio bound shows it cannot beat the best feasible profit found:
+    the state that fits may gain at most ratio of t + 1 per capacity unit left, the state that does not fit
+    loses at least ratio of s - 1 per unit over. The solver stops when no state is left, so the items far from
+    the break item are never visited on easy instances.
+
+    The link of each state keeps the chain of items toggled relative to the greedy solution.
+    """
+
+    def __init__(self, size, weights, values, iterCounter):
+        self.size = size
+        self.weights = weights
+        self.values = values
+        self.iterCounter = iterCounter
+        self.sourceLinks = sourceLinkArena()
+        self.sourceLinksCompactionSize = 2 ** 16
+        self.sourceLinksLimit = self.sourceLinksCompactionSize
+        self.printInfo = False
+        self.coreSize = 0
+        self.skippedPointsByBound = 0
+        self.skippedPointsByPareto = 0
+
+    @staticmethod
+    def canSolve(size, weights, values):
+        return type(size) is int and all(type(w) is int and w > 0 for w in weights) and all(type(v) is int and v >= 0 for v in values)
+
+    def mergeDiscardingDominated(self, front, newWeights, newProfits, newLinks, iterCounter):
+
+        # Point A is dominated by point B if B achieves a larger profit with the same or less weight than A.
+
+        oldWeights, oldProfits, oldLinks = front
+
+        resultWeights, resultProfits, resultLinks = [], [], []
+
+        profitMax = -1
+
+        oi, ni = 0, 0
+        oldCount, newCount = len(oldWeights), len(newWeights)
+
+        while oi < oldCount or ni < newCount:
+
+            if ni == newCount or (oi < oldCount and (oldWeights[oi] < newWeights[ni] or (oldWeights[oi] == newWeights[ni] and oldProfits[oi] >= newProfits[ni]))):
+                w, p, l = oldWeights[oi], oldProfits[oi], oldLinks[oi]
+                oi += 1
+            else:
+                w, p, l = newWeights[ni], newProfits[ni], newLinks[ni]
+                ni += 1
+
+            if p > profitMax:
+                resultWeights.append(w)
+                resultProfits.append(p)
+                resultLinks.append(l)
+                profitMax = p
+
+        self.skippedPointsByPareto += oldCount + newCount - len(resultWeights)
+
+        iterCounter[0] += oldCount + newCount
+
+        return resultWeights, resultProfits, resultLinks
+
+    def pruneByBound(self, front, lowerBound, addWeight, addProfit, removeWeight, removeProfit, iterCounter):
+
+        size = self.size
+
+        frontWeights, frontProfits, frontLinks = front
+
+        resultWeights, resultProfits, resultLinks = [], [], []
+
+        for w, p, l in zip(frontWeights, frontProfits, frontLinks):
+
+            if w <= size:
+                bound = p + (size - w) * addProfit // addWeight if addWeight else p
+            elif removeWeight:
+                bound = p + (size - w) * removeProfit // removeWeight
+            else:
+                continue
+
+            if bound > lowerBound:
+                resultWeights.append(w)
+                resultProfits.append(p)
+                resultLinks.append(l)
+
+        self.skippedPointsByBound += len(frontWeights) - len(resultWeights)
+
+        iterCounter[0] += len(frontWeights)
+
+        return resultWeights, resultProfits, resultLinks
+
+    def compactSourceLinks(self, front, bestLink):
+
+        # links of pruned and dominated states are not reachable from the front anymore.
+        # The arena is compacted when it doubles since the last compaction, so it costs O(1) per link.
+
+        if len(self.sourceLinks) <= self.sourceLinksLimit:
+            return front, bestLink
+
+        frontWeights, frontProfits, frontLinks = front
+
+        remap = self.sourceLinks.compact(frontLinks + [bestLink])
+
+        self.sourceLinksLimit = max(self.sourceLinksCompactionSize, 2 * len(self.sourceLinks))
+
+        return (frontWeights, frontProfits, [remap[l] for l in frontLinks]), remap[bestLink]
+
+    def solve(self):
+
+        size, weights, values, iterCounter = self.size, self.weights, self.values, self.iterCounter
+
+        count = len(weights)
+
+        self.sourceLinks, self.sourceLinksLimit = sourceLinkArena(), self.sourceLinksCompactionSize
+
+        order = sorted(range(count), key=lambda i: Fraction(values[i], weights[i]), reverse=True)
+
+        iterCounter[0] += count
+
+        breakIndex, breakWeight, breakProfit = 0, 0, 0
+
+        while breakIndex < count and breakWeight + weights[order[breakIndex]] <= size:
+            breakWeight += weights[order[breakIndex]]
+            breakProfit += values[order[breakIndex]]
+            breakIndex += 1
+
+        front = ([breakWeight], [breakProfit], [-1])
+
+        bestWeight, bestProfit, bestLink = breakWeight, breakProfit, -1
+
+        s, t = breakIndex, breakIndex - 1
+
+        while True:
+
+            addWeight, addProfit = (weights[order[t + 1]], values[order[t + 1]]) if t + 1 < count else (0, 0)
+            removeWeight, removeProfit = (weights[order[s - 1]], values[order[s - 1]]) if s > 0 else (0, 0)
+
+            front = self.pruneByBound(front, bestProfit, addWeight, addProfit, removeWeight, removeProfit, iterCounter)
+
+            if len(front[0]) == 0:
+                break
+
+            frontWeights, frontProfits, frontLinks = front
+
+            if t + 1 < count:
+                t += 1
+                itemId = order[t]
+
+                newLinks = [self.sourceLinks.add(itemId, l) for l in frontLinks]
+
+                front = self.mergeDiscardingDominated(front, [w + addWeight for w in frontWeights], [p + addProfit for p in frontProfits], newLinks, iterCounter)
+
+                frontWeights, frontProfits, frontLinks = front
+
+            if s > 0:
+                s -= 1
+                itemId = order[s]
+
+                newLinks = [self.sourceLinks.add(itemId, l) for l in frontLinks]
+
+                front = self.mergeDiscardingDominated(front, [w - removeWeight for w in frontWeights], [p - removeProfit for p in frontProfits], newLinks, iterCounter)
+
+            for w, p, l in zip(*front):
+                if w <= size and p > bestProfit:
+                    bestWeight, bestProfit, bestLink = w, p, l
+
+            front, bestLink = self.compactSourceLinks(front, bestLink)
+
+            if self.printInfo:
+                print(f"| core [{s}, {t}] | {len(front[0])} | {round(iterCounter[0])} |")
+
+            if s == 0 and t == count - 1:
+                break
+
+        self.coreSize = t - s + 1
+
+        taken = set(order[:breakIndex])
+
+        # each item is toggled at most once on the chain, it was added if it was after the break item.
+        taken.symmetric_difference_update(self.sourceLinks.getItemIds(bestLink))
+
+        return bestProfit, bestWeight, sorted(taken)
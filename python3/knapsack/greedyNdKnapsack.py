@@ -16,6 +16,8 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR TH
 from flags.flags import doUseLimits, doSolveSuperInc
 from .knapsack import knapsackSolver
 from .knapsackNd import knapsackNSolver
+from .cancellation import checkCancellation
+from .solverMetrics import getMetrics, measurePhase
 
 from .knapsackPareto import *
 
@@ -31,6 +33,68 @@ from .paretoPoint import paretoPoint, paretoPoint1
 from .wPoint import wPoint1
 
 
+def createDimensionSolver(dimensionItems, values, dimensionConstraint, iterCounter):
+
+    solver = knapsackParetoSolver([wPoint1(item) for item in dimensionItems],
+                                  values,
+                                  range(len(values)),
+                                  wPoint1(dimensionConstraint),
+                                  paretoPoint1(0, 0),
+                                  wPoint1(0),
+                                  iterCounter)
+
+    solver.forceUsePareto = True
+    solver.prepareSearchIndex = True
+
+    return solver
+
+
+def solveDimensionStairSteps(dimensionItems, values, dimensionConstraint, limits):
+    """
+    Builds the search index of 1D solver and gets optimal item indexes for each stair step limit of the dimension.
+
+    :return: limit to item indexes map, iterations
+    """
+
+    iterCounter = [0]
+
+    solver = createDimensionSolver(dimensionItems, values, dimensionConstraint, iterCounter)
+
+    solver.solve()
+
+    _, __, limitIndexes = solver.searchMaxProfits(limits)
+
+    return dict(zip(limits, limitIndexes)), iterCounter[0]
+
+
+def createAttemptSolver(constraints, items, values, iterCounter, emptyPoint, attemptOptions):
+
+    limitSolver = knapsackNSolver(constraints, items, values, iterCounter, emptyPoint,
+                                  forceUseLimits=attemptOptions["forceUseLimits"],
+                                  forceUseDpSolver=attemptOptions["forceUseDpSolver"])
+
+    limitSolver.doSolveSuperInc = attemptOptions["doSolveSuperInc"]
+    limitSolver.doUseLimits = attemptOptions["doUseLimits"]
+
+    return limitSolver
+
+
+def solveKnapsackNdAttempt(constraints, items, values, emptyPoint, attemptOptions):
+    """
+    Solves the attempt items by exact N dim solver.
+
+    :return: bestValue, bestSize, bestItems, bestValues, iterations
+    """
+
+    iterCounter = [0]
+
+    limitSolver = createAttemptSolver(constraints, items, values, iterCounter, emptyPoint, attemptOptions)
+
+    optN, optDimN, optItemsN, optValuesN = limitSolver.solve()
+
+    return optN, optDimN, optItemsN, optValuesN, iterCounter[0]
+
+
 class greedyKnapsackNdSolver:
 
     def __init__(self, constraints, items, values, iterCounter, emptyPoint, forceUseLimits=False, forceUseDpSolver=False):
@@ -38,6 +102,7 @@ class greedyKnapsackNdSolver:
         self.items = items
         self.values = values
         self.iterCounter = iterCounter
+        self.metrics = getMetrics(iterCounter)
         self.forceUseLimits = forceUseLimits
         self.emptyPoint = emptyPoint
         self.size = constraints.getSize()
@@ -47,8 +112,15 @@ class greedyKnapsackNdSolver:
         self.printGreedyInfo = False
         self.printSuperIncreasingInfo = False
         self.doSolveSuperInc = True
+        self.doUseLimits = True
         self.canBackTraceWhenSizeReached = False
         self.useRatioSortForPareto = False
+        self.executor = None
+        self.speculativeAttemptsCount = 1
+        self.deadline = 0
+        self.iterationLimit = 0
+        self.isOptimal = False
+        self.cancellation = None
 
     def createNewPoint(self, tuples):
         return self.emptyPoint.createNew(tuples)
@@ -78,14 +150,192 @@ class greedyKnapsackNdSolver:
         opt, optDims, optItems, optValues, optIndex = paretoSolver.solve()
         return opt, optDims, optItems, optValues
 
-    def solveKnapsackNd(self, constraints, descNewDims, descNewVals, doSolveSuperInc, forceUseLimits, iterCounter):
+    def getAttemptOptions(self):
+
+        # attempt items are sorted descending, the exact solver always uses limits and DP for them.
+        return {"forceUseLimits": True, "forceUseDpSolver": True, "doSolveSuperInc": self.doSolveSuperInc, "doUseLimits": self.doUseLimits}
 
-        limitSolver = knapsackNSolver(constraints, descNewDims, descNewVals, iterCounter, self.emptyPoint, forceUseLimits=True, forceUseDpSolver=True)
+    def solveKnapsackNd(self, constraints, descNewDims, descNewVals, attemptOptions, iterCounter):
+
+        limitSolver = createAttemptSolver(constraints, descNewDims, descNewVals, iterCounter, self.emptyPoint, attemptOptions)
+        limitSolver.cancellation = self.cancellation
 
         return limitSolver.solve()
 
 
+    def isBudgetExceeded(self, iterCounter):
+
+        if self.deadline and time.perf_counter() >= self.deadline:
+            return True
+
+        return self.iterationLimit > 0 and iterCounter[0] >= self.iterationLimit
+
+    def getUpperBound(self, size, optimizeCacheItems, dimStairDownCursorStartings):
+
+        # the exact 1D optimum of any dimension is the upper bound of N dim optimum.
+        bounds = [sum(self.values[i] for i in optimizeCacheItems[d][dimStairDownCursorStartings[d]]) for d in range(size) if dimStairDownCursorStartings[d] in optimizeCacheItems[d]]
+
+        return min(bounds) if bounds else None
+
+    def getStairStepLimits(self, dimStairDownCursor, dimStairStep):
+
+        # the cursor goes down by the step while it is not less than the step.
+        limits = [dimStairDownCursor]
+
+        while dimStairDownCursor >= dimStairStep > 0:
+            dimStairDownCursor -= dimStairStep
+            limits.append(dimStairDownCursor)
+
+        return limits
+
+    def solveDimensions(self, size, dimDescSortedItems, dimStairSteps, dimStairDownCursors, optimizeCacheItems):
+        """
+        All stair step limits of the dimension are answered by the single batch search over its 1D index.
+        The budget is checked before each dimension, dimensions not solved yet are skipped once it is exceeded.
+
+        :return: True if all dimensions are solved
+        """
+
+        results = []
+
+        for dimensionIndex in range(size):
+
+            checkCancellation(self.cancellation)
+
+            if not self.executor and self.isBudgetExceeded(self.iterCounter):
+                return False
+
+            descDim, descValues, descIndex = dimDescSortedItems[dimensionIndex]
+
+            limits = self.getStairStepLimits(dimStairDownCursors[dimensionIndex], dimStairSteps[dimensionIndex])
+
+            if self.executor:
+                results.append(self.executor.submit(solveDimensionStairSteps, descDim, descValues, dimStairDownCursors[dimensionIndex], limits))
+            else:
+                results.append(solveDimensionStairSteps(descDim, descValues, dimStairDownCursors[dimensionIndex], limits))
+
+        for dimensionIndex in range(size):
+
+            if self.executor and (self.isBudgetExceeded(self.iterCounter) or self.cancellation is not None and self.cancellation.is_set()):
+                for future in results[dimensionIndex:]:
+                    future.cancel()
+                checkCancellation(self.cancellation)
+                return False
+
+            limitItems, iterations = results[dimensionIndex].result() if self.executor else results[dimensionIndex]
+
+            dimIndex = dimDescSortedItems[dimensionIndex][2]
+
+            for limit, optIndex in limitItems.items():
+                optimizeCacheItems[dimensionIndex][limit] = [dimIndex[oi] for oi in optIndex]
+
+            self.iterCounter[0] += iterations
+
+        return True
+
+    def iterateStairSteps(self, size, dimStairSteps, dimStairDownCursors, optimizeCacheItems):
+
+        optimizeIterIndex = 0
+
+        anyGreaterThanStep = True
+
+        while anyGreaterThanStep:
+
+            optimizedIndexes = set()
+
+            for dimensionIndex in range(size):
+
+                optimizedIndexes.update(optimizeCacheItems[dimensionIndex][dimStairDownCursors[dimensionIndex]])
+                self.iterCounter[0] += len(optimizeCacheItems[dimensionIndex])
+
+            yield optimizeIterIndex, optimizedIndexes, None
+
+            decIndex = (optimizeIterIndex) % size
+
+            if dimStairDownCursors[decIndex] >= dimStairSteps[decIndex]:
+                dimStairDownCursors[decIndex] -= dimStairSteps[decIndex]
+
+            for dimensionIndex in range(size):
+                anyGreaterThanStep = dimStairDownCursors[dimensionIndex] >= dimStairSteps[dimensionIndex]
+                if anyGreaterThanStep:
+                    break
+
+            optimizeIterIndex += 1
+
+    def createAttemptItems(self, size, optimizedIndexes, dimensionIndexes):
+
+        newData = []
+        newValues = []
+
+        sumOfNewValues = 0
+
+        for itemIndex in optimizedIndexes:
+
+            nDims = [0] * size
+
+            for dimensionIndex in range(size):
+                dimIndex = dimensionIndexes[dimensionIndex]
+                nDims[dimIndex] = self.items[itemIndex].getDimension(dimIndex)
+
+            newData.append(self.createNewPoint(nDims))
+            newValues.append(self.values[itemIndex])
+
+            sumOfNewValues += self.values[itemIndex]
+
+        return newData, newValues, sumOfNewValues
+
+    def iterateAttempts(self, size, attempts, dimensionIndexes, prevOptimizedIndexes, getMaxN, attemptOptions):
+
+        # attempts of the window are solved in parallel, the ones a sequential run skips as solved or for less values are not submitted.
+        window, windowTuples = [], set()
+
+        try:
+            for optimizeIterIndex, optimizedIndexes, _ in attempts:
+
+                optTuple = tuple(optimizedIndexes)
+
+                future = None
+
+                if optTuple not in prevOptimizedIndexes and optTuple not in windowTuples:
+
+                    newData, newValues, sumOfNewValues = self.createAttemptItems(size, optimizedIndexes, dimensionIndexes)
+
+                    if sumOfNewValues > getMaxN():
+                        descNewDims, descNewVals = self.sortBoth(newData, newValues)
+                        future = self.executor.submit(solveKnapsackNdAttempt, self.constraints, descNewDims, descNewVals, self.emptyPoint, attemptOptions)
+                        windowTuples.add(optTuple)
+
+                window.append((optimizeIterIndex, optimizedIndexes, future))
+
+                if len(window) >= self.speculativeAttemptsCount:
+                    yield from window
+                    window, windowTuples = [], set()
+
+            yield from window
+        finally:
+            # the consumer stops early by the budget, attempts of the window not started yet are not needed.
+            for _, __, future in window:
+                if future:
+                    future.cancel()
+
     def solve(self):
+        """
+        If the executor property is set then 1D solvers of all dimensions, including their search index builds,
+        run in it in parallel, and speculativeAttemptsCount exact N dim attempts are solved in it at once.
+        Attempts are accepted in the same order and by the same rule, and both ways solve them with the same
+        getAttemptOptions, so the result is the same as sequential one.
+
+        If the deadline or iterationLimit property is set then no new 1D dimension solver or attempt is started
+        once it is reached, the best attempt found so far is returned. The deadline is the time.perf_counter() value, the iterationLimit is
+        compared with the iteration counter. The isOptimal property tells if the result reaches the least exact 1D
+        optimum of dimensions, which is the upper bound of N dim optimum.
+
+        If the solverMetrics is given as the iteration counter then preProcess, dimensions and attempt phases are recorded.
+        Attempts solved in this process add phases and item layers of the exact N dim solver, the ones solved in
+        the executor add their iterations only.
+
+        :return: bestValue, bestSize, bestItems, bestValues
+        """
 
         size = self.constraints.getSize()
 
@@ -97,7 +347,6 @@ class greedyKnapsackNdSolver:
         dimDescSortedItems = [None] * size
         dimStairSteps =      [None] * size
         optimizeCacheItems = [None] * size
-        solvers =            [None] * size
 
         dimStairDownCursors =         [0] * size
         dimStairDownCursorStartings = [0] * size
@@ -106,101 +355,85 @@ class greedyKnapsackNdSolver:
 
         _, dimensionIndexes = self.sortBoth(self.constraints.getDimensions(), range(size), reverse=False)
 
-        for dimensionIndex in range(size):
-            dimOrderIndex = dimensionIndexes[dimensionIndex]
-
-            descDim = [p.getDimension(dimOrderIndex) for p in self.items]
-            descValues = self.values
-            descIndex = list(range(len(self.values)))
-
-            self.iterCounter[0] += (len(descDim) * math.log2(len(descDim)))
+        with measurePhase(self.metrics, "preProcess"):
 
-            dimDescSortedItems[dimensionIndex] = (descDim, descValues, descIndex)
-            dimStairSteps[dimensionIndex] = descDim[-1]
-            dimStairDownCursors[dimensionIndex] = self.constraints.getDimension(dimOrderIndex)
-            dimStairDownCursorStartings[dimensionIndex] = self.constraints.getDimension(dimOrderIndex)
-            optimizeCacheItems[dimensionIndex] = {}
+            for dimensionIndex in range(size):
+                dimOrderIndex = dimensionIndexes[dimensionIndex]
 
-            estimatedAttemptsCount += dimStairDownCursors[dimensionIndex] // dimStairSteps[dimensionIndex]
+                descDim = [p.getDimension(dimOrderIndex) for p in self.items]
+                descValues = self.values
+                descIndex = list(range(len(self.values)))
 
-            solver = knapsackParetoSolver([wPoint1(item) for item in descDim],
-                                          descValues,
-                                          range(len(descValues)),
-                                          wPoint1(self.constraints.getDimension(dimOrderIndex)),
-                                          paretoPoint1(0, 0),
-                                          wPoint1(0),
-                                          self.iterCounter)
+                self.iterCounter[0] += (len(descDim) * math.log2(len(descDim)))
 
-            solver.forceUsePareto = True
-            solver.prepareSearchIndex = True
+                dimDescSortedItems[dimensionIndex] = (descDim, descValues, descIndex)
+                dimStairSteps[dimensionIndex] = descDim[-1]
+                dimStairDownCursors[dimensionIndex] = self.constraints.getDimension(dimOrderIndex)
+                dimStairDownCursorStartings[dimensionIndex] = self.constraints.getDimension(dimOrderIndex)
+                optimizeCacheItems[dimensionIndex] = {}
 
-            solvers[dimensionIndex] = solver
+                estimatedAttemptsCount += dimStairDownCursors[dimensionIndex] // dimStairSteps[dimensionIndex]
 
         if self.printGreedyInfo:
             print(f"The NON exact {size}D greedyTopDown knapsack solver called for N = {len(self.items)}. Estimated attempts: {estimatedAttemptsCount}.")
 
+        with measurePhase(self.metrics, "dimensions"):
+            dimensionsSolved = self.solveDimensions(size, dimDescSortedItems, dimStairSteps, dimStairDownCursors, optimizeCacheItems)
+
         self.iterCounter[0] += size
 
-        t0 = time.perf_counter()
+        self.isOptimal = False
 
-        optimizeIterIndex = 0
+        if not dimensionsSolved:
 
-        anyGreaterThanStep = True
+            if self.printGreedyInfo:
+                print(f"The NON exact {size}D greedyTopDown knapsack solver: budget is exceeded by 1D solvers of dimensions. Exiting.")
 
-        prevOptimizedIndexes = set()
+            if self.metrics is not None:
+                self.metrics.addCounters(estimatedAttemptsCount=estimatedAttemptsCount, visitedAttemptsCount=0)
 
-        while anyGreaterThanStep:
+            return 0, maxDimN, maxNItems, maxNValues
 
-            t1 = time.perf_counter()
+        t0 = time.perf_counter()
 
-            optimizedIndexes = set()
+        prevOptimizedIndexes = set()
 
-            for dimensionIndex in range(size):
+        attemptOptions = self.getAttemptOptions()
 
-                currentDimLimit = dimStairDownCursors[dimensionIndex]
+        attempts = self.iterateStairSteps(size, dimStairSteps, dimStairDownCursors, optimizeCacheItems)
 
-                if currentDimLimit not in optimizeCacheItems[dimensionIndex]:
+        if self.executor:
+            attempts = self.iterateAttempts(size, attempts, dimensionIndexes, prevOptimizedIndexes, lambda: maxN, attemptOptions)
 
-                    _, __, ___, ____, optIndex = solvers[dimensionIndex].solve(wPoint1(currentDimLimit))
+        visitedAttemptsCount = 0
 
-                    dimIndex = dimDescSortedItems[dimensionIndex][2]
+        for optimizeIterIndex, optimizedIndexes, future in attempts:
 
-                    dimCacheItems = []
+            visitedAttemptsCount += 1
 
-                    for oi in optIndex:
-                        itemIndex = dimIndex[oi]
+            if self.cancellation is not None and self.cancellation.is_set():
+                # attempts of the window not started yet are cancelled by closing the generator.
+                attempts.close()
+                checkCancellation(self.cancellation)
 
-                        dimCacheItems.append(itemIndex)
-                        optimizedIndexes.add(itemIndex)
+            if self.isBudgetExceeded(self.iterCounter):
 
-                    self.iterCounter[0] += len(optIndex)
+                attempts.close()
 
-                    optimizeCacheItems[dimensionIndex][currentDimLimit] = dimCacheItems
-                else:
-                    optimizedIndexes.update(optimizeCacheItems[dimensionIndex][currentDimLimit])
-                    self.iterCounter[0] += len(optimizeCacheItems[dimensionIndex])
+                if maxN == -sys.maxsize:
+                    maxN = 0
 
-            newData = []
-            newValues = []
+                if self.printGreedyInfo:
+                    print(f"The NON exact {size}D greedyTopDown knapsack solver: attempt {optimizeIterIndex}, budget is exceeded. Exiting.")
+                break
+
+            t1 = time.perf_counter()
 
             optTuple = tuple(optimizedIndexes)
 
             if optTuple not in prevOptimizedIndexes:
 
-                sumOfNewValues = 0
-
-                for itemIndex in optimizedIndexes:
-
-                    nDims = [0] * size
-
-                    for dimensionIndex in range(size):
-                        dimIndex = dimensionIndexes[dimensionIndex]
-                        nDims[dimIndex] = self.items[itemIndex].getDimension(dimIndex)
-
-                    newData.append(self.createNewPoint(nDims))
-                    newValues.append(self.values[itemIndex])
-
-                    sumOfNewValues += self.values[itemIndex]
+                newData, newValues, sumOfNewValues = self.createAttemptItems(size, optimizedIndexes, dimensionIndexes)
 
                 self.iterCounter[0] += len(optimizedIndexes) * size
 
@@ -209,12 +442,17 @@ class greedyKnapsackNdSolver:
                     descNewDims, descNewVals = self.sortBoth(newData, newValues)
                     self.iterCounter[0] += (len(descNewDims) * math.log2(len(descNewDims)))
 
-                    optN, optDimN, optItemsN, optValuesN = self.solveKnapsackNd(self.constraints,
-                                                                                descNewDims,
-                                                                                descNewVals,
-                                                                                doSolveSuperInc,
-                                                                                self.forceUseLimits,
-                                                                                self.iterCounter)
+                    with measurePhase(self.metrics, "attempt"):
+
+                        if future:
+                            optN, optDimN, optItemsN, optValuesN, iterations = future.result()
+                            self.iterCounter[0] += iterations
+                        else:
+                            optN, optDimN, optItemsN, optValuesN = self.solveKnapsackNd(self.constraints,
+                                                                                        descNewDims,
+                                                                                        descNewVals,
+                                                                                        attemptOptions,
+                                                                                        self.iterCounter)
 
                     attemptTimeS = round(time.perf_counter() - t1, 4)
 
@@ -245,16 +483,11 @@ class greedyKnapsackNdSolver:
             elif self.printGreedyInfo:
                 print(f"The NON exact {size}D greedyTopDown knapsack solver: attempt {optimizeIterIndex} was skipped.")
 
-            decIndex = (optimizeIterIndex) % size
+        upperBound = self.getUpperBound(size, optimizeCacheItems, dimStairDownCursorStartings)
 
-            if dimStairDownCursors[decIndex] >= dimStairSteps[decIndex]:
-                dimStairDownCursors[decIndex] -= dimStairSteps[decIndex]
-
-            for dimensionIndex in range(size):
-                anyGreaterThanStep = dimStairDownCursors[dimensionIndex] >= dimStairSteps[dimensionIndex]
-                if anyGreaterThanStep:
-                    break
+        self.isOptimal = upperBound is not None and maxN >= upperBound
 
-            optimizeIterIndex += 1
+        if self.metrics is not None:
+            self.metrics.addCounters(estimatedAttemptsCount=estimatedAttemptsCount, visitedAttemptsCount=visitedAttemptsCount)
 
-        return maxN, maxDimN, maxNItems, maxNValues
\ No newline at end of file
+        return maxN, maxDimN, maxNItems, maxNValues
@@ -0,0 +1,196 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+import mmap
+import struct
+import sys
+from array import array
+
+magic = b"KBINST1" + (b"<" if sys.byteorder == "little" else b">")
+
+headerFormat = "=8sqq"
+indexFormat = "=qqqqqq"
+
+
+def readPisingerInstances(path):
+    """
+    Reads instances of the hardinstances_pisinger file. Each instance is the name line, n, c, z and time lines,
+    item rows of index, profit, weight and optimal solution flag, and the ----- line.
+
+    :return: generator of name, capacity, optimum, weights, values tuples
+    """
+
+    name, capacity, optimum, weights, values = None, 0, 0, [], []
+
+    with open(path, mode='r') as file:
+
+        for line in file:
+
+            line = line.strip()
+
+            if not line:
+                continue
+
+            if line == "-----":
+                yield name, capacity, optimum, weights, values
+                name, capacity, optimum, weights, values = None, 0, 0, [], []
+                continue
+
+            if "," in line:
+                row = line.split(",")
+                values.append(int(row[1]))
+                weights.append(int(row[2]))
+                continue
+
+            key, _, value = line.partition(" ")
+
+            if key == "c":
+                capacity = int(value)
+            elif key == "z":
+                optimum = int(value)
+            elif key not in ("n", "time"):
+                name = line
+
+
+def writeInstanceFile(path, instances):
+    """
+    Writes 1-0 knapsack instances to the columnar binary file. The file is the header, the index of instance item offsets,
+    item counts, capacities, optimums and name offsets, the weights column, the values column and utf-8 names.
+    Columns are 64 bit integers in the native byte order, so the file is memory-mapped by instanceFile without copying.
+
+    :param instances: iterable of name, capacity, optimum, weights, values tuples. The unknown optimum is None.
+
+    :return: number of instances written
+    """
+
+    index, names = [], bytearray()
+    weights, values = array('q'), array('q')
+
+    for name, capacity, optimum, instanceWeights, instanceValues in instances:
+
+        if len(instanceWeights) != len(instanceValues):
+            raise ValueError(f"Instance {name} has {len(instanceWeights)} weights and {len(instanceValues)} values.")
+
+        nameBytes = (name or "").encode("utf-8")
+
+        index.append((len(weights), len(instanceWeights), capacity, -1 if optimum is None else optimum, len(names), len(nameBytes)))
+
+        weights.extend(instanceWeights)
+        values.extend(instanceValues)
+        names.extend(nameBytes)
+
+    with open(path, "wb") as file:
+        file.write(struct.pack(headerFormat, magic, len(index), len(weights)))
+
+        for row in index:
+            file.write(struct.pack(indexFormat, *row))
+
+        weights.tofile(file)
+        values.tofile(file)
+        file.write(names)
+
+    return len(index)
+
+
+def convertPisingerFile(csvPath, path):
+    """
+    Converts the hardinstances_pisinger csv file to the columnar binary file.
+
+    :return: number of instances written
+    """
+
+    return writeInstanceFile(path, readPisingerInstances(csvPath))
+
+
+class instanceFile:
+    """
+    The memory-mapped columnar instance file written by writeInstanceFile.
+
+    Instance weights and values are memoryview slices of the mapped file, solvers take them as item lists as is.
+    The file is closed once all views given are released, or by close() or the with statement otherwise.
+    """
+
+    def __init__(self, path):
+        self.index, self.weights, self.values, self.names, self.view = None, None, None, None, None
+
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+
+        fileMagic, self.instanceCount, self.itemCount = struct.unpack_from(headerFormat, self.map, 0)
+
+        if fileMagic != magic:
+            self.close()
+            raise ValueError(f"{path} is not the instance file or it was written with the other byte order.")
+
+        indexOffset = struct.calcsize(headerFormat)
+        weightsOffset = indexOffset + struct.calcsize(indexFormat) * self.instanceCount
+        valuesOffset = weightsOffset + 8 * self.itemCount
+
+        self.index = self.view[indexOffset: weightsOffset].cast('q')
+        self.weights = self.view[weightsOffset: valuesOffset].cast('q')
+        self.values = self.view[valuesOffset: valuesOffset + 8 * self.itemCount].cast('q')
+        self.names = self.view[valuesOffset + 8 * self.itemCount:]
+
+    def __len__(self):
+        return self.instanceCount
+
+    def __getitem__(self, i):
+        return self.getInstance(i)
+
+    def __iter__(self):
+        return (self.getInstance(i) for i in range(self.instanceCount))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+        return False
+
+    def getInstance(self, i):
+        """
+        :return: name, capacity, optimum, weights, values. The unknown optimum is None.
+        """
+
+        if i < 0 or i >= self.instanceCount:
+            raise IndexError(f"Instance index {i} is out of range {self.instanceCount}.")
+
+        itemOffset, itemCount, capacity, optimum, nameOffset, nameLength = self.index[6 * i: 6 * i + 6]
+
+        name = bytes(self.names[nameOffset: nameOffset + nameLength]).decode("utf-8")
+
+        return name, \
+               capacity, \
+               None if optimum < 0 else optimum, \
+               self.weights[itemOffset: itemOffset + itemCount], \
+               self.values[itemOffset: itemOffset + itemCount]
+
+    def close(self):
+
+        for view in (self.index, self.weights, self.values, self.names, self.view):
+            if view is not None:
+                view.release()
+
+        self.index, self.weights, self.values, self.names, self.view = None, None, None, None, None
+
+        try:
+            self.map.close()
+        except BufferError:
+            # instance views given are still alive, the map is closed once they are released.
+            pass
+
+        self.file.close()
@@ -0,0 +1,288 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from collections import defaultdict, deque
+from decimal import Decimal
+
+from .paretoFront import INT64_MAX
+
+
+def getDecimalScale(numbers):
+    """
+    Returns the count of fraction digits that makes all numbers given integers, or None if there is a number
+    that is neither int nor finite Decimal.
+    """
+
+    scale = 0
+
+    for number in numbers:
+
+        if type(number) is int:
+            continue
+
+        if not isinstance(number, Decimal) or not number.is_finite():
+            return None
+
+        scale = max(scale, -number.as_tuple().exponent)
+
+    return scale
+
+
+def toScaledInt(number, scale):
+    """
+    Returns floor(number * 10 ** scale) computed exactly, without Decimal context rounding.
+    """
+
+    if type(number) is int:
+        return number * 10 ** scale
+
+    sign, digits, exponent = number.as_tuple()
+
+    value = int(''.join(map(str, digits)))
+
+    if sign:
+        value = -value
+
+    shift = exponent + scale
+
+    if shift >= 0:
+        return value * 10 ** shift
+
+    return value // 10 ** -shift
+
+
+def getOriginals(originalItems, scaledItems):
+    originals = defaultdict(deque)
+
+    for item, scaledItem in zip(originalItems, scaledItems):
+        originals[scaledItem].append(item)
+
+    return originals
+
+
+class integerScaling:
+    """
+    Converts the 1D knapsack instance with Decimal numbers to the equal int one. Items are multiplied by 10 ** itemsScale,
+    values by 10 ** valuesScale, where the scales are the largest count of fraction digits. The size is floored to items scale,
+    it does not change the set of feasible solutions because any sum of scaled items is integer.
+
+    Solvers return scaled numbers, the restore methods map them back to the original Decimals.
+
+    The instance is not scaled when there is no Decimal in it, there are floats, or the scaled sums do not fit int64.
+    """
+
+    def __init__(self, size, items, values=None):
+        self.size = size
+        self.items = items
+        self.values = values
+        self.itemsScale = None
+        self.valuesScale = None
+        self.scaledSize = size
+        self.scaledItems = items
+        self.scaledValues = values
+
+    def tryScale(self):
+
+        numbers = [self.size] + list(self.items) + (list(self.values) if self.values is not None else [])
+
+        if all(type(n) is int for n in numbers):
+            return False
+
+        itemsScale = getDecimalScale(self.items)
+        valuesScale = getDecimalScale(self.values) if self.values is not None else 0
+
+        if itemsScale is None or valuesScale is None or getDecimalScale([self.size]) is None:
+            return False
+
+        if sum(abs(n) for n in self.items) * 10 ** itemsScale > INT64_MAX or abs(self.size) * 10 ** itemsScale > INT64_MAX:
+            return False
+
+        if self.values is not None and sum(abs(n) for n in self.values) * 10 ** valuesScale > INT64_MAX:
+            return False
+
+        self.itemsScale, self.valuesScale = itemsScale, valuesScale
+
+        self.scaledSize = toScaledInt(self.size, itemsScale)
+        self.scaledItems = [toScaledInt(n, itemsScale) for n in self.items]
+
+        if self.values is not None:
+            self.scaledValues = [toScaledInt(n, valuesScale) for n in self.values]
+
+        return True
+
+    def restore(self, indexes):
+        """
+        Maps the indexes of items chosen to the original bestValue, bestSize, bestItems, bestValues.
+        """
+
+        bestItems = [self.items[i] for i in indexes]
+        bestValues = [self.values[i] for i in indexes]
+
+        return sum(bestValues), sum(bestItems), bestItems, bestValues
+
+    def restoreItems(self, scaledItems):
+        """
+        Maps the scaled items chosen by subset sum solver to the original bestValue, bestItems.
+        """
+
+        originals = getOriginals(self.items, self.scaledItems)
+
+        bestItems = [originals[scaledItem].popleft() for scaledItem in scaledItems]
+
+        return sum(bestItems), bestItems
+
+
+class integerScalingNd:
+    """
+    Converts the N dimensional knapsack instance with Decimal numbers to the equal int one. Each dimension is scaled by
+    the largest count of fraction digits of its items, the constraint dimension is floored to it, values are scaled
+    as in integerScaling.
+
+    N dimensional solvers return items instead of indexes, the restore method maps scaled item and value pairs
+    back to the original ones.
+    """
+
+    def __init__(self, constraints, items, values):
+        self.constraints = constraints
+        self.items = items
+        self.values = values
+        self.itemsScales = None
+        self.valuesScale = None
+        self.scaledConstraints = constraints
+        self.scaledItems = items
+        self.scaledValues = values
+
+    def tryScale(self):
+
+        size = self.constraints.getSize()
+
+        columns = [[self.constraints.getDimension(d)] + [item.getDimension(d) for item in self.items] for d in range(size)]
+
+        if all(type(n) is int for n in list(self.values) + [n for column in columns for n in column]):
+            return False
+
+        itemsScales = [getDecimalScale(column[1:]) for column in columns]
+        valuesScale = getDecimalScale(self.values)
+
+        if valuesScale is None or any(scale is None for scale in itemsScales) or getDecimalScale(self.constraints.getDimensions()) is None:
+            return False
+
+        for column, scale in zip(columns, itemsScales):
+            if max(sum(abs(n) for n in column[1:]), abs(column[0])) * 10 ** scale > INT64_MAX:
+                return False
+
+        if sum(abs(n) for n in self.values) * 10 ** valuesScale > INT64_MAX:
+            return False
+
+        self.itemsScales, self.valuesScale = itemsScales, valuesScale
+
+        self.scaledConstraints = self.scalePoint(self.constraints)
+        self.scaledItems = [self.scalePoint(item) for item in self.items]
+        self.scaledValues = [toScaledInt(n, valuesScale) for n in self.values]
+
+        return True
+
+    def scalePoint(self, point):
+        return point.createNew([toScaledInt(point.getDimension(d), scale) for d, scale in enumerate(self.itemsScales)])
+
+    def restore(self, scaledItems, scaledValues):
+        """
+        Maps the scaled items and values chosen to the original bestValue, bestSize, bestItems, bestValues.
+        """
+
+        originals = getOriginals(zip(self.items, self.values), [(item.getDimensions(), value) for item, value in zip(self.scaledItems, self.scaledValues)])
+
+        bestItems, bestValues = [], []
+
+        # DP back trace gives dimension tuples instead of points, restored items keep the same form.
+        for scaledItem, scaledValue in zip(scaledItems, scaledValues):
+            isPoint = hasattr(scaledItem, "getDimensions")
+
+            item, value = originals[(scaledItem.getDimensions() if isPoint else tuple(scaledItem), scaledValue)].popleft()
+
+            bestItems.append(item if isPoint else item.getDimensions())
+            bestValues.append(value)
+
+        bestSize = self.constraints.createNew([sum(item[d] if isinstance(item, tuple) else item.getDimension(d) for item in bestItems) for d in range(self.constraints.getSize())])
+
+        return sum(bestValues), bestSize, bestItems, bestValues
+
+
+class integerScalingPartition:
+    """
+    Converts the partition instance with Decimal items and sums to the equal int one. Items and sums share the
+    largest count of fraction digits, so a group sum equals the partition sum exactly in both instances.
+
+    The instance given by number of partitions is not scaled if the scaled items sum is not divisible by it,
+    because the int solver floors the equal sum then.
+    """
+
+    def __init__(self, items, sizesOrPartitions):
+        self.items = items
+        self.sizesOrPartitions = sizesOrPartitions
+        self.scale = None
+        self.scaledItems = items
+        self.scaledSizesOrPartitions = sizesOrPartitions
+
+    def tryScale(self):
+
+        sizes = [] if isinstance(self.sizesOrPartitions, int) else list(self.sizesOrPartitions)
+
+        if all(type(n) is int for n in list(self.items) + sizes):
+            return False
+
+        scale = getDecimalScale(list(self.items) + sizes)
+
+        if scale is None or max([sum(abs(n) for n in self.items)] + [abs(n) for n in sizes]) * 10 ** scale > INT64_MAX:
+            return False
+
+        self.scale = scale
+
+        scaledItems = [toScaledInt(n, scale) for n in self.items]
+
+        if isinstance(self.sizesOrPartitions, int):
+            if self.sizesOrPartitions == 0 or sum(scaledItems) % self.sizesOrPartitions != 0:
+                return False
+        else:
+            self.scaledSizesOrPartitions = [toScaledInt(n, scale) for n in sizes]
+
+        self.scaledItems = scaledItems
+
+        return True
+
+    def restore(self, quotients, reminder):
+        """
+        Maps the items and sums of scaled quotients and reminder given by partition solver back to the original ones.
+        The reminder of equal items grouped by count keeps its count size.
+        """
+
+        originals = getOriginals(self.items, self.scaledItems)
+
+        if isinstance(self.sizesOrPartitions, int):
+            sizes = {sum(self.scaledItems) // self.sizesOrPartitions: Decimal(sum(self.items) / Decimal(self.sizesOrPartitions))}
+        else:
+            sizes = dict(zip(self.scaledSizesOrPartitions, self.sizesOrPartitions))
+
+        for quotient in quotients:
+            quotient.Items = [originals[item].popleft() for item in quotient.Items]
+            quotient.Sizes = [sizes.get(size, Decimal(size).scaleb(-self.scale)) for size in quotient.Sizes]
+
+        if isinstance(reminder, list):
+            return quotients, [originals[item].popleft() for item in reminder]
+
+        reminder.Items = [originals[item].popleft() for item in reminder.Items]
+        reminder.Sizes = [sizes.get(size, size) for size in reminder.Sizes]
+
+        return quotients, reminder
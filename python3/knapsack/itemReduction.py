@@ -0,0 +1,189 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+
+from .upperBound import getEfficiency
+
+
+class itemReduction:
+    """
+    The Martello-Toth reduction of 1-0 knapsack items. The lower bound is the profit of the greedy solution,
+    which takes items by profit to weight ratio while they fit all dimensions.
+
+    The item of the greedy prefix is fixed in, if the LP relaxation bound of solutions without it is less than
+    the lower bound. The item after the break item is fixed out, if the bound of solutions with it is less than
+    the lower bound. Any optimal solution agrees with all fixed items, so the exact solver sees undecided items only.
+
+    N dimensional items are checked against the LP bound of each dimension alone, which bounds N dimensional profit too.
+    Non int bounds are rounded, so the item is fixed only if its bound is less than the lower bound minus 1e-9 of it.
+    """
+
+    def __init__(self, constraint, items, values):
+        self.constraint = constraint
+        self.items = items
+        self.values = values
+        self.fixedIn = []
+        self.fixedOut = []
+        self.undecided = list(range(len(items)))
+        self.lowerBound = 0
+        self.isInteger = True
+
+    def getFixedCount(self):
+        return len(self.fixedIn) + len(self.fixedOut)
+
+    def getDimensions(self):
+
+        constraint, items = self.constraint, self.items
+
+        if hasattr(constraint, "getSize"):
+            return [(constraint.getDimension(d), [item.getDimension(d) for item in items]) for d in range(constraint.getSize())]
+
+        return [(constraint, items)]
+
+    def canReduce(self, dimensions):
+
+        numbers = list(self.values)
+
+        for capacity, weights in dimensions:
+            numbers.append(capacity)
+            numbers.extend(weights)
+
+        numberTypes = set(type(n) for n in numbers)
+
+        # ints mix with any other number type, Decimal does not mix with float.
+        if len(numberTypes - {int}) > 1:
+            return False
+
+        self.isInteger = numberTypes == {int}
+
+        return all(n >= 0 for n in numbers)
+
+    def isLess(self, bound):
+
+        if self.isInteger:
+            return bound < self.lowerBound
+
+        return bound < self.lowerBound - abs(self.lowerBound) / 10 ** 9
+
+    def getGreedyProfit(self, dimensions, order):
+
+        capacities = [capacity for capacity, weights in dimensions]
+        profit = 0
+
+        for i in order:
+            if all(weights[i] <= capacity for capacity, (c, weights) in zip(capacities, dimensions)):
+                for d, (c, weights) in enumerate(dimensions):
+                    capacities[d] -= weights[i]
+                profit += self.values[i]
+
+        return profit
+
+    def getFraction(self, capacity, weight, profit):
+
+        if self.isInteger:
+            return capacity * profit // weight
+
+        return capacity * profit / weight
+
+    def reduceDimension(self, capacity, weights, order, fixedIn, fixedOut):
+
+        values, count = self.values, len(order)
+
+        prefixWeights = [0] + list(accumulate(weights[i] for i in order))
+        prefixProfits = [0] + list(accumulate(values[i] for i in order))
+
+        breakIndex = bisect_right(prefixWeights, capacity) - 1
+
+        for position, j in enumerate(order):
+
+            weight, profit = weights[j], values[j]
+
+            if weight > capacity:
+                fixedOut.add(j)
+                continue
+
+            if position < breakIndex:
+                # the greedy prefix without j leaves weight j free for the items after the break item.
+                k = bisect_right(prefixWeights, capacity + weight) - 1
+                bound = prefixProfits[k] - profit
+
+                if k < count:
+                    bound += self.getFraction(capacity + weight - prefixWeights[k], weights[order[k]], values[order[k]])
+
+                if self.isLess(bound):
+                    fixedIn.add(j)
+            else:
+                # the prefix that fits the capacity left ends before the break item, so it does not contain j.
+                k = bisect_right(prefixWeights, capacity - weight) - 1
+                bound = profit + prefixProfits[k]
+
+                if k < count:
+                    bound += self.getFraction(capacity - weight - prefixWeights[k], weights[order[k]], values[order[k]])
+
+                if self.isLess(bound):
+                    fixedOut.add(j)
+
+    def reduce(self, iterCounter):
+        """
+        Fixes items and fills fixedIn, fixedOut, and undecided index lists. Returns True if any item was fixed.
+        """
+
+        count = len(self.items)
+
+        dimensions = self.getDimensions()
+
+        if count == 0 or not self.canReduce(dimensions):
+            return False
+
+        orders = [sorted(range(count), key=lambda i: getEfficiency(weights[i], self.values[i]), reverse=True) for capacity, weights in dimensions]
+
+        self.lowerBound = max(self.getGreedyProfit(dimensions, order) for order in orders)
+
+        fixedIn, fixedOut = set(), set()
+
+        for (capacity, weights), order in zip(dimensions, orders):
+            self.reduceDimension(capacity, weights, order, fixedIn, fixedOut)
+
+        iterCounter[0] += count * len(dimensions)
+
+        if fixedIn & fixedOut:
+            return False
+
+        self.fixedIn = sorted(fixedIn)
+        self.fixedOut = sorted(fixedOut)
+        self.undecided = [i for i in range(count) if i not in fixedIn and i not in fixedOut]
+
+        return self.getFixedCount() > 0
+
+    def getReducedConstraint(self):
+
+        constraint = self.constraint
+
+        for i in self.fixedIn:
+            constraint = constraint - self.items[i]
+
+        return constraint
+
+    def getReducedItems(self):
+        return [self.items[i] for i in self.undecided], [self.values[i] for i in self.undecided]
+
+    def restoreIndexes(self, indexes):
+        """
+        Maps indexes of the reduced instance to original ones and adds the fixed in items.
+        """
+
+        return [self.undecided[i] for i in indexes] + self.fixedIn
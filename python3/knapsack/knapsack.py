@@ -15,13 +15,24 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR TH
 
 from flags.flags import doUseLimits
 
+from .decisionHistory import decisionHistory
+from .expandingCore import expandingCoreSolver
+from .itemReduction import itemReduction
+from .dominanceReduction import dominanceReduction
+from .meetInTheMiddle import meetInTheMiddleSolver
+from .cancellation import checkCancellation
+from .layerObserver import getLayerObserver
+from .solverMetrics import getMetrics, measurePhase
 from .knapsackPareto import *
 from .paretoPoint import paretoPoint1
 from .wPoint import *
 
 from collections import defaultdict
 from collections import deque
+from copy import copy
 from decimal import Decimal
+from itertools import repeat
+from operator import add, gt
 from typing import List
 
 import datetime
@@ -33,6 +44,9 @@ import sys
 import os
 
 
+decisionBitsTable = bytes.maketrans(b'\x00\x01', b'01')
+
+
 class knapsackSolver:
 
     def __init__(self, size, weights, values, iterCounter, forceUseLimits=False):
@@ -40,6 +54,7 @@ class knapsackSolver:
         self.weights = weights
         self.values = values
         self.iterCounter = iterCounter
+        self.metrics = getMetrics(iterCounter)
         self.forceUseLimits = forceUseLimits
         self.forceUseDpSolver = False
         self.DP = None
@@ -53,6 +68,24 @@ class knapsackSolver:
         self.doSolveSuperInc = True
         self.doUseLimits = True
         self.canBackTraceWhenSizeReached = False
+        self.useDenseDp = True
+        self.denseDpSizeLimit = 10 ** 7
+        self.denseDpCellLimit = 2 * 10 ** 8
+        self.denseDpFillRate = 0.25
+        self.useDecisionHistory = False
+        self.useExpandingCore = False
+        self.expandingCoreMinCount = 20
+        self.useMeetInTheMiddle = False
+        self.meetInTheMiddleMaxCount = 60
+        self.cancellation = None
+        self.observer = None
+        self.layerHook = None
+        self.startTime = 0
+        self.meetInTheMiddleStateLimit = 2 ** 20
+        self.useItemReduction = False
+        self.fixedItemsCount = 0
+        self.useDominanceReduction = False
+        self.dominatedItemsCount = 0
 
     def preProcess(self, constraints, items, values, forceUseLimits, iterCounter):
 
@@ -170,12 +203,12 @@ class knapsackSolver:
             if allAsc and canUsePartialSums or forceUseLimits:
                 partialSums = partialSums2
                 superIncreasingItems = superIncreasingItems2
-                isSuperIncreasing = isSuperIncreasing2
+                isSuperIncreasing = isSuperIncreasing2 and isSuperIncreasingValues2
                 itemSum = itemSum2
             elif allDesc and canUsePartialSums:
                 partialSums = partialSums1
                 superIncreasingItems = superIncreasingItems1
-                isSuperIncreasing = isSuperIncreasing1
+                isSuperIncreasing = isSuperIncreasing1 and isSuperIncreasingValues1
                 itemSum = itemSum1
 
                 partialSums.reverse()
@@ -372,6 +405,43 @@ class knapsackSolver:
 
         return opt, optSize, optWeights, optValues, optIndex
 
+    def backTraceHistoryItems(self, history, resultI, resultP, resultValue, items, values, itemsIndex, allAsc, iterCounter):
+        opt = 0
+        optSize = 0
+        res = resultValue
+        optWeights, optValues, optIndex = [], [], []
+        point = resultP
+
+        count = len(items)
+
+        if self.printInfo:
+            print(
+                f"Skipped points by MAP: {self.skippedPointsByMap}, by LIMITS: {self.skippedPointsByLimits}; by SIZE: {self.skippedPointsBySize}; Total points: {self.totalPointCount}; History points: {history.getSize()};")
+
+        for i in range(resultI, 0, -1):
+
+            iterCounter[0] += 1
+
+            if res <= 0:
+                break
+
+            if history.isTaken(i, point):
+                itemIndex = self.getItemIndex(count, i, allAsc)
+
+                itemWeight, itemValue, itemIndex = items[itemIndex], values[itemIndex], itemsIndex[itemIndex]
+
+                optWeights.append(itemWeight)
+                optValues.append(itemValue)
+                optIndex.append(itemIndex)
+
+                res -= itemValue
+                point -= itemWeight
+
+                opt += itemValue
+                optSize += itemWeight
+
+        return opt, optSize, optWeights, optValues, optIndex
+
     def createDP(self, count):
         self.DP = [None] * (count + 1)
         self.DP[0] = {}
@@ -464,7 +534,7 @@ class knapsackSolver:
         if not self.doUseLimits or not canUsePartialSums:
             return sys.maxsize, -sys.maxsize, -sys.maxsize, 0
 
-        skipCount = 2 ** (len(items) - itemIndex + 1) if self.printInfo else 0
+        skipCount = 2 ** (len(items) - itemIndex + 1) if self.printInfo else 1
 
         partSumForItem = partialSums[itemIndex]
         superIncreasingItem = superIncreasingItems[itemIndex]
@@ -486,16 +556,27 @@ class knapsackSolver:
                                             paretoPoint1(0, 0), wPoint1(0), iterCounter)
         paretoSolver.printInfo = self.printInfo
         paretoSolver.canBackTraceWhenSizeReached = self.canBackTraceWhenSizeReached
+        paretoSolver.cancellation = self.cancellation
+        paretoSolver.observer = self.observer
 
         return paretoSolver.solve()
 
+    def notifyObserver(self, layerIndex, pointCount, bestProfit):
+        self.layerHook.onLayer(layerIndex, pointCount, self.skippedPointsByMap, self.skippedPointsByLimits, self.skippedPointsBySize, 0,
+                               time.perf_counter() - self.startTime, bestProfit)
+
     def getItemIndex(self, count, i, allAsc):
         return count - i if allAsc else i - 1
 
     def solveByDynamicPrograming(self, size, count, lessSizeItems, lessSizeValues, lessSizeItemsIndex, partialSums,
                                  superIncreasingItems, allAsc, allDesc, canUsePartialSums, iterCounter):
 
-        DP = self.createDP(count)
+        useHistory = self.useDecisionHistory
+
+        if useHistory:
+            DP, curDP, history = None, {}, decisionHistory(count)
+        else:
+            DP, curDP, history = self.createDP(count), None, None
 
         resultI, resultP = 1, 1
 
@@ -505,16 +586,23 @@ class knapsackSolver:
 
         if self.printInfo:
             print(
-                f"1-0 knapsack dynamic programing solver: N={count}, Use limits={doUseLimits}, allAsc={allAsc}, allDesc={allDesc}, canUsePartialSums={canUsePartialSums}")
+                f"1-0 knapsack dynamic programing solver: N={count}, Use limits={doUseLimits}, allAsc={allAsc}, allDesc={allDesc}, canUsePartialSums={canUsePartialSums}, useDecisionHistory={useHistory}")
 
         for i in range(1, count + 1):
 
-            itemIndex = self.getItemIndex(count, i, allAsc)
+            checkCancellation(self.cancellation)
 
-            DP[i] = {}
+            itemIndex = self.getItemIndex(count, i, allAsc)
 
             itemValue, itemWeight = lessSizeValues[itemIndex], lessSizeItems[itemIndex]
-            prevDP, curDP = DP[i - 1], DP[i]
+
+            if useHistory:
+                # only the previous layer is alive, the history keeps points where the item was taken.
+                prevDP, curDP = curDP, {}
+                takenPoints = []
+            else:
+                DP[i] = {}
+                prevDP, curDP = DP[i - 1], DP[i]
 
             prevPointCount, newPointCount = newPointCount, prevPointCount
             newPointCount = 0
@@ -535,6 +623,12 @@ class knapsackSolver:
                     curValue = posblValue
                     curWeight = posblWeight
 
+                    if useHistory:
+                        takenPoints.append(p)
+
+                elif useHistory and p not in prevDP:
+                    takenPoints.append(p)
+
                 self.setValue(curDP, p, curValue, curWeight, iterCounter)
 
                 if maxValue < curValue:
@@ -543,35 +637,259 @@ class knapsackSolver:
                     maxValue = curValue
 
                 if self.canBackTraceWhenSizeReached and curWeight == size:
-                    self.backTraceItems(DP, resultI, resultP, lessSizeItems, lessSizeValues, lessSizeItemsIndex, allAsc,
-                                        iterCounter)
+                    if useHistory:
+                        history.setLayer(i, takenPoints)
+                        return self.backTraceHistoryItems(history, resultI, resultP, maxValue, lessSizeItems, lessSizeValues, lessSizeItemsIndex, allAsc, iterCounter)
+
+                    return self.backTraceItems(DP, resultI, resultP, lessSizeItems, lessSizeValues, lessSizeItemsIndex, allAsc,
+                                               iterCounter)
 
                 newPointCount += 1
 
+            if useHistory:
+                history.setLayer(i, takenPoints)
+
+            if self.layerHook is not None:
+                self.notifyObserver(i, newPointCount, maxValue)
+
             if self.printInfo:
                 print(f"| {i - 1} | {prevPointCount} | {round(iterCounter[0])} |")
 
-        return self.backTraceItems(DP, resultI, resultP, lessSizeItems, lessSizeValues, lessSizeItemsIndex, allAsc, iterCounter)
+        with measurePhase(self.metrics, "backTrace"):
+
+            if useHistory:
+                return self.backTraceHistoryItems(history, resultI, resultP, maxValue, lessSizeItems, lessSizeValues, lessSizeItemsIndex, allAsc, iterCounter)
+
+            return self.backTraceItems(DP, resultI, resultP, lessSizeItems, lessSizeValues, lessSizeItemsIndex, allAsc, iterCounter)
+
+    def canSolveByDenseDynamicPrograming(self, size, count, lessSizeItems, iterCounter):
+        """
+        Picks the dense engine for int instances up to denseDpSizeLimit capacity and denseDpCellLimit capacity * N
+        cells, which sparse DP layers would fill at least by denseDpFillRate. useDenseDp = False turns it off.
+        """
+
+        if not self.useDenseDp or type(size) is not int or size > self.denseDpSizeLimit or size * count > self.denseDpCellLimit:
+            return False
+
+        if not all(type(item) is int and item >= 0 for item in lessSizeItems):
+            return False
+
+        # counts the points of sparse DP layers using the reachable sums bitset, the dense array pays for all size + 1 cells.
+        mask = (1 << (size + 1)) - 1
+        reachable, pointCount = 1, 0
+
+        for item in lessSizeItems:
+            reachable = (reachable | (reachable << item)) & mask
+            pointCount += reachable.bit_count()
+
+        iterCounter[0] += count
+
+        return pointCount >= self.denseDpFillRate * size * count
+
+    def solveByDenseDynamicPrograming(self, size, count, lessSizeItems, lessSizeValues, lessSizeItemsIndex, iterCounter):
+        """
+        Rolling array DP for int weights. The profit list is indexed by capacity, each item updates it with the
+        element wise max of the list and the list shifted by item weight. The decision of each item is kept as
+        the single int with bit c set when the item is taken for capacity c, backtracking reads one bit per item.
+        """
+
+        if self.printInfo:
+            print(f"1-0 knapsack dense dynamic programing solver: N={count}, size={size}")
+
+        DP = [0] * (size + 1)
+        decisions = []
+
+        for i, (itemWeight, itemValue) in enumerate(zip(lessSizeItems, lessSizeValues), 1):
+
+            checkCancellation(self.cancellation)
+
+            oldValues = DP[itemWeight:]
+            newValues = list(map(add, DP[:size + 1 - itemWeight], repeat(itemValue)))
+
+            decisionBytes = bytes(map(gt, newValues, oldValues))
+            decisions.append(int(decisionBytes[::-1].translate(decisionBitsTable), 2) << itemWeight)
+
+            DP[itemWeight:] = map(max, oldValues, newValues)
+
+            iterCounter[0] += len(oldValues)
+
+            if self.layerHook is not None:
+                self.notifyObserver(i, len(DP), DP[size])
+
+        point = size
+        optSize = 0
+        optWeights, optValues, optIndex = [], [], []
+
+        for i in range(count - 1, -1, -1):
+
+            if (decisions[i] >> point) & 1:
+                optWeights.append(lessSizeItems[i])
+                optValues.append(lessSizeValues[i])
+                optIndex.append(lessSizeItemsIndex[i])
+
+                point -= lessSizeItems[i]
+                optSize += lessSizeItems[i]
+
+        iterCounter[0] += count
+
+        return DP[size], optSize, optWeights, optValues, optIndex
+
+    def canSolveByMeetInTheMiddle(self, size, count, lessSizeItems):
+
+        if not self.useMeetInTheMiddle or self.forceUseDpSolver or count > self.meetInTheMiddleMaxCount:
+            return False
+
+        # the number of DP points may reach 2 ^ N, int weights have no more than size + 1 distinct points.
+        stateCount = 2 ** count
+
+        if type(size) is int and all(type(item) is int for item in lessSizeItems):
+            stateCount = min(stateCount, size + 1)
+
+        return stateCount > self.meetInTheMiddleStateLimit
+
+    def solveByMeetInTheMiddle(self, size, count, lessSizeItems, lessSizeValues, lessSizeItemsIndex, iterCounter):
+
+        if self.printInfo:
+            print(f"1-0 knapsack meet in the middle solver: N={count}, size={size}")
+
+        mitmSolver = meetInTheMiddleSolver(size, lessSizeItems, lessSizeValues, iterCounter)
+        mitmSolver.printInfo = self.printInfo
+
+        optValue, optSize, optItems = mitmSolver.solve()
+
+        optWeights = [lessSizeItems[i] for i in optItems]
+        optValues = [lessSizeValues[i] for i in optItems]
+        optIndex = [lessSizeItemsIndex[i] for i in optItems]
+
+        return optValue, optSize, optWeights, optValues, optIndex
+
+    def canSolveByExpandingCore(self, size, count, lessSizeItems, lessSizeValues):
+
+        if not self.useExpandingCore or self.forceUseDpSolver or count < self.expandingCoreMinCount:
+            return False
+
+        return expandingCoreSolver.canSolve(size, lessSizeItems, lessSizeValues)
+
+    def solveByExpandingCore(self, size, count, lessSizeItems, lessSizeValues, lessSizeItemsIndex, iterCounter):
+
+        if self.printInfo:
+            print(f"1-0 knapsack expanding core solver: N={count}, size={size}")
+
+        coreSolver = expandingCoreSolver(size, lessSizeItems, lessSizeValues, iterCounter)
+        coreSolver.printInfo = self.printInfo
+
+        optValue, optSize, optItems = coreSolver.solve()
+
+        if self.printInfo:
+            print(f"core size {coreSolver.coreSize} of {count}, skipped by BOUND {coreSolver.skippedPointsByBound}, by PARETO {coreSolver.skippedPointsByPareto}")
+
+        optWeights = [lessSizeItems[i] for i in optItems]
+        optValues = [lessSizeValues[i] for i in optItems]
+        optIndex = [lessSizeItemsIndex[i] for i in optItems]
+
+        return optValue, optSize, optWeights, optValues, optIndex
+
+    def solveByItemReduction(self, reduction):
+
+        reducedSolver = copy(self)
+        reducedSolver.useItemReduction = False
+        reducedSolver.fixedItemsCount, reducedSolver.dominatedItemsCount = 0, 0
+        reducedSolver.size = reduction.getReducedConstraint()
+        reducedSolver.weights, reducedSolver.values = reduction.getReducedItems()
+
+        bestValue, bestSize, bestItems, bestValues, bestIndexes = reducedSolver.solve()
+
+        self.fixedItemsCount += reducedSolver.fixedItemsCount
+        self.dominatedItemsCount += reducedSolver.dominatedItemsCount
+
+        optIndex = reduction.restoreIndexes(bestIndexes)
+        optWeights = [self.weights[i] for i in optIndex]
+        optValues = [self.values[i] for i in optIndex]
+
+        return sum(optValues), sum(optWeights), optWeights, optValues, optIndex
 
     def solve(self):
 
+        self.startTime = time.perf_counter()
+        self.layerHook = getLayerObserver(self.metrics, self.observer)
+
+        result = self.solveInstance()
+
+        if self.metrics is not None:
+            self.metrics.addCounters(skippedPointsByMap=self.skippedPointsByMap,
+                                     skippedPointsByLimits=self.skippedPointsByLimits,
+                                     skippedPointsBySize=self.skippedPointsBySize,
+                                     totalPointCount=self.totalPointCount,
+                                     fixedItemsCount=self.fixedItemsCount,
+                                     dominatedItemsCount=self.dominatedItemsCount)
+
+        return result
+
+    def solveInstance(self):
+
+        if self.useItemReduction:
+            reduction = itemReduction(self.size, self.weights, self.values)
+
+            with measurePhase(self.metrics, "reduction"):
+                isReduced = reduction.reduce(self.iterCounter)
+
+            if isReduced:
+                self.fixedItemsCount = reduction.getFixedCount()
+
+                if self.printInfo:
+                    print(f"1-0 knapsack item reduction: fixed in {len(reduction.fixedIn)}, fixed out {len(reduction.fixedOut)}, undecided {len(reduction.undecided)}")
+
+                return self.solveByItemReduction(reduction)
+
+        if self.useDominanceReduction:
+            reduction = dominanceReduction(self.size, self.weights, self.values)
+
+            with measurePhase(self.metrics, "reduction"):
+                isReduced = reduction.reduce(self.iterCounter)
+
+            if isReduced:
+                self.dominatedItemsCount = reduction.getFixedCount()
+
+                if self.printInfo:
+                    print(f"1-0 knapsack dominance reduction: dominated {len(reduction.fixedOut)}, {len(self.weights)} items reduced to {len(reduction.groups)}")
+
+                return self.solveByItemReduction(reduction)
+
         size, weights, values, forceUseLimits, iterCounter = self.size, self.weights, self.values, self.forceUseLimits, self.iterCounter
 
-        size, count, lessSizeItems, lessSizeValues, lessSizeItemsIndex, itemSum, lessCountSum, lessCountValuesSum, partialSums, superIncreasing, superIncreasingItems, allAsc, allDesc, canUsePartialSums = self.preProcess(
-            size, weights, values, forceUseLimits, iterCounter)
+        with measurePhase(self.metrics, "preProcess"):
+            size, count, lessSizeItems, lessSizeValues, lessSizeItemsIndex, itemSum, lessCountSum, lessCountValuesSum, partialSums, superIncreasing, superIncreasingItems, allAsc, allDesc, canUsePartialSums = self.preProcess(
+                size, weights, values, forceUseLimits, iterCounter)
 
-        cornerCasesCheck = self.checkCornerCases(size, lessSizeItems, lessSizeValues, lessSizeItemsIndex, lessCountSum,
-                                                 itemSum, lessCountValuesSum)
+        with measurePhase(self.metrics, "cornerCases"):
+            cornerCasesCheck = self.checkCornerCases(size, lessSizeItems, lessSizeValues, lessSizeItemsIndex, lessCountSum,
+                                                     itemSum, lessCountValuesSum)
 
         if cornerCasesCheck:
             return cornerCasesCheck
 
         if self.doSolveSuperInc and superIncreasing:
-            return self.solveSuperIncreasing(size, lessSizeItems, lessSizeValues, lessSizeItemsIndex, count, allAsc, iterCounter)
+            with measurePhase(self.metrics, "superIncreasing"):
+                return self.solveSuperIncreasing(size, lessSizeItems, lessSizeValues, lessSizeItemsIndex, count, allAsc, iterCounter)
+
+        if self.canSolveByMeetInTheMiddle(size, count, lessSizeItems):
+            with measurePhase(self.metrics, "meetInTheMiddle"):
+                return self.solveByMeetInTheMiddle(size, count, lessSizeItems, lessSizeValues, lessSizeItemsIndex, iterCounter)
+
+        if self.canSolveByExpandingCore(size, count, lessSizeItems, lessSizeValues):
+            with measurePhase(self.metrics, "expandingCore"):
+                return self.solveByExpandingCore(size, count, lessSizeItems, lessSizeValues, lessSizeItemsIndex, iterCounter)
+
+        if self.canSolveByDenseDynamicPrograming(size, count, lessSizeItems, iterCounter):
+            with measurePhase(self.metrics, "denseDp"):
+                return self.solveByDenseDynamicPrograming(size, count, lessSizeItems, lessSizeValues, lessSizeItemsIndex, iterCounter)
 
         if canUsePartialSums and (allAsc or allDesc) or self.forceUseDpSolver:
-            return self.solveByDynamicPrograming(size, count, lessSizeItems, lessSizeValues, lessSizeItemsIndex,
-                                                 partialSums, superIncreasingItems, allAsc, allDesc, canUsePartialSums,
-                                                 iterCounter)
+
+            with measurePhase(self.metrics, "dp"):
+
+                return self.solveByDynamicPrograming(size, count, lessSizeItems, lessSizeValues, lessSizeItemsIndex,
+                                                     partialSums, superIncreasingItems, allAsc, allDesc, canUsePartialSums,
+                                                     iterCounter)
 
         return self.solveByPareto(lessSizeItems, lessSizeValues, lessSizeItemsIndex, size, iterCounter)
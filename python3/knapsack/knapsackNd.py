@@ -14,12 +14,19 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR TH
 """
 
 from flags.flags import doUseLimits, doSolveSuperInc
+from .decisionHistory import decisionHistory
+from .itemReduction import itemReduction
+from .dominanceReduction import dominanceReduction
 from .knapsack import knapsackSolver
+from .cancellation import checkCancellation
+from .layerObserver import getLayerObserver
+from .solverMetrics import getMetrics, measurePhase
 
 from .knapsackPareto import *
 
 from collections import defaultdict
 from collections import deque
+from copy import copy
 from decimal import Decimal
 
 import time
@@ -37,6 +44,7 @@ class knapsackNSolver:
         self.items = items
         self.values = values
         self.iterCounter = iterCounter
+        self.metrics = getMetrics(iterCounter)
         self.forceUseLimits = forceUseLimits
         self.forceUseDpSolver = forceUseDpSolver
         self.emptyPoint = emptyPoint
@@ -54,6 +62,19 @@ class knapsackNSolver:
         self.doUseLimits = True
         self.canBackTraceWhenSizeReached = False
         self.useRatioSortForPareto = False
+        self.useDecisionHistory = False
+        self.useItemReduction = False
+        self.fixedItemsCount = 0
+        self.useDominanceReduction = False
+        self.dominatedItemsCount = 0
+        self.cancellation = None
+        self.observer = None
+        self.layerHook = None
+        self.startTime = 0
+
+    def notifyObserver(self, layerIndex, pointCount, bestProfit):
+        self.layerHook.onLayer(layerIndex, pointCount, self.skippedPointsByMap, self.skippedPointsByLimits, self.skippedPointsBySize, 0,
+                               time.perf_counter() - self.startTime, bestProfit)
 
     def createNewPoint(self, tuples):
         return self.emptyPoint.createNew(tuples)
@@ -125,6 +146,9 @@ class knapsackNSolver:
                 itemSum1 += item1
                 itemSum2 += item2
 
+                valuesSum1 += itemValue1
+                valuesSum2 += itemValue2
+
                 partialSums1.append(itemSum2)
                 partialSums2.append(itemSum1)
 
@@ -170,12 +194,12 @@ class knapsackNSolver:
             if allAsc and canUsePartialSums:
                 partialSums = partialSums2
                 superIncreasingItems = superIncreasingItems2
-                isSuperIncreasing = isSuperIncreasing2
+                isSuperIncreasing = isSuperIncreasing2 and isSuperIncreasingValues2
                 itemSum = itemSum2
             elif allDesc and canUsePartialSums or forceUseLimits:
                 partialSums = partialSums1
                 superIncreasingItems = superIncreasingItems1
-                isSuperIncreasing = isSuperIncreasing1
+                isSuperIncreasing = isSuperIncreasing1 and isSuperIncreasingValues1
                 itemSum = itemSum1
 
                 partialSums.reverse()
@@ -364,6 +388,40 @@ class knapsackNSolver:
 
         return opt, optDims, optItems, optValues
 
+    def backTraceHistoryItems(self, history, resultI, resultP, resultValue, items, values, allAsc, iterCounter):
+        res = resultValue
+        optItems, optValues = [], []
+        point = resultP
+        optDims = self.emptyPoint
+        opt = 0
+
+        count = len(items)
+
+        if self.printDpInfo:
+            print(
+                f"Skipped points by MAP: {self.skippedPointsByMap}, by LIMITS: {self.skippedPointsByLimits}; by SIZE: {self.skippedPointsBySize}; Total points: {self.totalPointCount}; History points: {history.getSize()};")
+
+        for i in range(resultI, 0, -1):
+
+            iterCounter[0] += 1
+
+            if res <= 0:
+                break
+
+            if history.isTaken(i, point):
+                itemIndex = self.getItemIndex(count, i, allAsc)
+                item, itemValue = items[itemIndex], values[itemIndex]
+
+                optItems.append(item.getDimensions())
+                optValues.append(itemValue)
+
+                res -= itemValue
+                point -= item
+                opt += itemValue
+                optDims += item
+
+        return opt, optDims, optItems, optValues
+
     def createDP(self, count):
         self.DP = [None] * (count + 1)
         self.DP[0] = defaultdict()
@@ -455,7 +513,7 @@ class knapsackNSolver:
         if not self.doUseLimits or not canUsePartialSums:
             return None, None, None, 0
 
-        skipCount = 2 ** (len(items) - itemIndex + 1) if self.printDpInfo else 0
+        skipCount = 2 ** (len(items) - itemIndex + 1) if self.printDpInfo else 1
 
         partSumForItem = partialSums[itemIndex]
         superIncreasingItem = superIncreasingItems[itemIndex]
@@ -474,7 +532,12 @@ class knapsackNSolver:
     def solveByDynamicPrograming(self, constraints, count, lessSizeItems, lessSizeValues, partialSums,
                                  superIncreasingItems, allAsc, allDesc, forceUseLimits, canUsePartialSums, iterCounter):
 
-        DP = self.createDP(count)
+        useHistory = self.useDecisionHistory
+
+        if useHistory:
+            DP, curDP, history = None, defaultdict(), decisionHistory(count)
+        else:
+            DP, curDP, history = self.createDP(count), None, None
 
         resultI, resultP = 1, self.emptyPoint
 
@@ -491,12 +554,19 @@ class knapsackNSolver:
 
         for i in range(1, count + 1):
 
+            checkCancellation(self.cancellation)
+
             itemIndex = self.getItemIndex(count, i, allAsc)
 
-            DP[i] = defaultdict()
+            if useHistory:
+                # only the previous layer is alive, the history keeps points where the item was taken.
+                prevDP, curDP = curDP, defaultdict()
+                takenPoints = []
+            else:
+                DP[i] = defaultdict()
+                prevDP, curDP = DP[i - 1], DP[i]
 
             itemValue, item = lessSizeValues[itemIndex], lessSizeItems[itemIndex]
-            prevDP, curDP = DP[i - 1], DP[i]
 
             prevPointCount, newPointCount = newPointCount, prevPointCount
             newPointCount = 0
@@ -519,20 +589,38 @@ class knapsackNSolver:
 
                 self.setValue(curDP, p, curValue, curDim, iterCounter)
 
+                if useHistory and (p not in prevDP or prevDP[p][0] != curValue):
+                    takenPoints.append(p)
+
                 if maxValue <= curValue:
                     resultP = p
                     resultI = i
                     maxValue = curValue
 
                 if self.canBackTraceWhenSizeReached and curDim == constraints:
+                    if useHistory:
+                        history.setLayer(i, takenPoints)
+                        return self.backTraceHistoryItems(history, resultI, resultP, maxValue, lessSizeItems, lessSizeValues, allAsc, iterCounter)
+
                     return self.backTraceItems(DP, resultI, resultP, lessSizeItems, lessSizeValues, allAsc, iterCounter)
 
                 newPointCount += 1
 
+            if useHistory:
+                history.setLayer(i, takenPoints)
+
+            if self.layerHook is not None:
+                self.notifyObserver(i, newPointCount, maxValue)
+
             if self.printDpInfo:
                 print(f"| {i - 1} | {prevPointCount} | {round(iterCounter[0])} |")
 
-        return self.backTraceItems(DP, resultI, resultP, lessSizeItems, lessSizeValues, allAsc, iterCounter)
+        with measurePhase(self.metrics, "backTrace"):
+
+            if useHistory:
+                return self.backTraceHistoryItems(history, resultI, resultP, maxValue, lessSizeItems, lessSizeValues, allAsc, iterCounter)
+
+            return self.backTraceItems(DP, resultI, resultP, lessSizeItems, lessSizeValues, allAsc, iterCounter)
 
     def solveByPareto(self, constraints, lessSizeItems, lessSizeValues, iterCounter):
 
@@ -545,29 +633,104 @@ class knapsackNSolver:
         paretoSolver.printInfo = self.printDpInfo
         paretoSolver.canBackTraceWhenSizeReached = self.canBackTraceWhenSizeReached
         paretoSolver.useRatioSort = self.useRatioSortForPareto
+        paretoSolver.cancellation = self.cancellation
+        paretoSolver.observer = self.observer
 
         opt, optDims, optItems, optValues, optIndex = paretoSolver.solve()
         return opt, optDims, optItems, optValues
 
+    def solveByItemReduction(self, reduction):
+
+        reducedSolver = copy(self)
+        reducedSolver.useItemReduction = False
+        reducedSolver.fixedItemsCount, reducedSolver.dominatedItemsCount = 0, 0
+        reducedSolver.constraints = reduction.getReducedConstraint()
+        reducedSolver.items, reducedSolver.values = reduction.getReducedItems()
+
+        bestValue, bestSize, bestItems, bestValues = reducedSolver.solve()
+
+        self.fixedItemsCount += reducedSolver.fixedItemsCount
+        self.dominatedItemsCount += reducedSolver.dominatedItemsCount
+
+        bestItems, bestValues = list(bestItems), list(bestValues)
+
+        for i in reduction.fixedIn:
+            bestValue += self.values[i]
+            bestSize += self.items[i]
+            bestItems.append(self.items[i])
+            bestValues.append(self.values[i])
+
+        return bestValue, bestSize, bestItems, bestValues
+
     def solve(self):
 
+        self.startTime = time.perf_counter()
+        self.layerHook = getLayerObserver(self.metrics, self.observer)
+
+        result = self.solveInstance()
+
+        if self.metrics is not None:
+            self.metrics.addCounters(skippedPointsByMap=self.skippedPointsByMap,
+                                     skippedPointsByLimits=self.skippedPointsByLimits,
+                                     skippedPointsBySize=self.skippedPointsBySize,
+                                     totalPointCount=self.totalPointCount,
+                                     fixedItemsCount=self.fixedItemsCount,
+                                     dominatedItemsCount=self.dominatedItemsCount)
+
+        return result
+
+    def solveInstance(self):
+
+        if self.useItemReduction:
+            reduction = itemReduction(self.constraints, self.items, self.values)
+
+            with measurePhase(self.metrics, "reduction"):
+                isReduced = reduction.reduce(self.iterCounter)
+
+            if isReduced:
+                self.fixedItemsCount = reduction.getFixedCount()
+
+                if self.printDpInfo:
+                    print(f"N dim knapsack item reduction: fixed in {len(reduction.fixedIn)}, fixed out {len(reduction.fixedOut)}, undecided {len(reduction.undecided)}")
+
+                return self.solveByItemReduction(reduction)
+
+        if self.useDominanceReduction:
+            # the result has no item indexes, so duplicates are not collapsed to bundles that cannot be mapped back.
+            reduction = dominanceReduction(self.constraints, self.items, self.values, collapseDuplicates=False)
+
+            with measurePhase(self.metrics, "reduction"):
+                isReduced = reduction.reduce(self.iterCounter)
+
+            if isReduced:
+                self.dominatedItemsCount = reduction.getFixedCount()
+
+                if self.printDpInfo:
+                    print(f"N dim knapsack dominance reduction: dominated {len(reduction.fixedOut)}")
+
+                return self.solveByItemReduction(reduction)
+
         constraints, items, values, forceUseLimits, iterCounter = self.constraints, self.items, self.values, self.forceUseLimits, self.iterCounter
 
-        constraints, count, lessSizeItems, lessSizeValues, itemSum, lessCountSum, partialSums, superIncreasing, superIncreasingItems, allAsc, allDesc, canUsePartialSums = self.preProcess(
-            constraints, items, values, forceUseLimits, iterCounter)
+        with measurePhase(self.metrics, "preProcess"):
+            constraints, count, lessSizeItems, lessSizeValues, itemSum, lessCountSum, partialSums, superIncreasing, superIncreasingItems, allAsc, allDesc, canUsePartialSums = self.preProcess(
+                constraints, items, values, forceUseLimits, iterCounter)
 
-        cornerCasesCheck = self.checkCornerCases(constraints, lessSizeItems, lessSizeValues, lessCountSum, itemSum)
+        with measurePhase(self.metrics, "cornerCases"):
+            cornerCasesCheck = self.checkCornerCases(constraints, lessSizeItems, lessSizeValues, lessCountSum, itemSum)
 
         if cornerCasesCheck:
             return cornerCasesCheck
 
         if self.doSolveSuperInc and superIncreasing:
-            return self.solveSuperIncreasing(constraints, lessSizeItems, lessSizeValues, count, allAsc, iterCounter)
+            with measurePhase(self.metrics, "superIncreasing"):
+                return self.solveSuperIncreasing(constraints, lessSizeItems, lessSizeValues, count, allAsc, iterCounter)
 
         if len(items) <= self.worstCaseExpLimit or ((allAsc or allDesc) and canUsePartialSums) or self.forceUseDpSolver or self.forceUseLimits:
-            return self.solveByDynamicPrograming(constraints, count, lessSizeItems, lessSizeValues, partialSums,
-                                                 superIncreasingItems, allAsc, allDesc, forceUseLimits,
-                                                 canUsePartialSums, iterCounter)
+            with measurePhase(self.metrics, "dp"):
+                return self.solveByDynamicPrograming(constraints, count, lessSizeItems, lessSizeValues, partialSums,
+                                                     superIncreasingItems, allAsc, allDesc, forceUseLimits,
+                                                     canUsePartialSums, iterCounter)
 
         return self.solveByPareto(constraints, lessSizeItems, lessSizeValues, iterCounter)
 
@@ -15,7 +15,29 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR TH
 
 import math
 import sys
+import time
+from array import array
+from bisect import bisect_right
 from collections import deque
+from copy import copy
+from itertools import repeat, compress
+from operator import add
+
+from .paretoFront import paretoFront, createColumn, createColumnLike
+from .itemReduction import itemReduction
+from .dominanceReduction import dominanceReduction
+from .paretoShards import paretoShardsSolver
+from .layerObserver import getLayerObserver
+from .sourceLink import sourceLinkArena
+from .solverMetrics import getMetrics, measurePhase
+from .upperBound import dantzigBound
+from .wPoint import wPoint1
+from .cancellation import checkCancellation
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class knapsackParetoSolver:
@@ -30,12 +52,14 @@ class knapsackParetoSolver:
         self.forceUseLimits = False
         self.forceUsePareto = True
         self.iterCounter = iterCounter
+        self.metrics = getMetrics(iterCounter)
         self.totalPointCount = 0
         self.skippedPointsBySize = 0
         self.skippedPointsByMap = 0
         self.skippedPointsByPareto = 0
         self.skippedPointsByLimits = 0
         self.skippedPointsBySize = 0
+        self.skippedPointsByBound = 0
         self.printInfo = False
         self.printSuperIncreasingInfo = False
         self.doSolveSuperInc = True
@@ -49,6 +73,53 @@ class knapsackParetoSolver:
         self.solvedBySuperIncreasingSolverDesc = False
         self.cornerCaseSolved = False
         self.keepCircularPointQueueSorted = True
+        self.useColumnFront = False
+        self.useVectorizedMerge = False
+        self.vectorizedMergeMinSize = 256
+        self.useUpperBoundPruning = False
+        self.useItemReduction = False
+        self.fixedItemsCount = 0
+        self.useDominanceReduction = False
+        self.dominatedItemsCount = 0
+        self.parallelShardCount = 0
+        self.parallelExecutor = None
+        self.cancellation = None
+        self.observer = None
+        self.layerHook = None
+        self.startTime = 0
+        self.deadline = 0
+        self.iterationLimit = 0
+        self.isOptimal = True
+        self.sourceLinks = sourceLinkArena()
+        self.sourceLinksCompactionSize = 2 ** 16
+        self.sourceLinksLimit = self.sourceLinksCompactionSize
+
+    def notifyObserver(self, layerIndex, pointCount, bestProfit):
+        self.layerHook.onLayer(layerIndex, pointCount, self.skippedPointsByMap, self.skippedPointsByLimits, self.skippedPointsBySize, self.skippedPointsByPareto,
+                               time.perf_counter() - self.startTime, bestProfit)
+
+    def isBudgetExceeded(self, iterCounter):
+
+        if self.deadline and time.perf_counter() >= self.deadline:
+            return True
+
+        return self.iterationLimit > 0 and iterCounter[0] >= self.iterationLimit
+
+    def isIncumbentOptimal(self, constraint, restItems, restValues, frontPoints, lowerBound, maxProfit):
+        """
+        The best point found is proven optimal if no front point can beat it with the LP relaxation bound of items not visited.
+        Points pruned by the upper bound could beat the lower bound only, so it should not be greater than the best profit.
+        """
+
+        if len(restItems) == 0:
+            return True
+
+        if self.emptyDimension.getSize() != 1 or lowerBound > maxProfit:
+            return False
+
+        bound = dantzigBound([item.getDimension(0) for item in restItems], list(restValues), constraint.getDimension(0))
+
+        return all(bound.getBound(w, p) <= maxProfit for w, p in frontPoints)
 
     def createNewPoint(self, values, profit, id):
         return self.emptyPoint.createNew(values.getDimensions(), profit, id)
@@ -116,7 +187,7 @@ class knapsackParetoSolver:
             oldPoint = oldList[oldPointIndex]
             newPoint = newList[newPointIndex]
 
-            if oldPoint < newPoint or (oldPoint == newPoint and oldPoint.getProfit() > newPoint.getProfit()):
+            if oldPoint < newPoint or (oldPoint.isDimensionEquals(newPoint) and oldPoint.getProfit() >= newPoint.getProfit()):
                 result.append(oldPoint)
                 profitMax = oldPoint.getProfit()              
             else:
@@ -183,26 +254,52 @@ class knapsackParetoSolver:
 
     def backTraceItemsCore(self, maxProfitPoint, count, iterCounter):
         if maxProfitPoint:
+            return self.backTraceItemIds(self.sourceLinks.getItemIds(maxProfitPoint.source), count, iterCounter)
+        return 0, self.emptyPoint, [], [], []
 
-            optSize = self.emptyDimension
-            optItems, optValues, optIndexes  = [], [], []
+    def resetSourceLinks(self):
+        self.sourceLinks = sourceLinkArena()
+        self.sourceLinksLimit = self.sourceLinksCompactionSize
 
-            maxProfit = 0
+    def compactSourceLinks(self, livePoints, maxProfitPoint):
 
-            for id in maxProfitPoint.getItemIds():
-                optItems.append(self.dimensions[id])
-                optValues.append(self.values[id])
-                optIndexes.append(self.indexes[id])
-                optSize += self.dimensions[id]
-                maxProfit += self.values[id]
+        # links of the dominated and discarded points are not reachable from live points anymore.
+        # The arena is compacted when it doubles since the last compaction, so it costs O(1) per link.
 
-            iterCounter[0] += len(optItems)
+        if len(self.sourceLinks) <= self.sourceLinksLimit:
+            return
 
-            if self.printInfo:
-                print(f"Skipped points by MAP: {self.skippedPointsByMap}, by LIMITS: {self.skippedPointsByLimits}; by SIZE: {self.skippedPointsBySize}; by PARETO: {self.skippedPointsByPareto}; Total points: {self.totalPointCount}; N={count};")
+        remap = self.sourceLinks.compact([p.source for p in livePoints] + [maxProfitPoint.source])
 
-            return maxProfit, optSize, optItems, optValues, optIndexes
-        return 0, self.emptyPoint, [], [], []
+        newLinks, maxProfitLink = [remap[p.source] for p in livePoints], remap[maxProfitPoint.source]
+
+        for p, link in zip(livePoints, newLinks):
+            p.source = link
+
+        maxProfitPoint.source = maxProfitLink
+
+        self.sourceLinksLimit = max(self.sourceLinksCompactionSize, 2 * len(self.sourceLinks))
+
+    def backTraceItemIds(self, itemIds, count, iterCounter):
+
+        optSize = self.emptyDimension
+        optItems, optValues, optIndexes  = [], [], []
+
+        maxProfit = 0
+
+        for id in itemIds:
+            optItems.append(self.dimensions[id])
+            optValues.append(self.values[id])
+            optIndexes.append(self.indexes[id])
+            optSize += self.dimensions[id]
+            maxProfit += self.values[id]
+
+        iterCounter[0] += len(optItems)
+
+        if self.printInfo:
+            print(f"Skipped points by MAP: {self.skippedPointsByMap}, by LIMITS: {self.skippedPointsByLimits}; by SIZE: {self.skippedPointsBySize}; by PARETO: {self.skippedPointsByPareto}; by BOUND: {self.skippedPointsByBound}; Total points: {self.totalPointCount}; N={count};")
+
+        return maxProfit, optSize, optItems, optValues, optIndexes
 
     def preProcess(self, constraints, items, values, forceUseLimits, iterCounter):
        
@@ -319,13 +416,13 @@ class knapsackParetoSolver:
             if allAsc and canUsePartialSums:
                 partialSums = partialSums2
                 superIncreasingItems = superIncreasingItems2
-                isSuperIncreasing = isSuperIncreasing2
+                isSuperIncreasing = isSuperIncreasing2 and isSuperIncreasingValues2
                 itemSum = itemSum2    
 
             elif  (allDesc and canUsePartialSums) or forceUseLimits:
                 partialSums = partialSums1
                 superIncreasingItems = superIncreasingItems1
-                isSuperIncreasing = isSuperIncreasing1
+                isSuperIncreasing = isSuperIncreasing1 and isSuperIncreasingValues1
                 itemSum = itemSum1
 
                 partialSums.reverse()
@@ -468,7 +565,7 @@ class knapsackParetoSolver:
         if not self.doUseLimits or not canUsePartialSums or self.prepareSearchIndex:
             return None, None, None, 0
 
-        skipCount = 2 ** (len(items) - (i + 1)) if self.printInfo else 0
+        skipCount = 2 ** (len(items) - (i + 1)) if self.printInfo else 1
 
         partSumForItem = partialSums[i]
         superIncreasingItem = superIncreasingItems[i] if len(superIncreasingItems) > 0 else None
@@ -541,6 +638,8 @@ class knapsackParetoSolver:
         if useItemItself:
 
             if  itemPoint not in distinctPoints1:
+                itemPoint.source = self.sourceLinks.add(itemId, -1)
+
                 self.iterateOrPushBack(circularPointQueue, itemPoint, greaterQu, distinctPoints2)
 
                 if maxProfitPoint.getProfit() <= itemPoint.getProfit():
@@ -566,6 +665,8 @@ class knapsackParetoSolver:
 
                 if  newPoint not in distinctPoints1:
 
+                    newPoint.source = self.sourceLinks.add(itemId, oldPoint.source)
+
                     self.iterateOrPushBack(circularPointQueue, newPoint, greaterQu, distinctPoints2)
 
                     if maxProfitPoint.getProfit() <= newPoint.getProfit():
@@ -601,12 +702,21 @@ class knapsackParetoSolver:
 
         circularPointQueue = deque()
 
+        self.resetSourceLinks()
+
         prevPointCount, newPointCount = 0, 0
 
         halfConstraint = constraint.divideBy(2)
 
         for i in range(1, itemsCount + 1):
 
+            checkCancellation(self.cancellation)
+
+            if self.isBudgetExceeded(self.iterCounter):
+                # points skipped by limits are not kept, so the best point found is not proven optimal.
+                self.isOptimal = False
+                break
+
             itemIndex = self.getItemIndex(itemsCount, i, allAsc)
 
             itemDimensions, itemProfit, itemId = sortedItems[itemIndex], sortedValues[itemIndex], sortedIndexes[itemIndex]
@@ -620,7 +730,46 @@ class knapsackParetoSolver:
 
             prevPointCount = newPointCount
 
-        return self.backTraceItemsLimits(constraint, circularPointQueue, maxProfitPoint, itemsCount, self.iterCounter)
+            if self.layerHook is not None:
+                self.notifyObserver(i, newPointCount, maxProfitPoint.getProfit())
+
+            self.compactSourceLinks(circularPointQueue, maxProfitPoint)
+
+        with measurePhase(self.metrics, "backTrace"):
+            return self.backTraceItemsLimits(constraint, circularPointQueue, maxProfitPoint, itemsCount, self.iterCounter)
+
+    def createUpperBound(self, constraint, sortedItems, sortedValues):
+
+        # the search index needs all points for less constraints, so the pruning is used for 1D solve only.
+        if not self.useUpperBoundPruning or self.prepareSearchIndex or self.emptyDimension.getSize() != 1:
+            return None
+
+        return dantzigBound([item.getDimension(0) for item in sortedItems], list(sortedValues), constraint.getDimension(0))
+
+    def pruneByUpperBound(self, points, upperBound, lowerBound, iterCounter):
+
+        # the point cannot beat the best profit known if its profit plus LP bound of the remaining items is less than it.
+        result = list(compress(points, upperBound.getHopefulMask([p.getDimension(0) for p in points], [p.getProfit() for p in points], lowerBound)))
+
+        self.skippedPointsByBound += len(points) - len(result)
+
+        iterCounter[0] += len(points)
+
+        return result
+
+    def pruneByUpperBoundColumns(self, front, upperBound, lowerBound, iterCounter):
+
+        keep = upperBound.getHopefulMask(front.weights, front.profits, lowerBound)
+
+        result = paretoFront(createColumnLike(front.weights, compress(front.weights, keep)),
+                             createColumnLike(front.profits, compress(front.profits, keep)),
+                             array('l', compress(front.links, keep)))
+
+        self.skippedPointsByBound += len(front) - len(result)
+
+        iterCounter[0] += len(front)
+
+        return result
 
     def getNewPoints(self, i, maxProfitPoint, itemDimensions, itemProfit, itemId, oldPoints, constraint, prevDistinctPoints, newDistinctPoints, skipCount, iterCounter):
 
@@ -634,6 +783,8 @@ class knapsackParetoSolver:
 
             if newPoint <= constraint:
 
+                newPoint.source = self.sourceLinks.add(itemId, oldPoint.source)
+
                 if newPoint not in prevDistinctPoints:
                     newDistinctPoints.add(newPoint)
                     result.append(newPoint)
@@ -669,11 +820,23 @@ class knapsackParetoSolver:
         oldPoints = [emptyPoint]
         newPoints = []      
 
+        self.resetSourceLinks()
+
         itemsCount = len(sortedItems)
 
+        upperBound = self.createUpperBound(constraint, sortedItems, sortedValues)
+
+        lowerBound = upperBound.getGreedyProfit() if upperBound else self.emptyPoint.getProfit()
+
         for i in range(1, itemsCount + 1):
 
-            skipCount = 2 ** (itemsCount - i)  if self.printInfo else 0
+            checkCancellation(self.cancellation)
+
+            if self.isBudgetExceeded(iterCounter):
+                self.isOptimal = self.isIncumbentOptimal(constraint, sortedItems[i - 1:], sortedValues[i - 1:], ((p.getDimension(0), p.getProfit()) for p in oldPoints), lowerBound, maxProfitPoint.getProfit())
+                break
+
+            skipCount = 2 ** (itemsCount - i) if self.printInfo else 1
 
             itemDimensions, itemProfit, itemId = sortedItems[i - 1], sortedValues[i - 1], sortedIndexes[i - 1]
 
@@ -685,9 +848,268 @@ class knapsackParetoSolver:
             if self.canBackTraceWhenSizeReached and maxProfitPoint.isDimensionEquals(constraint):
                 return self.backTraceItemsPareto(constraint, paretoOptimal, maxProfitPoint, itemsCount, iterCounter)
 
+            if upperBound:
+                upperBound.removeItem(i - 1)
+                paretoOptimal = self.pruneByUpperBound(paretoOptimal, upperBound, max(lowerBound, maxProfitPoint.getProfit()), iterCounter)
+
             oldPoints = paretoOptimal
 
-        return self.backTraceItemsPareto(constraint, oldPoints, maxProfitPoint, itemsCount, iterCounter)
+            if self.layerHook is not None:
+                self.notifyObserver(i, len(oldPoints), maxProfitPoint.getProfit())
+
+            self.compactSourceLinks(oldPoints, maxProfitPoint)
+
+        with measurePhase(self.metrics, "backTrace"):
+            return self.backTraceItemsPareto(constraint, oldPoints, maxProfitPoint, itemsCount, iterCounter)
+
+    def backTraceItemsColumns(self, constraint, front, maxProfitLink, count, iterCounter):
+        if self.prepareSearchIndex:
+            self.buildSearchIndexColumns(front)
+
+        self.solvedConstraint = constraint
+
+        return self.backTraceItemIds(self.sourceLinks.getItemIds(maxProfitLink), count, iterCounter)
+
+    def buildSearchIndexColumns(self, front):
+
+        weights, profits, links = createColumnLike(front.weights), createColumnLike(front.profits), array('l')
+
+        nextMaxProfit = self.emptyPoint.getProfit()
+
+        for w, p, l in zip(front.weights, front.profits, front.links):
+            if p > nextMaxProfit:
+                nextMaxProfit = p
+                weights.append(w)
+                profits.append(p)
+                links.append(l)
+
+        self.maxProfitPointIndex = paretoFront(weights, profits, links)
+
+    def getNewPointsColumns(self, i, front, itemWeight, constraintWeight, iterCounter):
+
+        # the front weights are strictly increasing, so the points that fit the constraint are the prefix of it.
+        newCount = bisect_right(front.weights, constraintWeight - itemWeight)
+
+        newWeights = createColumnLike(front.weights, map(add, front.weights[:newCount], repeat(itemWeight, newCount)))
+
+        self.skippedPointsBySize += len(front) - newCount
+
+        iterCounter[0] += len(front) + 1
+
+        if self.printInfo:
+            self.totalPointCount += len(front)
+            print(f"| {i - 1} | {len(front)} | {round(iterCounter[0])} |")
+
+        return newCount, newWeights
+
+    def mergeDiscardingDominatedColumns(self, front, newWeights, itemProfit, itemId, iterCounter):
+
+        # Point A is dominated by point B if B achieves a larger profit with the same or less weight than A.
+        # The equal points prefer the old one, the same as skipping the new point that was visited already.
+
+        oldWeights, oldProfits, oldLinks = front.weights, front.profits, front.links
+
+        resultWeights, resultProfits, resultLinks = createColumnLike(oldWeights), createColumnLike(oldProfits), array('l')
+
+        profitMax = -sys.maxsize
+
+        oi, ni = 0, 0
+        oldCount, newCount = len(oldWeights), len(newWeights)
+
+        while oi < oldCount and ni < newCount:
+
+            oldWeight, newWeight = oldWeights[oi], newWeights[ni]
+            oldProfit, newProfit = oldProfits[oi], oldProfits[ni] + itemProfit
+
+            if oldWeight < newWeight or (oldWeight == newWeight and oldProfit >= newProfit):
+
+                if oldProfit > profitMax:
+                    resultWeights.append(oldWeight)
+                    resultProfits.append(oldProfit)
+                    resultLinks.append(oldLinks[oi])
+                    profitMax = oldProfit
+
+                oi += 1
+            else:
+
+                if newProfit > profitMax:
+                    resultWeights.append(newWeight)
+                    resultProfits.append(newProfit)
+                    resultLinks.append(self.sourceLinks.add(itemId, oldLinks[ni]))
+                    profitMax = newProfit
+
+                ni += 1
+
+        while oi < oldCount:
+            oldProfit = oldProfits[oi]
+
+            if oldProfit > profitMax:
+                resultWeights.append(oldWeights[oi])
+                resultProfits.append(oldProfit)
+                resultLinks.append(oldLinks[oi])
+                profitMax = oldProfit
+
+            oi += 1
+
+        while ni < newCount:
+            newProfit = oldProfits[ni] + itemProfit
+
+            if newProfit > profitMax:
+                resultWeights.append(newWeights[ni])
+                resultProfits.append(newProfit)
+                resultLinks.append(self.sourceLinks.add(itemId, oldLinks[ni]))
+                profitMax = newProfit
+
+            ni += 1
+
+        self.skippedPointsByPareto += oldCount + newCount - len(resultWeights)
+
+        iterCounter[0] += oldCount + newCount
+
+        return paretoFront(resultWeights, resultProfits, resultLinks)
+
+    def mergeDiscardingDominatedVectorized(self, front, newWeights, itemProfit, itemId, iterCounter):
+
+        # The same merge as mergeDiscardingDominatedColumns over NumPy views of the columns. Both runs are sorted by weight,
+        # so searchsorted gives the merged position of each point, the old point goes first on equal weight.
+        # The running max profit filter drops dominated points, and the last kept point of equal weights has the most profit.
+
+        oldCount, newCount = len(front), len(newWeights)
+
+        oldWeights = numpy.frombuffer(front.weights, dtype=front.weights.typecode)
+        oldProfits = numpy.frombuffer(front.profits, dtype=front.profits.typecode)
+        oldLinks = numpy.frombuffer(front.links, dtype=front.links.typecode)
+        addWeights = numpy.frombuffer(newWeights, dtype=newWeights.typecode)
+
+        oldPositions = numpy.arange(oldCount) + numpy.searchsorted(addWeights, oldWeights, side='left')
+        newPositions = numpy.arange(newCount) + numpy.searchsorted(oldWeights, addWeights, side='right')
+
+        weights = numpy.empty(oldCount + newCount, dtype=oldWeights.dtype)
+        profits = numpy.empty(oldCount + newCount, dtype=oldProfits.dtype)
+        sources = numpy.empty(oldCount + newCount, dtype=numpy.int64)
+
+        weights[oldPositions], weights[newPositions] = oldWeights, addWeights
+        profits[oldPositions], profits[newPositions] = oldProfits, oldProfits[:newCount] + itemProfit
+
+        # old points keep their index, new points are encoded as -1 - index of the old point they extend.
+        sources[oldPositions], sources[newPositions] = numpy.arange(oldCount), -1 - numpy.arange(newCount)
+
+        keep = numpy.empty(oldCount + newCount, dtype=bool)
+        keep[0] = True
+        numpy.greater(profits[1:], numpy.maximum.accumulate(profits)[:-1], out=keep[1:])
+
+        weights, profits, sources = weights[keep], profits[keep], sources[keep]
+
+        keep = numpy.empty(len(weights), dtype=bool)
+        keep[-1] = True
+        numpy.not_equal(weights[:-1], weights[1:], out=keep[:-1])
+
+        weights, profits, sources = weights[keep], profits[keep], sources[keep]
+
+        isNew = sources < 0
+        parentLinks = oldLinks[-1 - sources[isNew]]
+
+        links = numpy.empty(len(weights), dtype=oldLinks.dtype)
+        links[~isNew] = oldLinks[sources[~isNew]]
+        links[isNew] = numpy.arange(len(parentLinks)) + self.sourceLinks.addRange(itemId, array(front.links.typecode, parentLinks.tobytes()))
+
+        self.skippedPointsByPareto += oldCount + newCount - len(weights)
+
+        iterCounter[0] += oldCount + newCount
+
+        return paretoFront(array(front.weights.typecode, weights.tobytes()),
+                           array(front.profits.typecode, profits.tobytes()),
+                           array(front.links.typecode, links.tobytes()))
+
+    def canMergeVectorized(self, front):
+        return self.useVectorizedMerge and numpy is not None and len(front) >= self.vectorizedMergeMinSize and \
+               isinstance(front.weights, array) and isinstance(front.profits, array)
+
+    def solveParetoColumns(self, constraint, sortedItems, sortedValues, sortedIndexes, iterCounter):
+
+        constraintWeight = constraint.getDimension(0)
+
+        emptyWeight, emptyProfit = self.emptyPoint.getDimension(0), self.emptyPoint.getProfit()
+
+        sortedWeights = [item.getDimension(0) for item in sortedItems]
+
+        weightsTotal = max(abs(constraintWeight), abs(emptyWeight))
+        profitsTotal = abs(emptyProfit) + sum(abs(v) for v in sortedValues)
+
+        front = paretoFront(createColumn([emptyWeight], sortedWeights + [constraintWeight], weightsTotal),
+                            createColumn([emptyProfit], sortedValues, profitsTotal),
+                            array('l', [-1]))
+
+        maxProfitWeight, maxProfit, maxProfitLink = emptyWeight, emptyProfit, -1
+
+        self.resetSourceLinks()
+
+        itemsCount = len(sortedItems)
+
+        upperBound = self.createUpperBound(constraint, sortedItems, sortedValues)
+
+        lowerBound = upperBound.getGreedyProfit() if upperBound else emptyProfit
+
+        for i in range(1, itemsCount + 1):
+
+            checkCancellation(self.cancellation)
+
+            if self.isBudgetExceeded(iterCounter):
+                self.isOptimal = self.isIncumbentOptimal(constraint, sortedItems[i - 1:], sortedValues[i - 1:], zip(front.weights, front.profits), lowerBound, maxProfit)
+                break
+
+            itemWeight, itemProfit, itemId = sortedWeights[i - 1], sortedValues[i - 1], sortedIndexes[i - 1]
+
+            newCount, newWeights = self.getNewPointsColumns(i, front, itemWeight, constraintWeight, iterCounter)
+
+            if newCount > 0:
+
+                # new points profits are increasing, so the last one is the only candidate to be max profit point.
+                newWeight, newProfit = newWeights[-1], front.profits[newCount - 1] + itemProfit
+
+                if maxProfit <= newProfit:
+
+                    if not self.useRatioSort or maxProfit != newProfit or maxProfitWeight < newWeight:
+                        maxProfitWeight, maxProfit = newWeight, newProfit
+                        maxProfitLink = self.sourceLinks.add(itemId, front.links[newCount - 1])
+
+            if self.canMergeVectorized(front):
+                front = self.mergeDiscardingDominatedVectorized(front, newWeights, itemProfit, itemId, iterCounter)
+            else:
+                front = self.mergeDiscardingDominatedColumns(front, newWeights, itemProfit, itemId, iterCounter)
+
+            if len(self.sourceLinks) > self.sourceLinksLimit:
+                remap = self.sourceLinks.compact(list(front.links) + [maxProfitLink])
+                front.links, maxProfitLink = array('l', map(remap.__getitem__, front.links)), remap[maxProfitLink]
+                self.sourceLinksLimit = max(self.sourceLinksCompactionSize, 2 * len(self.sourceLinks))
+
+            if self.canBackTraceWhenSizeReached and maxProfitWeight == constraintWeight:
+                return self.backTraceItemsColumns(constraint, front, maxProfitLink, itemsCount, iterCounter)
+
+            if upperBound:
+                upperBound.removeItem(i - 1)
+                front = self.pruneByUpperBoundColumns(front, upperBound, max(lowerBound, maxProfit), iterCounter)
+
+            if self.layerHook is not None:
+                self.notifyObserver(i, len(front), maxProfit)
+
+        with measurePhase(self.metrics, "backTrace"):
+            return self.backTraceItemsColumns(constraint, front, maxProfitLink, itemsCount, iterCounter)
+
+    def solveParetoShards(self, constraint, sortedItems, sortedValues, sortedIndexes, iterCounter):
+
+        shardsSolver = paretoShardsSolver(constraint.getDimension(0), [item.getDimension(0) for item in sortedItems], sortedValues, iterCounter)
+
+        shardsSolver.shardCount = self.parallelShardCount
+        shardsSolver.executor = self.parallelExecutor
+        shardsSolver.printInfo = self.printInfo
+
+        bestProfit, bestWeight, bestPositions = shardsSolver.solve()
+
+        self.solvedConstraint = constraint
+
+        # shards solver gives positions in the sorted items, back trace maps them to item ids.
+        return self.backTraceItemIds([sortedIndexes[i] for i in bestPositions], len(sortedItems), iterCounter)
 
     def binarySearchMaxProfit(self, constraint):
 
@@ -737,6 +1159,9 @@ class knapsackParetoSolver:
             raise ValueError(
                 f"Search index wasn't built for '{self.solvedConstraint}' constraint. So the binary search using given '{constraint}' constraint is not possible.")
 
+        if isinstance(self.maxProfitPointIndex, paretoFront):
+            return self.binarySearchMaxProfitColumns(constraint, count)
+
         index = indexLargestLessThanAsc(self.maxProfitPointIndex, constraint, 0, len(self.maxProfitPointIndex) - 1, self.iterCounter)
 
         maxProfitPoint = None
@@ -746,6 +1171,106 @@ class knapsackParetoSolver:
 
         return self.backTraceItemsCore(maxProfitPoint, count, self.iterCounter)
 
+    def binarySearchMaxProfitColumns(self, constraint, count):
+
+        if constraint == self.emptyDimension:
+            return self.backTraceItemsCore(None, count, self.iterCounter)
+
+        index = bisect_right(self.maxProfitPointIndex.weights, constraint.getDimension(0)) - 1
+
+        self.iterCounter[0] += math.log2(count) + 1
+
+        if index < 0:
+            return self.backTraceItemsCore(None, count, self.iterCounter)
+
+        return self.backTraceItemIds(self.sourceLinks.getItemIds(self.maxProfitPointIndex.links[index]), count, self.iterCounter)
+
+    def searchMaxProfits(self, constraints, withIndexes=True):
+        """
+        Finds max profit points of many 1D constraints by the search index at once. The index weights are bisected
+        for each constraint given, item indexes are backtracked once per index point found. Instances solved without
+        the index, by super increasing or corner cases solvers, are solved for each constraint instead.
+
+        :param constraints: 1D constraints less or equal than the index was built for
+        :type constraints: iterable of int or decimal
+
+        :param withIndexes: backtracks item indexes of each point found
+        :type withIndexes: bool
+
+        :return: profits, sizes, item indexes lists or None
+        """
+
+        constraints = list(constraints)
+
+        if self.emptyDimension.getSize() != 1:
+            raise ValueError("The batch search is possible for 1D search index only.")
+
+        if self.solvedBySuperIncreasingSolverAsc or self.solvedBySuperIncreasingSolverDesc or self.solvedConstraint is None or not self.prepareSearchIndex:
+            # there is no index to search, each constraint is solved the same way solve(searchConstraint) does.
+            results = [self.solve(wPoint1(constraint)) for constraint in constraints]
+            return [r[0] for r in results], [r[1].getDimension(0) for r in results], [r[4] for r in results] if withIndexes else None
+
+        # the empty index is built when no item fits the constraint, so each constraint gives the empty set.
+        count = len(self.maxProfitPointIndex)
+
+        if constraints and max(constraints) > self.solvedConstraint.getDimension(0):
+            raise ValueError(f"The constraints given should be less or equal than index built constraint ({self.solvedConstraint}).")
+
+        if isinstance(self.maxProfitPointIndex, paretoFront):
+            weights, profits, links = self.maxProfitPointIndex.weights, self.maxProfitPointIndex.profits, self.maxProfitPointIndex.links
+        else:
+            weights = [p.getDimension(0) for p in self.maxProfitPointIndex]
+            profits = [p.getProfit() for p in self.maxProfitPointIndex]
+            links = [p.source for p in self.maxProfitPointIndex]
+
+        emptyWeight, emptyProfit = self.emptyDimension.getDimension(0), self.emptyPoint.getProfit()
+
+        # the empty constraint gives the empty set, the same as binarySearchMaxProfit does.
+        pointIndexes = [bisect_right(weights, c) - 1 if c != emptyWeight else -1 for c in constraints]
+
+        self.iterCounter[0] += len(constraints) * (math.log2(count + 1) + 1)
+
+        resultProfits = [profits[i] if i >= 0 else emptyProfit for i in pointIndexes]
+        resultSizes = [weights[i] if i >= 0 else emptyWeight for i in pointIndexes]
+
+        if not withIndexes:
+            return resultProfits, resultSizes, None
+
+        pointItemIndexes = {-1: []}
+
+        for i in pointIndexes:
+            if i not in pointItemIndexes:
+                pointItemIndexes[i] = [self.indexes[id] for id in self.sourceLinks.getItemIds(links[i])]
+                self.iterCounter[0] += len(pointItemIndexes[i])
+
+        return resultProfits, resultSizes, [pointItemIndexes[i] for i in pointIndexes]
+
+    def solveByItemReduction(self, reduction):
+
+        reducedSolver = copy(self)
+        reducedSolver.useItemReduction = False
+        reducedSolver.fixedItemsCount, reducedSolver.dominatedItemsCount = 0, 0
+        reducedSolver.constraint = reduction.getReducedConstraint()
+        reducedSolver.dimensions, reducedSolver.values = reduction.getReducedItems()
+        reducedSolver.indexes = list(range(len(reducedSolver.values)))
+        reducedSolver.sourceLinks = sourceLinkArena()
+
+        bestValue, bestSize, bestItems, bestValues, bestIndexes = reducedSolver.solve()
+
+        self.fixedItemsCount += reducedSolver.fixedItemsCount
+        self.dominatedItemsCount += reducedSolver.dominatedItemsCount
+        self.isOptimal = reducedSolver.isOptimal
+
+        optIndex = reduction.restoreIndexes(bestIndexes)
+
+        bestValue, bestSize = 0, self.emptyDimension
+
+        for i in optIndex:
+            bestValue += self.values[i]
+            bestSize += self.dimensions[i]
+
+        return bestValue, bestSize, [self.dimensions[i] for i in optIndex], [self.values[i] for i in optIndex], [self.indexes[i] for i in optIndex]
+
     def solve(self, searchConstraint=None):
 
         """
@@ -755,12 +1280,88 @@ class knapsackParetoSolver:
         that less than constraint used to build the index. Limits checking feature would be turned off in this case.
         It will use O(N) to prepare the index, where N is number of points generated during solving the problem.
 
+        If the useColumnFront property is set then 1D pareto fronts are kept as weight, profit and source link columns
+        instead of paretoPoint1 objects.
+
+        If the useVectorizedMerge property is set then 1D pareto fronts are kept as columns, and int or float columns
+        of vectorizedMergeMinSize points and more are merged by NumPy array kernels. It needs numpy installed,
+        otherwise the column merge is used.
+
+        If the useUpperBoundPruning property is set then 1D pareto solver drops the points which profit plus
+        the LP relaxation bound of the items left is less than the best profit known. The search index turns it off.
+
+        If the useItemReduction property is set then items fixed in or out by the Martello-Toth reduction are removed
+        before solving, fixedItemsCount keeps their number. The search index and searchConstraint given turn it off.
+
+        If the useDominanceReduction property is set then dominated items that cannot fit together with all items
+        dominating them are removed, and duplicates are collapsed to bundles of 1, 2, 4, ... copies before solving.
+        The dominatedItemsCount keeps the number of items removed. The search index and searchConstraint given turn it off.
+
+        If the parallelShardCount property is greater than 1 then 1D pareto fronts of item shards are built in separate
+        processes and joined by the reduction tree to find the optimal profit. The items of it are found by the serial
+        column pass that prunes points by the optimal profit, so the result is the one the serial solver gives.
+        The parallelExecutor property gives the process pool to reuse,
+        the new pool is created for each solve otherwise. The search index turns it off.
+
+        If the deadline or iterationLimit property is set then the solver stops at the first item layer it is reached at,
+        and returns the best point found so far. The deadline is the time.perf_counter() value, the iterationLimit is
+        compared with the iteration counter. The isOptimal property tells if the point returned is proven optimal,
+        1D fronts prove it by the LP relaxation bound of items not visited.
+
         :param searchConstraint: searchConstraint
         :type searchConstraint: wPoint
 
         :return: bestValue, bestSize, bestItems, bestValues, bestIndexes
         """
 
+        self.isOptimal = True
+        self.startTime = time.perf_counter()
+        self.layerHook = getLayerObserver(self.metrics, self.observer)
+
+        result = self.solveInstance(searchConstraint)
+
+        if self.metrics is not None:
+            self.metrics.addCounters(skippedPointsByMap=self.skippedPointsByMap,
+                                     skippedPointsByLimits=self.skippedPointsByLimits,
+                                     skippedPointsBySize=self.skippedPointsBySize,
+                                     skippedPointsByPareto=self.skippedPointsByPareto,
+                                     skippedPointsByBound=self.skippedPointsByBound,
+                                     totalPointCount=self.totalPointCount,
+                                     fixedItemsCount=self.fixedItemsCount,
+                                     dominatedItemsCount=self.dominatedItemsCount)
+
+        return result
+
+    def solveInstance(self, searchConstraint):
+
+        if self.useItemReduction and not searchConstraint and not self.prepareSearchIndex:
+            reduction = itemReduction(self.constraint, self.dimensions, self.values)
+
+            with measurePhase(self.metrics, "reduction"):
+                isReduced = reduction.reduce(self.iterCounter)
+
+            if isReduced:
+                self.fixedItemsCount = reduction.getFixedCount()
+
+                if self.printInfo:
+                    print(f"KB pareto knapsack item reduction: fixed in {len(reduction.fixedIn)}, fixed out {len(reduction.fixedOut)}, undecided {len(reduction.undecided)}")
+
+                return self.solveByItemReduction(reduction)
+
+        if self.useDominanceReduction and not searchConstraint and not self.prepareSearchIndex:
+            reduction = dominanceReduction(self.constraint, self.dimensions, self.values)
+
+            with measurePhase(self.metrics, "reduction"):
+                isReduced = reduction.reduce(self.iterCounter)
+
+            if isReduced:
+                self.dominatedItemsCount = reduction.getFixedCount()
+
+                if self.printInfo:
+                    print(f"KB pareto knapsack dominance reduction: dominated {len(reduction.fixedOut)}, {len(self.values)} items reduced to {len(reduction.groups)}")
+
+                return self.solveByItemReduction(reduction)
+
         if not searchConstraint:
             searchConstraint = self.solvedConstraint
 
@@ -770,7 +1371,8 @@ class knapsackParetoSolver:
         canTryBinarySearch = len(self.maxProfitPointIndex) > 0 or self.solvedBySuperIncreasingSolverAsc or self.solvedBySuperIncreasingSolverDesc
 
         if canTryBinarySearch and searchConstraint <= self.solvedConstraint:
-            return self.binarySearchMaxProfit(searchConstraint)
+            with measurePhase(self.metrics, "search"):
+                return self.binarySearchMaxProfit(searchConstraint)
 
         canTrySolveUsingDp = not self.forceUsePareto and (self.doUseLimits or self.doSolveSuperInc or self.forceUseLimits or self.canBackTraceWhenSizeReached)
 
@@ -778,30 +1380,33 @@ class knapsackParetoSolver:
 
         if canTrySolveUsingDp:
 
-            constraint, \
-            count,\
-            lessSizeItems, \
-            lessSizeValues, \
-            lessSizeItemsIndex,\
-            itemSum, \
-            lessCountSum, \
-            lessCountValuesSum, \
-            partialSums, \
-            superIncreasing, \
-            superIncreasingItems, \
-            allAsc, \
-            allDesc, \
-            canUsePartialSums = \
-                self.preProcess(searchConstraint, self.dimensions, self.values, self.forceUseLimits, self.iterCounter)
-
-            cornerCasesCheck = self.checkCornerCases(constraint, lessSizeItems, lessSizeValues, lessSizeItemsIndex, lessCountSum, itemSum, lessCountValuesSum)
+            with measurePhase(self.metrics, "preProcess"):
+                constraint, \
+                count,\
+                lessSizeItems, \
+                lessSizeValues, \
+                lessSizeItemsIndex,\
+                itemSum, \
+                lessCountSum, \
+                lessCountValuesSum, \
+                partialSums, \
+                superIncreasing, \
+                superIncreasingItems, \
+                allAsc, \
+                allDesc, \
+                canUsePartialSums = \
+                    self.preProcess(searchConstraint, self.dimensions, self.values, self.forceUseLimits, self.iterCounter)
+
+            with measurePhase(self.metrics, "cornerCases"):
+                cornerCasesCheck = self.checkCornerCases(constraint, lessSizeItems, lessSizeValues, lessSizeItemsIndex, lessCountSum, itemSum, lessCountValuesSum)
 
             if  cornerCasesCheck:
                 self.cornerCaseSolved = True
                 return cornerCasesCheck
 
             if self.doSolveSuperInc and superIncreasing:
-                return self.solveSuperIncreasing(constraint, lessSizeItems, lessSizeValues, lessSizeItemsIndex, count, allAsc, self.iterCounter)
+                with measurePhase(self.metrics, "superIncreasing"):
+                    return self.solveSuperIncreasing(constraint, lessSizeItems, lessSizeValues, lessSizeItemsIndex, count, allAsc, self.iterCounter)
 
             canSolveUsingDp = not self.forceUsePareto and (self.forceUseLimits or self.canBackTraceWhenSizeReached or canUsePartialSums)
 
@@ -810,15 +1415,26 @@ class knapsackParetoSolver:
                 if self.printInfo:
                     print(f"KB pareto DP knapsack solver: N={count}; canUsePartialSums={canUsePartialSums}; forceUseLimits={self.forceUseLimits}")
 
-                return  self.solveUsingLimitsOnly(constraint, lessSizeItems, lessSizeValues, lessSizeItemsIndex, allAsc, partialSums, superIncreasingItems, canUsePartialSums)
+                with measurePhase(self.metrics, "dp"):
+                    return self.solveUsingLimitsOnly(constraint, lessSizeItems, lessSizeValues, lessSizeItemsIndex, allAsc, partialSums, superIncreasingItems, canUsePartialSums)
         else:
-            constraint, lessSizeItems, lessSizeValues, lessSizeItemsIndex = searchConstraint, self.dimensions, self.values, self.indexes
+            # item ids are positions in the dimensions list, the same as preProcess gives. backTrace maps them to indexes.
+            constraint, lessSizeItems, lessSizeValues, lessSizeItemsIndex = searchConstraint, self.dimensions, self.values, range(len(self.dimensions))
 
         if self.printInfo:
             print(f"KB pareto knapsack solver: N={len(lessSizeItems)}; canTrySolveUsingDp={canTrySolveUsingDp}; canSolveUsingDp={canSolveUsingDp}")
 
         sortingFunc = self.sortByRatio if self.useRatioSort else self.sortByDims
 
-        sortedItems, sortedValues, sortedIndexes = sortingFunc(lessSizeItems, lessSizeValues, lessSizeItemsIndex, self.iterCounter)
+        with measurePhase(self.metrics, "preProcess"):
+            sortedItems, sortedValues, sortedIndexes = sortingFunc(lessSizeItems, lessSizeValues, lessSizeItemsIndex, self.iterCounter)
+
+        with measurePhase(self.metrics, "pareto"):
+
+            if self.parallelShardCount > 1 and self.emptyDimension.getSize() == 1 and not self.prepareSearchIndex:
+                return self.solveParetoShards(constraint, sortedItems, sortedValues, sortedIndexes, self.iterCounter)
+
+            if (self.useColumnFront or self.useVectorizedMerge) and self.emptyDimension.getSize() == 1:
+                return self.solveParetoColumns(constraint, sortedItems, sortedValues, sortedIndexes, self.iterCounter)
 
-        return self.solvePareto(constraint, sortedItems, sortedValues, sortedIndexes, self.iterCounter)
+            return self.solvePareto(constraint, sortedItems, sortedValues, sortedIndexes, self.iterCounter)
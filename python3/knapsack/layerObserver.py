@@ -0,0 +1,69 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+class layerObserver:
+    """
+    The base class of item layer observers. DP and pareto solvers call onLayer once per item layer
+    if the observer property is set, the solver does nothing extra otherwise.
+
+    Skipped points counters are totals of points skipped since the solve started. If printInfo is set
+    they are estimated by sizes of subtrees of the full enumeration skipped, the way the solver prints them.
+    """
+
+    def onLayer(self, layerIndex, pointCount, skippedPointsByMap, skippedPointsByLimits, skippedPointsBySize, skippedPointsByPareto, elapsed, bestProfit):
+        """
+        :param layerIndex: index of the item layer, starting from 1
+        :type layerIndex: int
+
+        :param pointCount: number of DP states or pareto front points kept after the layer
+        :type pointCount: int
+
+        :param elapsed: seconds since the solve started
+        :type elapsed: float
+
+        :param bestProfit: best profit found so far
+        :type bestProfit: int or decimal
+        """
+        pass
+
+
+class layerObserverList(layerObserver):
+    """
+    Calls onLayer of each observer of the list, so the solver keeps the single hook per item layer.
+    """
+
+    def __init__(self, observers):
+        self.observers = observers
+
+    def onLayer(self, layerIndex, pointCount, skippedPointsByMap, skippedPointsByLimits, skippedPointsBySize, skippedPointsByPareto, elapsed, bestProfit):
+        for observer in self.observers:
+            observer.onLayer(layerIndex, pointCount, skippedPointsByMap, skippedPointsByLimits, skippedPointsBySize, skippedPointsByPareto, elapsed, bestProfit)
+
+
+def getLayerObserver(*observers):
+    """
+    :return: None if all observers given are None, the observer if it is the only one, the layerObserverList otherwise
+    """
+
+    observers = [observer for observer in observers if observer is not None]
+
+    if not observers:
+        return None
+
+    if len(observers) == 1:
+        return observers[0]
+
+    return layerObserverList(observers)
@@ -0,0 +1,125 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from .cancellation import checkCancellation
+
+
+class meetInTheMiddleSolver:
+    """
+    The Horowitz-Sahni 1-0 knapsack solver for small N. Items are split into two halves, the subsets of each half
+    are enumerated as the pareto front of (weight, profit) points sorted by weight ASC. The optimal solution is
+    the best pair of points of two fronts that fits the size, it is found by the single two pointers scan:
+    the point of the first front goes up by weight, its best partner of the second front goes down.
+
+    Each front is O(2 ^ (N / 2)) in the worst case, and it does not depend on weight values, so the solver
+    works the same for int, Decimal, and float instances with huge weights.
+
+    The point keeps the bit mask of half items taken.
+    """
+
+    def __init__(self, size, weights, values, iterCounter):
+        self.size = size
+        self.weights = weights
+        self.values = values
+        self.iterCounter = iterCounter
+        self.printInfo = False
+        self.skippedPointsByPareto = 0
+        self.skippedPointsBySize = 0
+        self.cancellation = None
+
+    def mergeDiscardingDominated(self, front, itemWeight, itemValue, itemBit, iterCounter):
+
+        # Point A is dominated by point B if B achieves a larger profit with the same or less weight than A.
+
+        oldWeights, oldProfits, oldMasks = front
+
+        size = self.size
+
+        newCount = 0
+
+        while newCount < len(oldWeights) and oldWeights[newCount] + itemWeight <= size:
+            newCount += 1
+
+        self.skippedPointsBySize += len(oldWeights) - newCount
+
+        resultWeights, resultProfits, resultMasks = [], [], []
+
+        oi, ni = 0, 0
+        oldCount = len(oldWeights)
+
+        while oi < oldCount or ni < newCount:
+
+            if ni < newCount:
+                newWeight, newProfit = oldWeights[ni] + itemWeight, oldProfits[ni] + itemValue
+
+            if ni == newCount or (oi < oldCount and (oldWeights[oi] < newWeight or (oldWeights[oi] == newWeight and oldProfits[oi] >= newProfit))):
+                w, p, m = oldWeights[oi], oldProfits[oi], oldMasks[oi]
+                oi += 1
+            else:
+                w, p, m = newWeight, newProfit, oldMasks[ni] | itemBit
+                ni += 1
+
+            if not resultProfits or p > resultProfits[-1]:
+                resultWeights.append(w)
+                resultProfits.append(p)
+                resultMasks.append(m)
+
+        self.skippedPointsByPareto += oldCount + newCount - len(resultWeights)
+
+        iterCounter[0] += oldCount + newCount
+
+        return resultWeights, resultProfits, resultMasks
+
+    def enumerateHalf(self, items, iterCounter):
+
+        front = ([0], [0], [0])
+
+        for i in items:
+            checkCancellation(self.cancellation)
+            front = self.mergeDiscardingDominated(front, self.weights[i], self.values[i], 1 << i, iterCounter)
+
+        return front
+
+    def solve(self):
+
+        size, iterCounter = self.size, self.iterCounter
+
+        count = len(self.weights)
+        half = count // 2
+
+        weightsA, profitsA, masksA = self.enumerateHalf(range(half), iterCounter)
+        weightsB, profitsB, masksB = self.enumerateHalf(range(half, count), iterCounter)
+
+        if self.printInfo:
+            print(f"meet in the middle: N={count}, front sizes {len(weightsA)} and {len(weightsB)}")
+
+        bestProfit, bestWeight, bestMask = 0, 0, 0
+
+        j = len(weightsB) - 1
+
+        for w, p, m in zip(weightsA, profitsA, masksA):
+
+            while j >= 0 and w + weightsB[j] > size:
+                j -= 1
+
+            if j < 0:
+                break
+
+            if p + profitsB[j] > bestProfit:
+                bestProfit, bestWeight, bestMask = p + profitsB[j], w + weightsB[j], m | masksB[j]
+
+        iterCounter[0] += len(weightsA) + len(weightsB)
+
+        return bestProfit, bestWeight, [i for i in range(count) if (bestMask >> i) & 1]
@@ -0,0 +1,67 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from array import array
+
+INT64_MAX = 2 ** 63 - 1
+
+
+def createColumn(values, sample=(), total=None):
+    """
+    Creates the compact column for given numbers. The column type is chosen by values and the sample of numbers
+    that will be stored in it later. Integer numbers are stored in int64 array if the total fits int64,
+    floats are stored in double array. Decimals and other rational types are kept in the list.
+    """
+
+    values, sample = list(values), list(sample)
+
+    if all(type(v) is int for v in values) and all(type(v) is int for v in sample):
+        if total is None:
+            total = sum(abs(v) for v in values) + sum(abs(v) for v in sample)
+
+        if total <= INT64_MAX:
+            return array('q', values)
+
+    elif all(type(v) is float for v in sample) and all(type(v) in (int, float) for v in values):
+        return array('d', values)
+
+    return values
+
+
+def createColumnLike(column, values=()):
+    if isinstance(column, array):
+        return array(column.typecode, values)
+
+    return list(values)
+
+
+class paretoFront:
+    """
+    The 1D pareto optimal points stored as parallel columns instead of paretoPoint1 objects.
+
+    Points are ordered by weight ASC, profits are strictly increasing. Each point keeps the link to the source chain
+    of the items it consists of, -1 is the empty set.
+    """
+
+    def __init__(self, weights, profits, links):
+        self.weights = weights
+        self.profits = profits
+        self.links = links
+
+    def __len__(self):
+        return len(self.weights)
+
+    def __repr__(self):
+        return f"paretoFront(weights={list(self.weights)}, profits={list(self.profits)}, links={list(self.links)})"
@@ -13,15 +13,22 @@ IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMA
 TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+from operator import add
+
 from knapsack.wPoint import wPoint
 
 
 class paretoPoint(wPoint):
+
+    __slots__ = ('profit', 'itemId', 'source')
+
     def __init__(self, dimensions, profit, id=None):
+        self.dimensions = tuple(dimensions)
+        self.hashCache = None
         self.profit = profit
         self.itemId = id
-        self.source = None
-        super().__init__(dimensions)
+        # the link to the item set in the solver source link arena, -1 is the empty set.
+        self.source = -1
 
     def createNew(self, dimensions, profit, id):
         return paretoPoint(dimensions, profit, id)
@@ -30,52 +37,37 @@ class paretoPoint(wPoint):
         return self.profit
 
     def __add__(self, item):
-
-        dims = [0] * len(self.dimensions)
-
-        for i in range(len(self.dimensions)):
-            dims[i] = self.dimensions[i] + item.getDimension(i)
-
-        newPoint = paretoPoint(dims, self.profit + item.profit)
-        newPoint.itemId = item.itemId
-        newPoint.source = self
-        return newPoint
-
-    def getItemIds(self):
-
-        if self.itemId is not None:
-            yield self.itemId
-
-        if self.source:
-            for id in self.source.getItemIds():
-                yield id
+        return paretoPoint(tuple(map(add, self.dimensions, item.dimensions)), self.profit + item.profit)
 
     def isDimensionEquals(self, other):
-        if self.dimHash != other.dimHash:
-            return False
-
         return super().__eq__(other)
 
     def __hash__(self):
-        return super().__hash__() ^ hash(self.profit)
+        if self.hashCache is None:
+            self.hashCache = 397 ^ hash(self.dimensions) ^ hash(self.profit)
+
+        return self.hashCache
 
     def __eq__(self, other):
         return super().__eq__(other) and self.profit == other.profit
 
     def __repr__(self):
-        return f"paretoPoint(dimensions={self.dimensions}, profit={self.profit}, items={list(self.getItemIds())})"
+        return f"paretoPoint(dimensions={self.dimensions}, profit={self.profit}, source={self.source})"
 
 
 from knapsack.wPoint import *
 
 
 class paretoPoint1(wPoint1):
+
+    __slots__ = ('profit', 'itemId', 'source')
+
     def __init__(self, dimensions, profit, id=None):
+        self.dimensions = dimensions
+        self.hashCache = None
         self.profit = profit
         self.itemId = id
-        self.source = None
-
-        super().__init__(dimensions)
+        self.source = -1
 
     def getProfit(self):
         return self.profit
@@ -84,48 +76,35 @@ class paretoPoint1(wPoint1):
         return paretoPoint1(dimensions, profit, id)
 
     def isDimensionEquals(self, other):
-        if self.dimHash != other.dimHash:
-            return False
-
         return super().__eq__(other)
 
     def __add__(self, item):
-        itemDim = item.getDimension(0)
-        selfDim = self.dimensions
-        newDim = selfDim + itemDim
-        newPoint = paretoPoint1(newDim, self.profit + item.profit)
-        newPoint.itemId = item.itemId
-        newPoint.source = self
-        return newPoint
-
-    def getItemIds(self):
-
-        if self.itemId is not None:
-            yield self.itemId
-
-        if self.source:
-            for id in self.source.getItemIds():
-                yield id
+        return paretoPoint1(self.dimensions + item.dimensions, self.profit + item.profit)
 
     def __hash__(self):
-        return 397 ^ self.dimHash ^ hash(self.profit)
+        if self.hashCache is None:
+            self.hashCache = hash(self.dimensions) ^ hash(self.profit)
+
+        return self.hashCache
 
     def __eq__(self, other):
-        if self.dimHash != other.dimHash:
-            return False
         return self.dimensions == other.dimensions and self.profit == other.profit
 
     def __repr__(self):
-        return f"paretoPoint1(dimensions={self.dimensions}, profit={self.profit}, items={list(self.getItemIds())})"
+        return f"paretoPoint1(dimensions={self.dimensions}, profit={self.profit}, source={self.source})"
 
 
 class paretoPoint2(wPoint2):
 
+    __slots__ = ('profit', 'itemId', 'source')
+
     def __init__(self, dim1, dim2, profit, id=None):
+        self.dim1 = dim1
+        self.dim2 = dim2
+        self.hashCache = None
         self.profit = profit
         self.itemId = id
-        self.source = None
-        super().__init__(dim1, dim2)
+        self.source = -1
 
     def getProfit(self):
         return self.profit
@@ -134,43 +113,33 @@ class paretoPoint2(wPoint2):
         return paretoPoint2(item[0], item[1], profit, id)
 
     def __add__(self, item):
-        newPoint = paretoPoint2(self.dim1 + item.getDimension(0), self.dim2 + item.getDimension(1),
-                                self.profit + item.profit)
-        newPoint.itemId = item.itemId
-        newPoint.source = self
-        return newPoint
-
-    def getItemIds(self):
-
-        if self.itemId is not None:
-            yield self.itemId
-
-        if self.source:
-            for id in self.source.getItemIds():
-                yield id
+        return paretoPoint2(self.dim1 + item.dim1, self.dim2 + item.dim2, self.profit + item.profit)
 
     def isDimensionEquals(self, other):
-        if self.dimHash != other.dimHash:
-            return False
-
         return super().__eq__(other)
 
     def __hash__(self):
-        return 397 ^ super().__hash__() ^ hash(self.profit)
+        if self.hashCache is None:
+            self.hashCache = hash(self.dim1) ^ hash(self.dim2) ^ hash(self.profit)
+
+        return self.hashCache
 
     def __eq__(self, other):
         return super().__eq__(other) and self.profit == other.profit
 
     def __repr__(self):
-        return f"paretoPoint2(dimensions={self.getDimensions()}, profit={self.profit}, items={list(self.getItemIds())})"
+        return f"paretoPoint2(dimensions={self.getDimensions()}, profit={self.profit}, source={self.source})"
 
 
 class paretoPoint0(wPoint1):
 
+    __slots__ = ('itemId', 'source')
+
     def __init__(self, dimensions, id=None):
+        self.dimensions = dimensions
+        self.hashCache = None
         self.itemId = id
-        self.source = None
-        super().__init__(dimensions)
+        self.source = -1
 
     def getProfit(self):
         return self.dimensions
@@ -179,33 +148,19 @@ class paretoPoint0(wPoint1):
         return paretoPoint0(dimensions, id)
 
     def __add__(self, item):
-        newPoint = paretoPoint0(self.dimensions + item.dimensions)
-        newPoint.itemId = item.itemId
-        newPoint.source = self
-        return newPoint
-
-    def getItemIds(self):
-
-        if self.itemId is not None:
-            yield self.itemId
-
-        if self.source:
-            for id in self.source.getItemIds():
-                yield id
+        return paretoPoint0(self.dimensions + item.dimensions)
 
     def isDimensionEquals(self, other):
-        if self.dimHash != other.dimHash:
-            return False
-
         return super().__eq__(other)
 
     def __hash__(self):
-        return 397 ^ self.dimHash
+        if self.hashCache is None:
+            self.hashCache = hash(self.dimensions)
+
+        return self.hashCache
 
     def __eq__(self, other):
-        if self.dimHash != other.dimHash:
-            return False
         return self.dimensions == other.dimensions
 
     def __repr__(self):
-        return f"paretoPoint0(dimensions={self.dimensions}, items={list(self.getItemIds())})"
\ No newline at end of file
+        return f"paretoPoint0(dimensions={self.dimensions}, source={self.source})"
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heapify, heappop, heapreplace
+
+from .meetInTheMiddle import meetInTheMiddleSolver
+
+
+def buildShardFront(size, weights, values, itemIds):
+    """
+    Builds the 1D pareto front of the shard items. Each point keeps the bit mask of item ids taken,
+    the ids are positions of items in the whole instance, so masks of different shards can be joined by or.
+
+    :return: weights, profits, masks, iterations
+    """
+
+    iterCounter = [0]
+
+    shardSolver = meetInTheMiddleSolver(size, weights, values, iterCounter)
+
+    front = ([0], [0], [0])
+
+    for weight, value, itemId in zip(weights, values, itemIds):
+        front = shardSolver.mergeDiscardingDominated(front, weight, value, 1 << itemId, iterCounter)
+
+    frontWeights, frontProfits, frontMasks = front
+
+    return frontWeights, frontProfits, frontMasks, iterCounter[0]
+
+
+def joinShardFronts(size, leftWeights, leftProfits, leftMasks, rightWeights, rightProfits, rightMasks):
+    """
+    Builds the pareto front of all pairs of left and right front points that fit the size.
+
+    Pairs of each left point are the run ordered by weight and profit. Runs are merged by the heap,
+    and the pair is kept if it is more profitable than all lighter ones. The dominated pairs of the run
+    are skipped by the binary search over right profits, so they are never built. The kept pair mask is
+    the union of left and right item masks.
+
+    :return: weights, profits, masks, iterations
+    """
+
+    heap, runCounts = [], []
+
+    for li, (w, p) in enumerate(zip(leftWeights, leftProfits)):
+
+        # the right front weights are increasing, so the points that fit the size left are the prefix of it.
+        count = bisect_right(rightWeights, size - w)
+
+        if count == 0:
+            break
+
+        runCounts.append(count)
+        heap.append((w + rightWeights[0], -(p + rightProfits[0]), li, 0))
+
+    heapify(heap)
+
+    weights, profits, masks = [], [], []
+
+    iterations = len(heap)
+
+    while heap:
+
+        weight, profit, li, j = heap[0]
+
+        if not profits or -profit > profits[-1]:
+            weights.append(weight)
+            profits.append(-profit)
+            masks.append(leftMasks[li] | rightMasks[j])
+            j += 1
+        else:
+            # right profits are increasing, so the next pair of the run that is not dominated is the first more profitable one.
+            j = bisect_right(rightProfits, profits[-1] - leftProfits[li], j + 1, runCounts[li])
+
+        if j < runCounts[li]:
+            heapreplace(heap, (leftWeights[li] + rightWeights[j], -(leftProfits[li] + rightProfits[j]), li, j))
+        else:
+            heappop(heap)
+
+        iterations += 1
+
+    return weights, profits, masks, iterations
+
+
+class paretoShardsSolver:
+    """
+    The 1D 1-0 knapsack solver that builds pareto fronts of item shards in separate processes.
+
+    Items are dealt to shards round robin, so shards get the same mix of light and heavy items. Fronts are joined
+    pairwise by the reduction tree, each tree level joins its pairs in parallel. The root join needs the best pair only,
+    so it is the single two pointers scan.
+
+    The front of the union is exactly the front the serial solver gets, so the optimal profit is the same.
+    Front points keep masks of item ids taken, so the item set of the best pair is the union of its masks.
+    """
+
+    def __init__(self, size, weights, values, iterCounter):
+        self.size = size
+        self.weights = weights
+        self.values = values
+        self.iterCounter = iterCounter
+        self.shardCount = os.cpu_count() or 1
+        self.executor = None
+        self.printInfo = False
+
+    def getShards(self):
+
+        count, shardCount = len(self.weights), max(1, min(self.shardCount, len(self.weights)))
+
+        return [list(range(s, count, shardCount)) for s in range(shardCount)]
+
+    def findBestPair(self, left, right):
+
+        leftWeights, leftProfits, leftMasks = left
+        rightWeights, rightProfits, rightMasks = right
+
+        bestProfit, bestWeight, bestMask = None, None, 0
+
+        j = len(rightWeights) - 1
+
+        for w, p, m in zip(leftWeights, leftProfits, leftMasks):
+
+            while j >= 0 and w + rightWeights[j] > self.size:
+                j -= 1
+
+            if j < 0:
+                break
+
+            profit, weight = p + rightProfits[j], w + rightWeights[j]
+
+            if bestProfit is None or profit > bestProfit or (profit == bestProfit and weight < bestWeight):
+                bestProfit, bestWeight, bestMask = profit, weight, m | rightMasks[j]
+
+        self.iterCounter[0] += len(leftWeights) + len(rightWeights)
+
+        return bestProfit, bestWeight, bestMask
+
+    def solveLevels(self, executor, shards):
+
+        size, weights, values = self.size, self.weights, self.values
+
+        futures = [executor.submit(buildShardFront, size, [weights[i] for i in shard], [values[i] for i in shard], shard) for shard in shards]
+
+        fronts = []
+
+        for future in futures:
+            frontWeights, frontProfits, frontMasks, iterations = future.result()
+            fronts.append((frontWeights, frontProfits, frontMasks))
+            self.iterCounter[0] += iterations
+
+        level = 0
+
+        while len(fronts) > 2:
+
+            futures = [executor.submit(joinShardFronts, size, *fronts[i], *fronts[i + 1]) for i in range(0, len(fronts) - 1, 2)]
+
+            joined = []
+
+            for future in futures:
+                frontWeights, frontProfits, frontMasks, iterations = future.result()
+                joined.append((frontWeights, frontProfits, frontMasks))
+                self.iterCounter[0] += iterations
+
+            if len(fronts) % 2 == 1:
+                joined.append(fronts[-1])
+
+            fronts, level = joined, level + 1
+
+            if self.printInfo:
+                print(f"pareto shards: level {level}, front sizes {[len(front[0]) for front in fronts]}")
+
+        return fronts
+
+    def solve(self):
+        """
+        :return: bestProfit, bestWeight, bestItemIds
+        """
+
+        shards = self.getShards()
+
+        if self.executor:
+            top = self.solveLevels(self.executor, shards)
+        else:
+            with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+                top = self.solveLevels(executor, shards)
+
+        if len(top) == 1:
+            bestProfit, bestWeight, bestMask = max(zip(top[0][1], (-w for w in top[0][0]), top[0][2]), key=lambda t: (t[0], t[1]))
+            bestWeight = -bestWeight
+        else:
+            bestProfit, bestWeight, bestMask = self.findBestPair(top[0], top[1])
+
+        return bestProfit, bestWeight, [i for i in range(len(self.weights)) if (bestMask >> i) & 1]
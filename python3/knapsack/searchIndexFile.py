@@ -0,0 +1,238 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+
+from .paretoFront import paretoFront
+from .sourceLink import sourceLinkArena
+
+magic = b"KBSIDX1" + (b"<" if sys.byteorder == "little" else b">")
+
+
+def getHeaderFormat(weightType):
+    return f"=8s1s1s6xqqq{weightType}"
+
+
+def getColumnType(values):
+    if all(type(v) is int for v in values):
+        return 'q'
+
+    if all(type(v) in (int, float) for v in values):
+        return 'd'
+
+    raise ValueError("The search index file keeps int or float weights and profits only.")
+
+
+def writeSearchIndexFile(path, solver):
+    """
+    Writes the max profit search index of the 1D pareto solver solved with prepareSearchIndex set. The file keeps
+    index weights, profits and source links columns, the source link arena compacted to links reachable from
+    the index, and items weights, values and indexes, so queries need neither the solver nor items given.
+
+    :param solver: solved knapsackParetoSolver
+    :type solver: knapsackParetoSolver
+
+    :return: number of index points written
+    """
+
+    index = solver.maxProfitPointIndex
+
+    if len(index) == 0:
+        raise ValueError("The search index was not built. The solver should be solved with prepareSearchIndex set.")
+
+    if solver.emptyDimension.getSize() != 1:
+        raise ValueError("The search index file keeps 1D indexes only.")
+
+    if isinstance(index, paretoFront):
+        weights, profits, links = list(index.weights), list(index.profits), list(index.links)
+    else:
+        weights, profits, links = [p.getDimension(0) for p in index], [p.getProfit() for p in index], [p.source for p in index]
+
+    itemWeights = [item.getDimension(0) for item in solver.dimensions]
+    itemValues = list(solver.values)
+
+    weightType = getColumnType(weights + itemWeights + [solver.solvedConstraint.getDimension(0)])
+    profitType = getColumnType(profits + itemValues)
+
+    arena = sourceLinkArena()
+    arena.itemIds, arena.parentLinks = array('l', solver.sourceLinks.itemIds), array('l', solver.sourceLinks.parentLinks)
+
+    remap = arena.compact(links)
+
+    with open(path, "wb") as file:
+        file.write(struct.pack(getHeaderFormat(weightType), magic, weightType.encode(), profitType.encode(),
+                               len(weights), len(arena), len(itemWeights), solver.solvedConstraint.getDimension(0)))
+
+        for typecode, column in [(weightType, weights),
+                                 (profitType, profits),
+                                 ('q', map(remap.__getitem__, links)),
+                                 ('q', arena.itemIds),
+                                 ('q', arena.parentLinks),
+                                 (weightType, itemWeights),
+                                 (profitType, itemValues),
+                                 ('q', solver.indexes)]:
+            array(typecode, column).tofile(file)
+
+    return len(weights)
+
+
+class searchIndexFile:
+    """
+    The memory-mapped max profit search index written by writeSearchIndexFile. Processes that map the same file
+    share its pages, each query takes the binary search over index weights and the item set backtracking.
+    """
+
+    def __init__(self, path):
+        self.columns = []
+
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+
+        fileMagic, weightType, profitType = struct.unpack_from("=8s1s1s", self.map, 0)
+
+        if fileMagic != magic:
+            self.close()
+            raise ValueError(f"{path} is not the search index file or it was written with the other byte order.")
+
+        weightType, profitType = weightType.decode(), profitType.decode()
+
+        headerFormat = getHeaderFormat(weightType)
+
+        pointCount, linkCount, itemCount, self.solvedConstraint = struct.unpack_from(headerFormat, self.map, 0)[3:]
+
+        offset = struct.calcsize(headerFormat)
+
+        for typecode, count in [(weightType, pointCount),
+                                (profitType, pointCount),
+                                ('q', pointCount),
+                                ('q', linkCount),
+                                ('q', linkCount),
+                                (weightType, itemCount),
+                                (profitType, itemCount),
+                                ('q', itemCount)]:
+            self.columns.append(self.view[offset: offset + 8 * count].cast(typecode))
+            offset += 8 * count
+
+        self.weights, self.profits, self.links, self.itemIds, self.parentLinks, self.itemWeights, self.itemValues, self.itemIndexes = self.columns
+
+    def __len__(self):
+        return len(self.weights)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+        return False
+
+    def query(self, constraint):
+        """
+        Finds the max profit point that fits the constraint given.
+
+        :param constraint: constraint less or equal than the index was built for
+        :type constraint: int or float
+
+        :return: bestValue, bestSize, bestItems, bestValues, bestIndexes
+        """
+
+        if constraint > self.solvedConstraint:
+            raise ValueError(f"The constraint given ({constraint}) should be less or equal than index built constraint ({self.solvedConstraint}).")
+
+        index = bisect_right(self.weights, constraint) - 1
+
+        bestValue, bestSize, bestItems, bestValues, bestIndexes = 0, 0, [], [], []
+
+        if index < 0:
+            return bestValue, bestSize, bestItems, bestValues, bestIndexes
+
+        itemIds, parentLinks = self.itemIds, self.parentLinks
+
+        link = self.links[index]
+
+        while link >= 0:
+            itemId = itemIds[link]
+
+            bestItems.append(self.itemWeights[itemId])
+            bestValues.append(self.itemValues[itemId])
+            bestIndexes.append(self.itemIndexes[itemId])
+
+            bestSize += self.itemWeights[itemId]
+            bestValue += self.itemValues[itemId]
+
+            link = parentLinks[link]
+
+        return bestValue, bestSize, bestItems, bestValues, bestIndexes
+
+    def queryMany(self, constraints, withIndexes=True):
+        """
+        Finds max profit points of many constraints at once. Item indexes are backtracked once per index point found.
+
+        :return: profits, sizes, item indexes lists or None
+        """
+
+        constraints = list(constraints)
+
+        if constraints and max(constraints) > self.solvedConstraint:
+            raise ValueError(f"The constraints given should be less or equal than index built constraint ({self.solvedConstraint}).")
+
+        weights, profits = self.weights, self.profits
+
+        pointIndexes = [bisect_right(weights, c) - 1 for c in constraints]
+
+        resultProfits = [profits[i] if i >= 0 else 0 for i in pointIndexes]
+        resultSizes = [weights[i] if i >= 0 else 0 for i in pointIndexes]
+
+        if not withIndexes:
+            return resultProfits, resultSizes, None
+
+        itemIds, parentLinks, itemIndexes = self.itemIds, self.parentLinks, self.itemIndexes
+
+        pointItemIndexes = {-1: []}
+
+        for i in pointIndexes:
+            if i not in pointItemIndexes:
+                indexes, link = [], self.links[i]
+
+                while link >= 0:
+                    indexes.append(itemIndexes[itemIds[link]])
+                    link = parentLinks[link]
+
+                pointItemIndexes[i] = indexes
+
+        return resultProfits, resultSizes, [pointItemIndexes[i] for i in pointIndexes]
+
+    def close(self):
+
+        for column in self.columns:
+            column.release()
+
+        if self.view is not None:
+            self.view.release()
+
+        self.columns, self.view = [], None
+
+        try:
+            self.map.close()
+        except BufferError:
+            # columns taken by the caller are still alive, the map is closed once they are released.
+            pass
+
+        self.file.close()
@@ -0,0 +1,154 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import json
+import re
+import time
+from contextlib import nullcontext
+
+from .layerObserver import layerObserver
+
+
+class solverMetrics(layerObserver):
+    """
+    Structured solver metrics. The object is passed to API methods and solvers instead of the iteration counter list,
+    iterCounter[0] updates count total iterations as is. Solvers given the metrics record iterations and wall time
+    of their phases, point counts of item layers and its peak, and skip statistics. Solvers given the plain list
+    skip all of it, the cost is the single check per phase and item layer. Solvers get layer point counts
+    through the layerObserver interface, together with the observer given.
+
+    Phases may nest, for example backTrace is called inside of dp, each phase keeps its own time and iterations
+    without the nested ones.
+    """
+
+    def __init__(self):
+        self.iterations = 0
+        self.phases = {}
+        self.layerPointCounts = []
+        self.peakPointCount = 0
+        self.counters = {}
+        self.phaseStack = []
+
+    def __getitem__(self, index):
+        return self.iterations
+
+    def __setitem__(self, index, value):
+        self.iterations = value
+
+    def enterPhase(self, name):
+        self.phaseStack.append([name, time.perf_counter(), self.iterations, 0, 0])
+
+    def exitPhase(self):
+
+        name, startTime, startIterations, nestedTime, nestedIterations = self.phaseStack.pop()
+
+        elapsed, iterations = time.perf_counter() - startTime, self.iterations - startIterations
+
+        if self.phaseStack:
+            self.phaseStack[-1][3] += elapsed
+            self.phaseStack[-1][4] += iterations
+
+        phase = self.phases.setdefault(name, {"calls": 0, "iterations": 0, "seconds": 0.0})
+
+        phase["calls"] += 1
+        phase["iterations"] += iterations - nestedIterations
+        phase["seconds"] += elapsed - nestedTime
+
+    def onLayer(self, layerIndex, pointCount, skippedPointsByMap, skippedPointsByLimits, skippedPointsBySize, skippedPointsByPareto, elapsed, bestProfit):
+        self.layerPointCounts.append(pointCount)
+
+        if pointCount > self.peakPointCount:
+            self.peakPointCount = pointCount
+
+    def addCounters(self, **counters):
+        for name, value in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def toDict(self):
+        return {"iterations": self.iterations,
+                "phases": {name: dict(phase) for name, phase in self.phases.items()},
+                "layerPointCounts": list(self.layerPointCounts),
+                "peakPointCount": self.peakPointCount,
+                "counters": dict(self.counters)}
+
+    def toJson(self, indent=None):
+        return json.dumps(self.toDict(), indent=indent)
+
+    def toPrometheus(self, prefix="knapsack_solver", labels=None):
+        """
+        Exports metrics in the Prometheus text format. Labels given are added to each sample,
+        backslash, double quote and line feed of label values are escaped.
+        """
+
+        def escapeLabelValue(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        def formatLabels(extra=None):
+            pairs = dict(labels or {}, **(extra or {}))
+
+            if not pairs:
+                return ""
+
+            return "{" + ",".join(f'{k}="{escapeLabelValue(v)}"' for k, v in pairs.items()) + "}"
+
+        def snakeCase(name):
+            return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+        lines = [f"# TYPE {prefix}_iterations_total counter",
+                 f"{prefix}_iterations_total{formatLabels()} {self.iterations}"]
+
+        for metric, key in [("phase_calls_total", "calls"), ("phase_iterations_total", "iterations"), ("phase_seconds_total", "seconds")]:
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            lines.extend(f"{prefix}_{metric}{formatLabels({'phase': name})} {phase[key]}" for name, phase in self.phases.items())
+
+        lines.append(f"# TYPE {prefix}_layers_total counter")
+        lines.append(f"{prefix}_layers_total{formatLabels()} {len(self.layerPointCounts)}")
+
+        lines.append(f"# TYPE {prefix}_peak_point_count gauge")
+        lines.append(f"{prefix}_peak_point_count{formatLabels()} {self.peakPointCount}")
+
+        for name, value in self.counters.items():
+            lines.append(f"# TYPE {prefix}_{snakeCase(name)}_total counter")
+            lines.append(f"{prefix}_{snakeCase(name)}_total{formatLabels()} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class metricsPhase:
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.metrics.enterPhase(self.name)
+
+    def __exit__(self, excType, excValue, traceback):
+        self.metrics.exitPhase()
+        return False
+
+
+noPhase = nullcontext()
+
+
+def getMetrics(iterCounter):
+    return iterCounter if isinstance(iterCounter, solverMetrics) else None
+
+
+def measurePhase(metrics, name):
+    if metrics is None:
+        return noPhase
+
+    return metricsPhase(metrics, name)
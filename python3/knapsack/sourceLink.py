@@ -0,0 +1,92 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from array import array
+from itertools import repeat
+
+
+class sourceLinkArena:
+    """
+    The python port of the cpp source_link storage. Each link is the (itemId, parentLink) integer pair,
+    the parent link is -1 for the first item of the set. Links are stored in two int arrays, so solution
+    reconstruction data does not keep any point alive.
+
+    The parent link is always less than the link itself, which allows to backtrack and compact the arena
+    in a single pass.
+    """
+
+    def __init__(self):
+        self.itemIds = array('l')
+        self.parentLinks = array('l')
+
+    def __len__(self):
+        return len(self.itemIds)
+
+    def add(self, itemId, parentLink):
+        self.itemIds.append(itemId)
+        self.parentLinks.append(parentLink)
+        return len(self.itemIds) - 1
+
+    def addRange(self, itemId, parentLinks):
+        """
+        Adds the links of the same item to each of parent links given. Returns the first new link.
+        """
+
+        firstLink = len(self.itemIds)
+
+        self.itemIds.extend(repeat(itemId, len(parentLinks)))
+        self.parentLinks.extend(parentLinks)
+
+        return firstLink
+
+    def getItemIds(self, link):
+
+        itemIds, parentLinks = self.itemIds, self.parentLinks
+
+        while link >= 0:
+            yield itemIds[link]
+            link = parentLinks[link]
+
+    def compact(self, liveLinks):
+        """
+        Removes the links that are not reachable from live links given.
+
+        Returns the remap array, new link is remap[oldLink]. The remap has extra -1 at the end,
+        so remap[-1] is -1 and the empty set link needs no special handling.
+        """
+
+        count = len(self.itemIds)
+        parentLinks = self.parentLinks
+
+        reachable = bytearray(count)
+
+        for link in liveLinks:
+            while link >= 0 and not reachable[link]:
+                reachable[link] = 1
+                link = parentLinks[link]
+
+        remap = array('l', [-1]) * (count + 1)
+
+        newItemIds, newParentLinks = array('l'), array('l')
+
+        for link in range(count):
+            if reachable[link]:
+                remap[link] = len(newItemIds)
+                newItemIds.append(self.itemIds[link])
+                newParentLinks.append(remap[parentLinks[link]])
+
+        self.itemIds, self.parentLinks = newItemIds, newParentLinks
+
+        return remap
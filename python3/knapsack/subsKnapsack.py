@@ -14,12 +14,18 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR TH
 """
 
 import sys
+import time
 
 from collections import defaultdict
 from collections import deque
 
 from flags.flags import doUseLimits
 
+from knapsack.decisionHistory import decisionHistory
+from knapsack.cancellation import checkCancellation
+from knapsack.layerObserver import getLayerObserver
+from knapsack.solverMetrics import getMetrics, measurePhase
+
 
 class subsetSumKnapsackSolver:
 
@@ -27,6 +33,7 @@ class subsetSumKnapsackSolver:
         self.size = size
         self.items = items
         self.iterCounter = iterCounter
+        self.metrics = getMetrics(iterCounter)
         self.forceUseLimits = forceUseLimits
         self.DP = None
         # inner stat
@@ -38,6 +45,14 @@ class subsetSumKnapsackSolver:
         self.printSuperIncreasingInfo = False
         self.doSolveSuperInc = True
         self.doUseLimits = True
+        self.useDecisionHistory = False
+        self.cancellation = None
+        self.layerHook = None
+        self.startTime = 0
+
+    def notifyObserver(self, layerIndex, pointCount, bestProfit):
+        self.layerHook.onLayer(layerIndex, pointCount, self.skippedPointsByMap, self.skippedPointsByLimits, self.skippedPointsBySize, 0,
+                               time.perf_counter() - self.startTime, bestProfit)
 
     def preProcess(self, size, items, forceUseLimits, iterCounter):
        
@@ -300,6 +315,36 @@ class subsetSumKnapsackSolver:
 
         return opt, optWeights
 
+    def backTraceHistoryItems(self, history, resultI, resultP, resultValue, items, lessItemsRange, allAsc, iterCounter):
+
+        opt = 0
+        res = resultValue
+        optWeights = []
+        point = resultP
+
+        if self.printInfo:
+            print(f"Skipped points by MAP: {self.skippedPointsByMap}, by LIMITS: {self.skippedPointsByLimits}; by SIZE: {self.skippedPointsBySize}; Total points: {self.totalPointCount}; History points: {history.getSize()}; N={len(items)}, Use limits: {doUseLimits};")
+
+        for i in range(resultI, 0, -1):
+
+            iterCounter[0] += 1
+
+            if res <= 0:
+                break
+
+            if history.isTaken(i, point):
+
+                itemIndex = self.getItemIndex(lessItemsRange, i, allAsc)
+                item = items[itemIndex]
+                optWeights.append(item)
+
+                res   -= item
+                point -= item
+
+                opt += item
+
+        return opt, optWeights
+
     def createDP(self, count, starting):
         self.DP    = [None] * (count + 1)
         self.DP[starting - 1] = defaultdict()
@@ -383,7 +428,7 @@ class subsetSumKnapsackSolver:
         if not self.doUseLimits:
             return sys.maxsize, -sys.maxsize, -sys.maxsize, 0
 
-        skipCount = 2 ** (len(items) - (itemIndex + 1)) if self.printInfo else 0
+        skipCount = 2 ** (len(items) - (itemIndex + 1)) if self.printInfo else 1
 
         partSumForItem = partialSums[itemIndex]
         superIncreasingItem = superIncreasingItems[itemIndex]
@@ -401,24 +446,52 @@ class subsetSumKnapsackSolver:
 
     def solve(self):
 
+        self.startTime = time.perf_counter()
+        self.layerHook = getLayerObserver(self.metrics)
+
+        result = self.solveInstance()
+
+        if self.metrics is not None:
+            self.metrics.addCounters(skippedPointsByMap=self.skippedPointsByMap,
+                                     skippedPointsByLimits=self.skippedPointsByLimits,
+                                     skippedPointsBySize=self.skippedPointsBySize,
+                                     totalPointCount=self.totalPointCount)
+
+        return result
+
+    def solveInstance(self):
+
         size, items, forceUseLimits, iterCounter = self.size, self.items, self.forceUseLimits, self.iterCounter
 
-        size, count, sum, lessCountSum, partialSums, starting, ending, isSuperIncreasing, superIncreasingItems, allAsc, allDesc  = self.preProcess(size, items, forceUseLimits, iterCounter)
+        with measurePhase(self.metrics, "preProcess"):
+            size, count, sum, lessCountSum, partialSums, starting, ending, isSuperIncreasing, superIncreasingItems, allAsc, allDesc  = self.preProcess(size, items, forceUseLimits, iterCounter)
 
-        cornerCasesCheck = self.checkCornerCases(size, items, sum, lessCountSum, iterCounter)
+        with measurePhase(self.metrics, "cornerCases"):
+            cornerCasesCheck = self.checkCornerCases(size, items, sum, lessCountSum, iterCounter)
 
         if  cornerCasesCheck:
             return cornerCasesCheck
 
         if self.doSolveSuperInc and isSuperIncreasing:
-            return self.solveSuperIncreasing(size, items, starting, ending, count, allAsc, iterCounter)
+            with measurePhase(self.metrics, "superIncreasing"):
+                return self.solveSuperIncreasing(size, items, starting, ending, count, allAsc, iterCounter)
+
+        with measurePhase(self.metrics, "dp"):
+            return self.solveByDynamicPrograming(size, count, items, partialSums, starting, ending, superIncreasingItems, allAsc, allDesc, forceUseLimits, iterCounter)
+
+    def solveByDynamicPrograming(self, size, count, items, partialSums, starting, ending, superIncreasingItems, allAsc, allDesc, forceUseLimits, iterCounter):
 
         lessItemsRange = 0
 
         if allAsc:
             lessItemsRange = ending + 1 - starting
 
-        DP = self.createDP(count, starting)
+        useHistory = self.useDecisionHistory
+
+        if useHistory:
+            DP, curDP, history = None, {}, decisionHistory(count)
+        else:
+            DP, curDP, history = self.createDP(count, starting), None, None
 
         resultI, resultP = 1, 1
 
@@ -431,15 +504,22 @@ class subsetSumKnapsackSolver:
 
         for i in range(starting, ending + 1):
 
+            checkCancellation(self.cancellation)
+
             itemIndex = self.getItemIndex(lessItemsRange, i, allAsc)
 
-            DP[i] = defaultdict()
+            if useHistory:
+                # only the previous layer is alive, the history keeps points where the item was taken.
+                prevDP, curDP = curDP, {}
+                takenPoints = []
+            else:
+                DP[i] = defaultdict()
+                prevDP, curDP = DP[i - 1], DP[i]
 
             prevPointCount, newPointCount = newPointCount, prevPointCount
             newPointCount = 0    
 
             itemValue, itemWeight = items       [itemIndex], items[itemIndex]
-            prevDP,    curDP      = DP          [i - 1],    DP[i]
 
             self.totalPointCount += prevPointCount
 
@@ -453,6 +533,12 @@ class subsetSumKnapsackSolver:
                 if posblValue and curValue < posblValue and posblValue <= size:
                     curValue = posblValue
 
+                    if useHistory:
+                        takenPoints.append(p)
+
+                elif useHistory and p not in prevDP:
+                    takenPoints.append(p)
+
                 self.setValue(curDP, p, curValue, iterCounter)
 
                 if  maxValue < curValue:
@@ -461,12 +547,27 @@ class subsetSumKnapsackSolver:
                     maxValue = curValue            
 
                 if  size == curValue:
+                    if useHistory:
+                        history.setLayer(i, takenPoints)
+                        return self.backTraceHistoryItems(history, resultI, resultP, maxValue, items, lessItemsRange, allAsc, iterCounter)
+
                     return self.backTraceItems(DP, resultI, resultP, items, lessItemsRange, allAsc, iterCounter)
 
                 newPointCount += 1
+
+            if useHistory:
+                history.setLayer(i, takenPoints)
+
+            if self.layerHook is not None:
+                self.notifyObserver(i, newPointCount, maxValue)
            
             if self.printInfo:
                 print(f"| {i - 1} | {newPointCount} | {round(iterCounter[0])} |")
 
-        return  self.backTraceItems(DP, resultI, resultP, items, lessItemsRange, allAsc, iterCounter)
+        with measurePhase(self.metrics, "backTrace"):
+
+            if useHistory:
+                return self.backTraceHistoryItems(history, resultI, resultP, maxValue, items, lessItemsRange, allAsc, iterCounter)
+
+            return  self.backTraceItems(DP, resultI, resultP, items, lessItemsRange, allAsc, iterCounter)
 
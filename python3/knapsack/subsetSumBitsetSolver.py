@@ -0,0 +1,155 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import time
+from math import isqrt
+
+from knapsack.subsKnapsack import subsetSumKnapsackSolver
+from knapsack.cancellation import checkCancellation
+from knapsack.layerObserver import getLayerObserver
+from knapsack.solverMetrics import getMetrics, measurePhase
+
+
+class subsetSumBitsetSolver:
+    """
+    The subset sum solver for non negative int items. The bit p of the python int reachability set is 1 when
+    some subset of items visited sums to p, each item adds its subsets with the single shift-or operation.
+
+    Only each checkpointStep-th reachability set is kept. Backtracking recomputes the sets of one checkpoint
+    segment at a time, so the memory used is O((N / step + step) * size) bits.
+
+    Falls back to subsetSumKnapsackSolver for instances with non int numbers or size greater than sizeLimit.
+    """
+
+    def __init__(self, size, items, iterCounter, forceUseLimits = False):
+        self.size = size
+        self.items = items
+        self.iterCounter = iterCounter
+        self.metrics = getMetrics(iterCounter)
+        self.forceUseLimits = forceUseLimits
+        self.checkpointStep = 0
+        self.sizeLimit = 2 ** 27
+        self.printInfo = False
+        self.printSuperIncreasingInfo = False
+        self.doSolveSuperInc = True
+        self.doUseLimits = True
+        self.cancellation = None
+        self.layerHook = None
+        self.startTime = 0
+
+    def canSolve(self):
+        if type(self.size) is not int or not 0 <= self.size <= self.sizeLimit:
+            return False
+
+        return all(type(item) is int and item >= 0 for item in self.items)
+
+    def solveUsingDp(self):
+
+        solver = subsetSumKnapsackSolver(self.size, self.items, self.iterCounter, self.forceUseLimits)
+
+        solver.printInfo = self.printInfo
+        solver.printSuperIncreasingInfo = self.printSuperIncreasingInfo
+        solver.doSolveSuperInc = self.doSolveSuperInc
+        solver.doUseLimits = self.doUseLimits
+        solver.cancellation = self.cancellation
+
+        return solver.solve()
+
+    def backTraceItems(self, items, checkpoints, step, resultSum, iterCounter):
+
+        optItems = []
+        point = resultSum
+
+        for c in range(len(checkpoints) - 1, -1, -1):
+
+            if point == 0:
+                break
+
+            start = c * step
+            end = min(start + step, len(items))
+
+            # bits above point do not affect bits below it, so the segment is recomputed for point + 1 bits only.
+            mask = (1 << (point + 1)) - 1
+
+            bits = checkpoints[c] & mask
+            segmentBits = [bits]
+
+            for i in range(start, end - 1):
+                bits = (bits | (bits << items[i])) & mask
+                segmentBits.append(bits)
+
+            for i in range(end - 1, start - 1, -1):
+
+                if not (segmentBits[i - start] >> point) & 1:
+                    optItems.append(items[i])
+                    point -= items[i]
+
+            iterCounter[0] += (end - start) * (point // 64 + 1)
+
+        return resultSum, optItems
+
+    def solve(self):
+
+        if not self.canSolve():
+            return self.solveUsingDp()
+
+        self.startTime = time.perf_counter()
+        self.layerHook = getLayerObserver(self.metrics)
+
+        size, iterCounter = self.size, self.iterCounter
+
+        with measurePhase(self.metrics, "preProcess"):
+            lessSizeItems = [item for item in self.items if 0 < item <= size]
+            lessCountSum = sum(lessSizeItems)
+
+            iterCounter[0] += len(self.items)
+
+        if lessCountSum <= size:
+            return lessCountSum, lessSizeItems
+
+        count = len(lessSizeItems)
+        step = self.checkpointStep if self.checkpointStep > 0 else max(1, isqrt(count))
+        words = size // 64 + 1
+
+        mask = (1 << (size + 1)) - 1
+        bits = 1
+        checkpoints = []
+
+        if self.printInfo:
+            print(f"Bitset subset sum: N={count}, size={size}, words={words}, checkpoint step={step}")
+
+        with measurePhase(self.metrics, "bitset"):
+
+            for i in range(count):
+
+                checkCancellation(self.cancellation)
+
+                if i % step == 0:
+                    checkpoints.append(bits)
+
+                bits = (bits | (bits << lessSizeItems[i])) & mask
+
+                iterCounter[0] += words
+
+                if self.layerHook is not None:
+                    # counting reachable sums is one more pass over the bitset, so it is done for the hook only.
+                    self.layerHook.onLayer(i + 1, bin(bits).count("1"), 0, 0, 0, 0, time.perf_counter() - self.startTime, bits.bit_length() - 1)
+
+                if (bits >> size) & 1:
+                    count = i + 1
+                    break
+
+        with measurePhase(self.metrics, "backTrace"):
+            return self.backTraceItems(lessSizeItems[:count], checkpoints, step, bits.bit_length() - 1, iterCounter)
@@ -13,8 +13,13 @@ IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMA
 TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+import time
 from collections import deque
 
+from knapsack.cancellation import checkCancellation
+from knapsack.layerObserver import getLayerObserver
+from knapsack.solverMetrics import getMetrics, measurePhase
+
 
 class subsetSumParetoSolver:
 
@@ -25,6 +30,7 @@ class subsetSumParetoSolver:
         self.emptyDimension = 0
         self.forceUseLimits = forceUseLimits
         self.iterCounter = iterCounter
+        self.metrics = getMetrics(iterCounter)
         self.totalPointCount = 0
         self.skippedPointsBySize = 0
         self.skippedPointsByMap = 0
@@ -34,16 +40,23 @@ class subsetSumParetoSolver:
         self.printSuperIncreasingInfo = False
         self.doSolveSuperInc = True
         self.doUseLimits = True
+        self.cancellation = None
+        self.observer = None
+        self.layerHook = None
+        self.startTime = 0
+
+    def notifyObserver(self, layerIndex, pointCount, bestProfit):
+        self.layerHook.onLayer(layerIndex, pointCount, self.skippedPointsByMap, self.skippedPointsByLimits, self.skippedPointsBySize, 0,
+                               time.perf_counter() - self.startTime, bestProfit)
 
-    def backTraceItems(self, maxProfitPoint, count, pointSources, pointIds, iterCounter):
+    def backTraceItems(self, items, maxProfitPoint, count, pointSources, pointIds, iterCounter):
 
         def getItemIds(point, pointIds):
-            if pointIds[point] is not None:
-                yield pointIds[point]
+            while point is not None:
+                if pointIds[point] is not None:
+                    yield pointIds[point]
 
-            if pointSources[point] is not None:
-                for id in getItemIds(pointSources[point], pointIds):
-                    yield id
+                point = pointSources[point]
 
         if maxProfitPoint is not None:
 
@@ -51,8 +64,8 @@ class subsetSumParetoSolver:
             optItems  = []
 
             for id in getItemIds(maxProfitPoint, pointIds):
-                optItems.append(self.dimensions[id])
-                optSize += self.dimensions[id]
+                optItems.append(items[id])
+                optSize += items[id]
 
             iterCounter[0] += len(optItems)
 
@@ -253,7 +266,7 @@ class subsetSumParetoSolver:
         if not self.doUseLimits or not canUsePartialSums:
             return self.emptyPoint, self.emptyPoint, self.emptyPoint, self.emptyPoint
 
-        skipCount = 2 ** (len(items) - (i + 1)) if self.printInfo else 0
+        skipCount = 2 ** (len(items) - (i + 1)) if self.printInfo else 1
 
         partSumForItem = partialSums[i]
         superIncreasingItem = superIncreasingItems[i] if len(superIncreasingItems) > 0 else None
@@ -335,7 +348,7 @@ class subsetSumParetoSolver:
             if  itemDimensions not in distinctPoints1:
                 self.iterateOrPushBack(circularPointQueue, itemPoint, pointValues, greaterQu, distinctPoints2)
 
-                if maxProfitPoint < itemDimensions:  maxProfitPoint = itemPoint
+                if pointValues[maxProfitPoint] < itemDimensions:  maxProfitPoint = itemPoint
 
             else: self.skippedPointsByMap += skipCount
         else:     self.skippedPointsByLimits += skipCount
@@ -399,6 +412,8 @@ class subsetSumParetoSolver:
 
         for i in range(1, itemsCount + 1):
 
+            checkCancellation(self.cancellation)
+
             distinctPoints1, distinctPoints2 = distinctPoints2, distinctPoints1
             distinctPoints2.clear()
 
@@ -411,25 +426,48 @@ class subsetSumParetoSolver:
             newPointCount, maxProfitPoint = self.iteratePoints(i, itemIndex, itemDimensions, pointValues, pointSources, pointIds, constraint, maxProfitPoint, circularPointQueue, prevPointCount, halfConstraint, itemLimit,  oldPointLimit, newPointLimit, distinctPoints1,  distinctPoints2, skipCount, canUsePartialSums, self.iterCounter)
          
             if  pointValues[maxProfitPoint] == constraint:
-                return self.backTraceItems(maxProfitPoint, itemsCount, pointSources, pointIds, self.iterCounter)
+                return self.backTraceItems(sortedItems, maxProfitPoint, itemsCount, pointSources, pointIds, self.iterCounter)
 
-            prevPointCount = newPointCount        
+            prevPointCount = newPointCount
 
-        return self.backTraceItems(maxProfitPoint, itemsCount, pointSources, pointIds, self.iterCounter)
+            if self.layerHook is not None:
+                self.notifyObserver(i, newPointCount, pointValues[maxProfitPoint])
+
+        with measurePhase(self.metrics, "backTrace"):
+            return self.backTraceItems(sortedItems, maxProfitPoint, itemsCount, pointSources, pointIds, self.iterCounter)
 
     def solve(self):
 
-        constraints, count,  lessSizeItems, itemSum, lessCountSum, partialSums, isSuperIncreasing, superIncreasingItems, allAsc, allDesc, canUsePartialSums = self.preProcess(self.constraint, self.dimensions, self.forceUseLimits, self.iterCounter)
+        self.startTime = time.perf_counter()
+        self.layerHook = getLayerObserver(self.metrics, self.observer)
+
+        result = self.solveInstance()
+
+        if self.metrics is not None:
+            self.metrics.addCounters(skippedPointsByMap=self.skippedPointsByMap,
+                                     skippedPointsByLimits=self.skippedPointsByLimits,
+                                     skippedPointsBySize=self.skippedPointsBySize,
+                                     totalPointCount=self.totalPointCount)
+
+        return result
+
+    def solveInstance(self):
+
+        with measurePhase(self.metrics, "preProcess"):
+            constraints, count,  lessSizeItems, itemSum, lessCountSum, partialSums, isSuperIncreasing, superIncreasingItems, allAsc, allDesc, canUsePartialSums = self.preProcess(self.constraint, self.dimensions, self.forceUseLimits, self.iterCounter)
 
-        cornerCasesCheck = self.checkCornerCases(constraints, lessSizeItems, lessCountSum, itemSum)
+        with measurePhase(self.metrics, "cornerCases"):
+            cornerCasesCheck = self.checkCornerCases(constraints, lessSizeItems, lessCountSum, itemSum)
 
         if  cornerCasesCheck:
             return cornerCasesCheck
 
         if self.doSolveSuperInc and isSuperIncreasing:
-            return self.solveSuperIncreasing(constraints, lessSizeItems, count, allAsc, self.iterCounter)
+            with measurePhase(self.metrics, "superIncreasing"):
+                return self.solveSuperIncreasing(constraints, lessSizeItems, count, allAsc, self.iterCounter)
 
         if self.printInfo:
             print(f"KB subset-sum pareto knapsack solver: N={count}; canUsePartialSums={canUsePartialSums}; forceUseLimits={self.forceUseLimits}")
 
-        return  self.solveUsingLimitsOnly(constraints, lessSizeItems, allAsc, partialSums, superIncreasingItems, canUsePartialSums)
\ No newline at end of file
+        with measurePhase(self.metrics, "pareto"):
+            return  self.solveUsingLimitsOnly(constraints, lessSizeItems, allAsc, partialSums, superIncreasingItems, canUsePartialSums)
\ No newline at end of file
@@ -0,0 +1,215 @@
+"""
+Copyright Feb 2021 Konstantin Briukhnov (kooltew at gmail.com) (@CostaBru). San-Francisco Bay Area.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED,
+INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from bisect import bisect_right
+from fractions import Fraction
+from itertools import accumulate
+
+
+def getEfficiency(weight, profit):
+
+    if weight <= 0:
+        return float('inf')
+
+    if type(weight) is int and type(profit) is int:
+        return Fraction(profit, weight)
+
+    return profit / weight
+
+
+class dantzigBound:
+    """
+    The LP relaxation bound of 1D 1-0 knapsack over the items not visited yet. The items are ordered by profit
+    to weight ratio DESC, the bound of the point is its profit plus the profits of the best ratio items that fit
+    the capacity left, plus the fraction of the first item that does not fit.
+
+    The ratio order is fixed, weights and profits of the items left are kept in Fenwick trees over ratio positions.
+    The solver removes each item visited, the removal and the bound of the point cost O(log N).
+
+    Sums of rational profits are rounded, so for non int instances the point is hopeless only if its bound is less
+    than the lower bound minus 1e-9 of it.
+    """
+
+    def __init__(self, weights, profits, capacity):
+        self.weights = weights
+        self.profits = profits
+        self.capacity = capacity
+        self.isInteger = all(type(w) is int for w in weights) and all(type(p) is int for p in profits) and type(capacity) is int
+        self.order = sorted(range(len(weights)), key=lambda i: getEfficiency(weights[i], profits[i]), reverse=True)
+        self.positions = [0] * len(weights)
+        self.removed = [False] * len(weights)
+        self.orderWeights = [weights[i] for i in self.order]
+        self.orderProfits = [profits[i] for i in self.order]
+
+        for position, i in enumerate(self.order):
+            self.positions[i] = position + 1
+
+        # the trees are padded by empty items to the power of two size, so the descent needs no range checks.
+        treeSize = 1 << len(weights).bit_length()
+        padding = [0] * (treeSize - len(weights))
+
+        self.treeWeights = self.createTree(self.orderWeights + padding)
+        self.treeProfits = self.createTree(self.orderProfits + padding)
+
+        self.steps = [treeSize >> k for k in range(1, len(weights).bit_length() + 1)]
+
+    @staticmethod
+    def createTree(values):
+
+        tree = [0] + values
+        count = len(values)
+
+        for i in range(1, count + 1):
+            parent = i + (i & -i)
+
+            if parent <= count:
+                tree[parent] += tree[i]
+
+        return tree
+
+    def removeItem(self, index):
+
+        if self.removed[index]:
+            return
+
+        self.removed[index] = True
+
+        weight, profit = self.weights[index], self.profits[index]
+        treeWeights, treeProfits = self.treeWeights, self.treeProfits
+
+        position, count = self.positions[index], len(treeWeights) - 1
+
+        self.orderWeights[position - 1], self.orderProfits[position - 1] = 0, 0
+
+        while position <= count:
+            treeWeights[position] -= weight
+            treeProfits[position] -= profit
+            position += position & -position
+
+    def getGreedyProfit(self):
+        """
+        Returns the profit of the items taken by ratio while they fit the capacity, it is the lower bound of optimal profit.
+        """
+
+        capacity, profit = self.capacity, 0
+
+        for i in self.order:
+            if not self.removed[i] and self.weights[i] <= capacity:
+                capacity -= self.weights[i]
+                profit += self.profits[i]
+
+        return profit
+
+    def getHopefulMask(self, weights, profits, lowerBound):
+        """
+        Returns the list of flags, True for the points which bound is not less than the lower bound,
+        the same as not isHopeless for each point.
+
+        The front larger than the number of items is bounded by bisecting prefix sums of the items left built in O(N),
+        the smaller one by Fenwick tree descents.
+        """
+
+        if not self.isInteger:
+            lowerBound -= abs(lowerBound) / 10 ** 9
+
+        if len(weights) > len(self.order):
+            bounds = self.getBoundsByPrefixSums(weights, profits)
+        else:
+            bounds = self.getBoundsByDescent(weights, profits)
+
+        return [bound >= lowerBound for bound in bounds]
+
+    def getBoundsByDescent(self, weights, profits):
+
+        treeWeights, treeProfits, steps = self.treeWeights, self.treeProfits, self.steps
+        order, itemWeights, itemProfits, isInteger, count = self.order, self.weights, self.profits, self.isInteger, len(self.order)
+
+        bounds = []
+
+        for weight, profit in zip(weights, profits):
+
+            capacity = self.capacity - weight
+
+            if capacity < 0:
+                bounds.append(profit)
+                continue
+
+            position, bound = 0, profit
+
+            for step in steps:
+                nextPosition = position + step
+
+                if treeWeights[nextPosition] <= capacity:
+                    position = nextPosition
+                    capacity -= treeWeights[nextPosition]
+                    bound += treeProfits[nextPosition]
+
+            if position < count and itemWeights[order[position]] > 0:
+                i = order[position]
+
+                if isInteger:
+                    bound += capacity * itemProfits[i] // itemWeights[i]
+                else:
+                    bound += capacity * itemProfits[i] / itemWeights[i]
+
+            bounds.append(bound)
+
+        return bounds
+
+    def getBoundsByPrefixSums(self, weights, profits):
+
+        order, itemWeights, itemProfits, isInteger, count = self.order, self.weights, self.profits, self.isInteger, len(self.order)
+
+        prefixWeights = [0] + list(accumulate(self.orderWeights))
+        prefixProfits = [0] + list(accumulate(self.orderProfits))
+
+        bounds = []
+
+        for weight, profit in zip(weights, profits):
+
+            capacity = self.capacity - weight
+
+            if capacity < 0:
+                bounds.append(profit)
+                continue
+
+            # removed items have zero weight in prefix sums, so the first item that does not fit is the one left.
+            k = bisect_right(prefixWeights, capacity) - 1
+
+            bound = profit + prefixProfits[k]
+
+            if k < count:
+                i = order[k]
+
+                if isInteger:
+                    bound += (capacity - prefixWeights[k]) * itemProfits[i] // itemWeights[i]
+                else:
+                    bound += (capacity - prefixWeights[k]) * itemProfits[i] / itemWeights[i]
+
+            bounds.append(bound)
+
+        return bounds
+
+    def isHopeless(self, weight, profit, lowerBound):
+
+        bound = self.getBound(weight, profit)
+
+        if self.isInteger:
+            return bound < lowerBound
+
+        return bound < lowerBound - abs(lowerBound) / 10 ** 9
+
+    def getBound(self, weight, profit):
+        return self.getBoundsByDescent((weight,), (profit,))[0]
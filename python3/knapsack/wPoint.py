@@ -13,11 +13,18 @@ IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMA
 TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+from operator import add, sub, le, ge
+
 
 class wPoint:
+
+    # points are created in every solver hot loop, so slots are used instead of instance dict,
+    # and the hash is computed on first use.
+    __slots__ = ('dimensions', 'hashCache')
+
     def __init__(self, dimensions):
         self.dimensions = tuple(dimensions)
-        self.dimHash = 397 ^ hash(self.dimensions)
+        self.hashCache = None
 
     def createNew(self, tuples):
         return wPoint(tuples)
@@ -83,95 +90,47 @@ class wPoint:
         return wPoint(newDim)
 
     def __add__(self, item):
-
-        l = len(self.dimensions)
-
-        newDim = [0] * l
-
-        for i in range(l):
-            newDim[i] = self.dimensions[i] + item.getDimension(i)
-
-        return wPoint(newDim)
+        return wPoint(tuple(map(add, self.dimensions, item.getDimensions())))
 
     def __sub__(self, item):
+        return wPoint(tuple(map(sub, self.dimensions, item.getDimensions())))
 
-        l = len(self.dimensions)
-        newDim = [0] * l
-
-        for i in range(l):
-            newDim[i] = self.dimensions[i] - item.getDimension(i)
-
-        return wPoint(newDim)
-
-        # <
-
+    # <
     def __lt__(self, other):
-        l = len(self.dimensions)
-
-        allLess = False
-        for i in range(l):
-
-            if self.dimensions[i] == other.getDimension(i):
-                continue
-
-            if self.dimensions[i] < other.getDimension(i):
-                allLess = True
-            else:
-                return False
-
-        return allLess
-
-        # <=
+        otherDims = other.getDimensions()
+        return self.dimensions != otherDims and all(map(le, self.dimensions, otherDims))
 
+    # <=
     def __le__(self, other):
+        return all(map(le, self.dimensions, other.getDimensions()))
 
-        l = len(self.dimensions)
-        for i in range(l):
-
-            if self.dimensions[i] > other.getDimension(i):
-                return False
-
-        return True
-        # >
-
+    # >
     def __gt__(self, other):
-        l = len(self.dimensions)
-
-        allGreater = False
-        for i in range(l):
-
-            if self.dimensions[i] == other.getDimension(i):
-                continue
-
-            if other.dimensions[i] < self.getDimension(i):
-                allGreater = True
-            else:
-                return False
-
-        return allGreater
-        # >=
+        otherDims = other.getDimensions()
+        return self.dimensions != otherDims and all(map(ge, self.dimensions, otherDims))
 
+    # >=
     def __ge__(self, other):
-        l = len(self.dimensions)
-        for i in range(l):
-
-            if self.dimensions[i] < other.getDimension(i):
-                return False
-
-        return True
+        return all(map(ge, self.dimensions, other.getDimensions()))
 
     def __eq__(self, other):
         return self.dimensions == other.getDimensions()
 
     def __hash__(self):
-        return self.dimHash
+        if self.hashCache is None:
+            self.hashCache = 397 ^ hash(self.dimensions)
+
+        return self.hashCache
 
 
 class wPoint2:
+
+    __slots__ = ('dim1', 'dim2', 'hashCache')
+
     def __init__(self, dim1, dim2):
         self.dim1 = dim1
         self.dim2 = dim2
-        self.dimHash = 397 ^ hash(self.dim1) ^ hash(self.dim2)
+        self.hashCache = None
 
     def createNew(self, tuples):
         return wPoint2(tuples[0], tuples[1])
@@ -240,13 +199,19 @@ class wPoint2:
         return self.dim1 == other.dim1 and self.dim2 == other.dim2
 
     def __hash__(self):
-        return self.dimHash
+        if self.hashCache is None:
+            self.hashCache = 397 ^ hash(self.dim1) ^ hash(self.dim2)
+
+        return self.hashCache
 
 
 class wPoint1:
+
+    __slots__ = ('dimensions', 'hashCache')
+
     def __init__(self, dimensions):
         self.dimensions = dimensions
-        self.dimHash = 397 ^ hash(self.dimensions)
+        self.hashCache = None
 
     def createNew(self, tuples):
         return wPoint1(tuples[0])
@@ -307,4 +272,7 @@ class wPoint1:
         return self.dimensions == other.getDimension(0)
 
     def __hash__(self):
-        return self.dimHash
+        if self.hashCache is None:
+            self.hashCache = 397 ^ hash(self.dimensions)
+
+        return self.hashCache
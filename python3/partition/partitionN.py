@@ -14,16 +14,24 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR TH
 """
 
 import math
+import os
 import random
 import sys
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from copy import copy, deepcopy
 from decimal import Decimal
+from multiprocessing import Manager
 
+from knapsack.cancellation import checkCancellation
 from knapsack.knapsackNd import knapsackNSolver
 from knapsack.knapsackPareto import knapsackParetoSolver
 from knapsack.paretoPoint import paretoPoint0, paretoPoint2
+from knapsack.solverMetrics import getMetrics, measurePhase
 from knapsack.subsKnapsack import subsetSumKnapsackSolver
 from knapsack.subsetSumParetoSolver import subsetSumParetoSolver
+from knapsack.subsetSumBitsetSolver import subsetSumBitsetSolver
 from knapsack.wPoint import wPoint1, wPoint2
 
 
@@ -42,6 +50,24 @@ class partitionItem:
             return f"| Size: {self.Sizes}, Items: {self.Items} |"
 
 
+def optimizePartitionsRun(solver, runIndex, seed, quotients, remainder, sizes, groupSize, optimizationLimit):
+    """
+    Runs the partition optimization with its own random generator on the copy of quotients and remainder.
+
+    :return: quotients, remainder, optimizationCount, iterations
+    """
+
+    iterCounter = [0]
+
+    solver = copy(solver)
+    solver.runIndex = runIndex
+    solver.random = random.Random(seed)
+
+    quotients, remainder, optimizationCount = solver.optimizePartitions(deepcopy(quotients), deepcopy(remainder), sizes, groupSize, optimizationLimit, iterCounter)
+
+    return quotients, remainder, optimizationCount, iterCounter[0]
+
+
 class partitionSolver:
 
     def __init__(self, items, sizesOrPartitions, groupSize, iterCounter, optimizationLimit) -> None:
@@ -49,10 +75,24 @@ class partitionSolver:
         self.sizesOrPartitions = sizesOrPartitions
         self.groupSize = groupSize
         self.iterCounter = iterCounter
+        self.metrics = getMetrics(iterCounter)
         self.useHybridParetoGrouping = True
+        self.useBitsetGrouping = False
         self.optimizationLimit = optimizationLimit
         self.printInfo = False
         self.printOptimizationInfo = False
+        self.multiStartCount = 0
+        self.multiStartSeed = 0
+        self.executor = None
+        self.random = None
+        self.runIndex = 0
+        self.stopIndex = None
+        self.stopCheckInterval = 0.01
+        self.stopCheckTime = 0
+        self.stopReached = False
+        self.deadline = 0
+        self.iterationLimit = 0
+        self.cancellation = None
 
     def prepareGrouping(self, A, iterCounter):
 
@@ -136,8 +176,32 @@ class partitionSolver:
 
             return  quotientResult, partitionItem(remainderResult, [len(remainderResult) // groupSize]), 0
 
+    def isStopped(self):
+
+        if self.stopIndex is None:
+            return False
+
+        # reading the manager value is the IPC round trip, so it is read once per stopCheckInterval seconds at most.
+        # Runs after the stop index are discarded anyway, so the late stop does not change the result.
+        now = time.perf_counter()
+
+        if now >= self.stopCheckTime:
+            self.stopCheckTime = now + self.stopCheckInterval
+            self.stopReached = self.runIndex > self.stopIndex.value
+
+        return self.stopReached
+
+    def isBudgetExceeded(self, iterCounter):
+
+        if self.deadline and time.perf_counter() >= self.deadline:
+            return True
+
+        return self.iterationLimit > 0 and iterCounter[0] >= self.iterationLimit
+
     def optimizePartitions(self, quotients, remainder, sizes, groupSize, optimizationLimit, iterCounter):
 
+        shuffle = (self.random or random).shuffle
+
         def mergeTwoSorted(itemSet1, itemSet2):
 
             result = []
@@ -238,8 +302,8 @@ class partitionSolver:
                 newSet += remainderItem.Items
                 newSizes += remainderItem.Sizes
 
-                random.shuffle(newSet)
-                random.shuffle(newSizes)
+                shuffle(newSet)
+                shuffle(newSizes)
 
                 for s in reversed(p.Sizes):
                     newSizes.append(s)
@@ -256,8 +320,8 @@ class partitionSolver:
                 newSet += p.Items
                 newSet += remainderItem.Items
                
-                random.shuffle(newSet)
-                random.shuffle(newSizes)
+                shuffle(newSet)
+                shuffle(newSizes)
 
                 iterCounter[0] += (len(p.Items) + len(remainderItem.Items)) * 2
                 iterCounter[0] += (len(p.Sizes) + len(remainderItem.Sizes)) * 2
@@ -330,14 +394,14 @@ class partitionSolver:
                     iterCounter[0] += 1
 
             elif limit > 2:
-                random.shuffle(quotients)
-                random.shuffle(remainder.Items)
+                shuffle(quotients)
+                shuffle(remainder.Items)
 
                 iterCounter[0] += len(quotients)
                 iterCounter[0] += len(remainder.Items)
             else:
-                random.shuffle(quotients)
-                random.shuffle(remainder.Items)
+                shuffle(quotients)
+                shuffle(remainder.Items)
 
                 iterCounter[0] += len(quotients)
                 iterCounter[0] += len(remainder.Items)
@@ -367,6 +431,12 @@ class partitionSolver:
 
             for i in range(len(quotients)):
 
+                checkCancellation(self.cancellation)
+
+                # optimizations of the current layer are not applied yet, so quotients and remainder are consistent.
+                if self.isStopped() or self.isBudgetExceeded(iterCounter):
+                    return quotients, remainder, optimizationCount
+
                 item = quotients[i]
 
                 uniqueSet.update(newPoints)
@@ -408,6 +478,78 @@ class partitionSolver:
         return  quotients, remainder, optimizationCount
 
 
+    def getRemainderScore(self, remainder):
+        return len(remainder.Sizes), len(remainder)
+
+    def optimizePartitionsMultiStart(self, quotients, remainder, sizes, groupSize, optimizationLimit, iterCounter):
+
+        masterRandom = random.Random(self.multiStartSeed)
+
+        seeds = [masterRandom.getrandbits(64) for _ in range(self.multiStartCount)]
+
+        results = [None] * len(seeds)
+
+        with Manager() as manager:
+
+            # runs after the first one that empties the remainder are stopped, the runs before it go on,
+            # so the lowest run index that empties the remainder wins regardless of timing.
+            stopIndex = manager.Value('i', len(seeds))
+
+            runSolver = copy(self)
+            runSolver.executor = None
+            runSolver.multiStartCount = 0
+            runSolver.stopIndex = stopIndex
+            runSolver.metrics = None
+            runSolver.cancellation = None
+
+            if self.iterationLimit > 0:
+                # each run counts its own iterations, so it gets the budget left.
+                runSolver.iterationLimit = max(1, self.iterationLimit - iterCounter[0])
+
+            executor = self.executor or ProcessPoolExecutor(max_workers=min(len(seeds), os.cpu_count() or 1))
+
+            try:
+                futures = {executor.submit(optimizePartitionsRun, runSolver, runIndex, seed, quotients, remainder, sizes, groupSize, optimizationLimit): runIndex for runIndex, seed in enumerate(seeds)}
+
+                pending = set(futures)
+
+                while pending:
+
+                    done, pending = wait(pending, timeout=self.stopCheckInterval, return_when=FIRST_COMPLETED)
+
+                    if self.cancellation is not None and self.cancellation.is_set():
+                        # the event is not shared with run processes, the stop index below all runs stops them.
+                        stopIndex.value = -1
+                        checkCancellation(self.cancellation)
+
+                    for future in done:
+
+                        runIndex = futures[future]
+
+                        runQuotients, runRemainder, runOptimizationCount, iterations = future.result()
+
+                        iterCounter[0] += iterations
+
+                        results[runIndex] = (runQuotients, runRemainder, runOptimizationCount)
+
+                        if min(self.getRemainderScore(runRemainder)) == 0 and runIndex < stopIndex.value:
+                            stopIndex.value = runIndex
+            finally:
+                if not self.executor:
+                    executor.shutdown()
+
+            lastIndex = stopIndex.value
+
+        if lastIndex < len(seeds):
+            return results[lastIndex]
+
+        bestIndex = min(range(len(seeds)), key=lambda runIndex: self.getRemainderScore(results[runIndex][1]))
+
+        if self.printOptimizationInfo:
+            print(f"multi start optimization: runs {len(seeds)}, best run {bestIndex}, remainder {self.getRemainderScore(results[bestIndex][1])}")
+
+        return results[bestIndex]
+
     def sortDuplicatesForPartitioning(self, group, count, nonUniqueList, iterCounter):
         A_sort = []
 
@@ -502,6 +644,7 @@ class partitionSolver:
    
         solver.printInfo = self.printInfo
         solver.forceUseLimits = forceUseLimits
+        solver.cancellation = self.cancellation
 
         bestValue, bestValues = solver.solve()
 
@@ -513,6 +656,19 @@ class partitionSolver:
    
         solver.printInfo = self.printInfo
         solver.forceUseLimits = forceUseLimits
+        solver.cancellation = self.cancellation
+
+        bestValue, bestItems = solver.solve()
+
+        return  bestValue, bestItems
+
+    def bitsetGroupingOperator(self, size, reminderItems, forceUseLimits, iterCounter):
+
+        solver = subsetSumBitsetSolver(size, reminderItems, iterCounter)
+
+        solver.printInfo = self.printInfo
+        solver.forceUseLimits = forceUseLimits
+        solver.cancellation = self.cancellation
 
         bestValue, bestItems = solver.solve()
 
@@ -526,6 +682,7 @@ class partitionSolver:
    
         solver.printInfo = self.printInfo
         solver.forceUseLimits = forceUseLimits
+        solver.cancellation = self.cancellation
         solver.forceUsePareto = False
         solver.canBackTraceWhenSizeReached = True
    
@@ -543,6 +700,7 @@ class partitionSolver:
         solver.printInfo = self.printInfo
         solver.printDpInfo =  self.printInfo
         solver.forceUseLimits = forceUseLimits
+        solver.cancellation = self.cancellation
         solver.canBackTraceWhenSizeReached = True
    
         _, optDims, __, optValues =  solver.solve()
@@ -556,12 +714,18 @@ class partitionSolver:
         reminderItems = items
 
         subsDivider       = self.paretoGroupingOperator   if self.useHybridParetoGrouping else self.dpGroupingOperator
+
+        if self.useBitsetGrouping:
+            subsDivider = self.bitsetGroupingOperator
+
         knapsack2dDivider = self.paretoGrouping2dOperator if self.useHybridParetoGrouping else self.dpGrouping2dOperator
 
         ls = len(sizes)
 
         for n in range(ls, 0, -1):
 
+            checkCancellation(self.cancellation)
+
             size = sizes[n - 1]
 
             if groupSize > 0:
@@ -642,6 +806,19 @@ class partitionSolver:
         return sizes, sameSizes
 
     def solve(self):
+        """
+        If the solverMetrics is given as the iteration counter then grouping, divide and optimization phases are recorded,
+        grouping knapsack solvers add their phases and item layers. Multi start runs add their iterations only.
+        """
+
+        result = self.solveInstance()
+
+        if self.metrics is not None:
+            self.metrics.addCounters(optimizationCount=result[2])
+
+        return result
+
+    def solveInstance(self):
 
         items, sizesOrPartitions, groupSize, iterCounter, optimizationLimit = self.items, self.sizesOrPartitions, self.groupSize, self.iterCounter, self.optimizationLimit
 
@@ -650,34 +827,43 @@ class partitionSolver:
 
         if  count < len(sizes):
             return [], [], 0
-       
-        group = self.prepareGrouping(items, iterCounter)
-        allUnique, nonUniqueList = self.groupItems(group, iterCounter)
+
+        with measurePhase(self.metrics, "grouping"):
+            group = self.prepareGrouping(items, iterCounter)
+            allUnique, nonUniqueList = self.groupItems(group, iterCounter)
 
         if len(nonUniqueList) == 1:
-            return self.getSingleDuplicatePartitions(items, count, sizes, groupSize, iterCounter)
+            with measurePhase(self.metrics, "divide"):
+                return self.getSingleDuplicatePartitions(items, count, sizes, groupSize, iterCounter)
 
         quotients, remainder, optCount = [], [], 0
 
-        if  allUnique:
+        with measurePhase(self.metrics, "divide"):
 
-            items = list(items)
-            items.sort()
+            if  allUnique:
 
-            iterCounter[0] += count * math.log2(count)
-            iterCounter[0] += count
+                items = list(items)
+                items.sort()
 
-            quotients, remainder, optCount = self.divideSet(items, sizes, groupSize, iterCounter)
-        else:
-            if  len(nonUniqueList) > len(sizes) and groupSize == 0 and sameSizes:
-                partResult = self.partitionOverSameCountDuplicates(nonUniqueList, sizes, 0, optimizationLimit, iterCounter)
-                if partResult:
-                    return partResult
+                iterCounter[0] += count * math.log2(count)
+                iterCounter[0] += count
 
-            sortedDuplicates = self.sortDuplicatesForPartitioning(group, count, nonUniqueList, iterCounter)
-            quotients, remainder, optCount = self.divideSet(sortedDuplicates, sizes, groupSize, iterCounter, forceUseLimits=True)
+                quotients, remainder, optCount = self.divideSet(items, sizes, groupSize, iterCounter)
+            else:
+                if  len(nonUniqueList) > len(sizes) and groupSize == 0 and sameSizes:
+                    partResult = self.partitionOverSameCountDuplicates(nonUniqueList, sizes, 0, optimizationLimit, iterCounter)
+                    if partResult:
+                        return partResult
+
+                sortedDuplicates = self.sortDuplicatesForPartitioning(group, count, nonUniqueList, iterCounter)
+                quotients, remainder, optCount = self.divideSet(sortedDuplicates, sizes, groupSize, iterCounter, forceUseLimits=True)
    
         if  len(remainder) == 0 or len(quotients) == len(sizes) or len(quotients) == 0:
             return quotients, remainder, optCount
 
-        return self.optimizePartitions(quotients, remainder, sizes, groupSize, optimizationLimit, iterCounter)
+        with measurePhase(self.metrics, "optimization"):
+
+            if self.multiStartCount > 1:
+                return self.optimizePartitionsMultiStart(quotients, remainder, sizes, groupSize, optimizationLimit, iterCounter)
+
+            return self.optimizePartitions(quotients, remainder, sizes, groupSize, optimizationLimit, iterCounter)
@@ -1,17 +1,27 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from API.main import solveBatch, solveAsync
 from knapsack.greedyNdKnapsack import greedyKnapsackNdSolver
 from knapsack.knapsack import knapsackSolver, knapsackParetoSolver
 from knapsack.knapsackNd import knapsackNSolver
+from knapsack.expandingCore import expandingCoreSolver
+from knapsack.meetInTheMiddle import meetInTheMiddleSolver
 from knapsack.paretoPoint import paretoPoint1, paretoPoint0
 from knapsack.subsKnapsack import subsetSumKnapsackSolver
 from knapsack.subsetSumParetoSolver import subsetSumParetoSolver
+from knapsack.subsetSumBitsetSolver import subsetSumBitsetSolver
 from knapsack.wPoint import wPoint1, wPoint
 from partition.partitionN import partitionSolver
 
 
-def subsKnapsack(size, items, iterCounter, printPct=False, doSolveSuperInc=True, doUseLimits=True):
-    solver = subsetSumKnapsackSolver(size, items, iterCounter, forceUseLimits=False)
+def subsKnapsack(size, items, iterCounter, printPct=False, doSolveSuperInc=True, doUseLimits=True, useBitset=False, cancellation=None):
+    solverType = subsetSumBitsetSolver if useBitset else subsetSumKnapsackSolver
+
+    solver = solverType(size, items, iterCounter, forceUseLimits=False)
 
     solver.printInfo = printPct
+    solver.cancellation = cancellation
     solver.printSuperIncreasingInfo = True
     solver.doSolveSuperInc = doSolveSuperInc
     solver.doUseLimits = doUseLimits
@@ -20,11 +30,16 @@ def subsKnapsack(size, items, iterCounter, printPct=False, doSolveSuperInc=True,
     return bestValue, bestItems
 
 
-def knapsack(size, items, values, iterCounter, printPct=False, doSolveSuperInc=True, doUseLimits=True):
+def knapsack(size, items, values, iterCounter, printPct=False, doSolveSuperInc=True, doUseLimits=True, useDenseDp=True, useItemReduction=False, useDominanceReduction=False, cancellation=None, observer=None):
     solver = knapsackSolver(size, items, values, iterCounter, forceUseLimits=False)
 
     solver.forceUseDpSolver = True
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
+    solver.useDenseDp = useDenseDp
+    solver.useItemReduction = useItemReduction
+    solver.useDominanceReduction = useDominanceReduction
     solver.printSuperIncreasingInfo = True
     solver.doSolveSuperInc = doSolveSuperInc
     solver.doUseLimits = doUseLimits
@@ -33,11 +48,18 @@ def knapsack(size, items, values, iterCounter, printPct=False, doSolveSuperInc=T
     return bestValue, bestSize, bestItems, bestValues
 
 
-def hybridKnapsack(size, items, values, iterCounter, printPct=False, doSolveSuperInc=True, doUseLimits=True):
+def hybridKnapsack(size, items, values, iterCounter, printPct=False, doSolveSuperInc=True, doUseLimits=True, useExpandingCore=False, useMeetInTheMiddle=False, useDenseDp=True, useItemReduction=False, useDominanceReduction=False, cancellation=None, observer=None):
     solver = knapsackSolver(size, items, values, iterCounter, forceUseLimits=False)
 
     solver.forceUseDpSolver = False
+    solver.useExpandingCore = useExpandingCore
+    solver.useMeetInTheMiddle = useMeetInTheMiddle
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
+    solver.useDenseDp = useDenseDp
+    solver.useItemReduction = useItemReduction
+    solver.useDominanceReduction = useDominanceReduction
     solver.printSuperIncreasingInfo = True
     solver.doSolveSuperInc = doSolveSuperInc
     solver.doUseLimits = doUseLimits
@@ -46,21 +68,57 @@ def hybridKnapsack(size, items, values, iterCounter, printPct=False, doSolveSupe
     return bestValue, bestSize, bestItems, bestValues
 
 
+def meetInTheMiddleKnapsack(size, items, values, iterCounter, printPct=False, cancellation=None):
+    solver = meetInTheMiddleSolver(size, items, values, iterCounter)
+
+    solver.printInfo = printPct
+    solver.cancellation = cancellation
+
+    bestValue, bestSize, bestIndexes = solver.solve()
+    return bestValue, bestSize, [items[i] for i in bestIndexes], [values[i] for i in bestIndexes]
+
+
 def paretoKnapsack(size, items, values, iterCounter,
                    useRatioSort=False,
                    printPct=False,
                    doSolveSuperInc=True,
-                   doUseLimits=True):
+                   doUseLimits=True,
+                   useColumnFront=False,
+                   useVectorizedMerge=False,
+                   useUpperBoundPruning=False,
+                   useItemReduction=False,
+                   useDominanceReduction=False,
+                   parallelShardCount=0,
+                   parallelExecutor=None,
+                   cancellation=None,
+                   observer=None,
+                   timeLimit=0,
+                   iterationLimit=0):
     paretoItems = [wPoint1(item) for item in items]
 
     solver = knapsackParetoSolver(paretoItems, values, range(len(values)), wPoint1(size), paretoPoint1(0, 0),
                                   wPoint1(0), iterCounter)
 
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
+    solver.useItemReduction = useItemReduction
+    solver.useDominanceReduction = useDominanceReduction
     solver.forceUsePareto = True
     solver.useRatioSort = useRatioSort
+    solver.useColumnFront = useColumnFront
+    solver.useVectorizedMerge = useVectorizedMerge
+    solver.useUpperBoundPruning = useUpperBoundPruning
+    solver.parallelShardCount = parallelShardCount
+    solver.parallelExecutor = parallelExecutor
+    solver.deadline = time.perf_counter() + timeLimit if timeLimit else 0
+    solver.iterationLimit = iterationLimit
 
     bestValue, bestSize, bestItems, bestValues, bestIndexes = solver.solve()
+
+    if timeLimit or iterationLimit:
+        return bestValue, bestSize.getDimension(0), bestItems, bestValues, solver.isOptimal
+
     return bestValue, bestSize.getDimension(0), bestItems, bestValues
 
 
@@ -69,7 +127,14 @@ def hybridParetoKnapsack(size, items, values, iterCounter,
                          printPct=False,
                          doSolveSuperInc=True,
                          doUseLimits=True,
-                         forceUsePareto=False
+                         forceUsePareto=False,
+                         useColumnFront=False,
+                         useVectorizedMerge=False,
+                         useUpperBoundPruning=False,
+                         useItemReduction=False,
+                         useDominanceReduction=False,
+                         cancellation=None,
+                         observer=None
                          ):
     paretoItems = [wPoint1(item) for item in items]
 
@@ -77,8 +142,15 @@ def hybridParetoKnapsack(size, items, values, iterCounter,
                                   wPoint1(0), iterCounter)
 
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
+    solver.useItemReduction = useItemReduction
+    solver.useDominanceReduction = useDominanceReduction
     solver.forceUsePareto = forceUsePareto
     solver.useRatioSort = useRatioSort
+    solver.useColumnFront = useColumnFront
+    solver.useVectorizedMerge = useVectorizedMerge
+    solver.useUpperBoundPruning = useUpperBoundPruning
 
     bestValue, bestSize, bestItems, bestValues, bestIndexes = solver.solve()
     return bestValue, bestSize.getDimension(0), bestItems, bestValues
@@ -87,10 +159,14 @@ def hybridParetoKnapsack(size, items, values, iterCounter,
 def subsParetoKnapsack(size, items, iterCounter,
                        printPct=False,
                        doSolveSuperInc=True,
-                       doUseLimits=True):
+                       doUseLimits=True,
+                       cancellation=None,
+                       observer=None):
     solver = subsetSumParetoSolver(size, items, iterCounter, forceUseLimits=False)
 
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
     solver.printSuperIncreasingInfo = True
     solver.doSolveSuperInc = doSolveSuperInc
     solver.doUseLimits = doUseLimits
@@ -102,13 +178,21 @@ def subsParetoKnapsack(size, items, iterCounter,
 def knapsackNd(constraints, items, values, iterCounter,
                printPct=False,
                doSolveSuperInc=True,
-               doUseLimits=True
+               doUseLimits=True,
+               useItemReduction=False,
+               useDominanceReduction=False,
+               cancellation=None,
+               observer=None
                ):
     solver = knapsackNSolver(constraints, items, values, iterCounter, wPoint([0] * constraints.getSize()),
                              forceUseLimits=False)
 
     solver.forceUseDpSolver = True
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
+    solver.useItemReduction = useItemReduction
+    solver.useDominanceReduction = useDominanceReduction
     solver.printDpInfo = printPct
     solver.printSuperIncreasingInfo = True
     solver.doSolveSuperInc = doSolveSuperInc
@@ -121,13 +205,21 @@ def knapsackNd(constraints, items, values, iterCounter,
 def hybridKnapsackNd(constraints, items, values, iterCounter,
                      printPct=False,
                      doSolveSuperInc=True,
-                     doUseLimits=True
+                     doUseLimits=True,
+                     useItemReduction=False,
+                     useDominanceReduction=False,
+                     cancellation=None,
+                     observer=None
                      ):
     solver = knapsackNSolver(constraints, items, values, iterCounter, wPoint([0] * constraints.getSize()),
                              forceUseLimits=False)
 
     solver.forceUseDpSolver = False
     solver.printInfo = printPct
+    solver.cancellation = cancellation
+    solver.observer = observer
+    solver.useItemReduction = useItemReduction
+    solver.useDominanceReduction = useDominanceReduction
     solver.printSuperIncreasingInfo = True
     solver.doSolveSuperInc = doSolveSuperInc
     solver.doUseLimits = doUseLimits
@@ -135,7 +227,7 @@ def hybridKnapsackNd(constraints, items, values, iterCounter,
     bestValue, bestSize, bestItems, bestValues = solver.solve()
     return bestValue, bestSize, bestItems, bestValues
 
-def greedyKnapsackNd(constraints, items, values, iterCounter,  printPct=False):
+def greedyKnapsackNd(constraints, items, values, iterCounter,  printPct=False, parallelWorkersCount=0, timeLimit=0, iterationLimit=0, cancellation=None):
 
     solver = greedyKnapsackNdSolver(constraints, items, values, iterCounter, wPoint([0] * constraints.getSize()))
 
@@ -143,34 +235,126 @@ def greedyKnapsackNd(constraints, items, values, iterCounter,  printPct=False):
     solver.printSuperIncreasingInfo = printPct
     solver.doSolveSuperInc = True
     solver.doUseLimits = True
+    solver.deadline = time.perf_counter() + timeLimit if timeLimit else 0
+    solver.iterationLimit = iterationLimit
+    solver.cancellation = cancellation
+
+    if parallelWorkersCount > 0:
+        with ProcessPoolExecutor(max_workers=parallelWorkersCount) as executor:
+            solver.executor = executor
+            solver.speculativeAttemptsCount = parallelWorkersCount
+
+            bestValue, bestSize, bestItems, bestValues = solver.solve()
+    else:
+        bestValue, bestSize, bestItems, bestValues = solver.solve()
+
+    if timeLimit or iterationLimit:
+        return bestValue, bestSize, bestItems, bestValues, solver.isOptimal
 
-    bestValue, bestSize, bestItems, bestValues = solver.solve()
     return bestValue, bestSize, bestItems, bestValues
 
 
 def partitionN(items, sizesOrPartitions, groupSize, iterCounter,
                optimizationLimit=-1,
-               printPct=False
+               printPct=False,
+               useBitsetGrouping=False,
+               multiStartCount=0,
+               multiStartSeed=0,
+               timeLimit=0,
+               iterationLimit=0,
+               cancellation=None
                ):
     solver = partitionSolver(items, sizesOrPartitions, groupSize, iterCounter, optimizationLimit)
 
     solver.printOptimizationInfo = True
     solver.printInfo = printPct
     solver.useHybridParetoGrouping = False
+    solver.useBitsetGrouping = useBitsetGrouping
+    solver.multiStartCount = multiStartCount
+    solver.multiStartSeed = multiStartSeed
+    solver.deadline = time.perf_counter() + timeLimit if timeLimit else 0
+    solver.iterationLimit = iterationLimit
+    solver.cancellation = cancellation
 
     quotients, reminder, optimizationCount = solver.solve()
+
+    if timeLimit or iterationLimit:
+        return quotients, reminder, optimizationCount, len(reminder) == 0
+
     return quotients, reminder, optimizationCount
 
 
 def hybridPartitionN(items, sizesOrPartitions, groupSize, iterCounter,
                      optimizationLimit=-1,
-                     printPct=False
+                     printPct=False,
+                     cancellation=None
                      ):
     solver = partitionSolver(items, sizesOrPartitions, groupSize, iterCounter, optimizationLimit)
 
     solver.printOptimizationInfo = True
     solver.printInfo = printPct
     solver.useHybridParetoGrouping = True
+    solver.cancellation = cancellation
 
     quotients, reminder, optimizationCount = solver.solve()
     return quotients, reminder, optimizationCount
+
+
+def knapsackBatch(instances, executor=None, chunkSize=16, ordered=True, workerCount=0, **knapsackOptions):
+    return solveBatch(knapsack, instances, executor, chunkSize, ordered, workerCount, knapsackOptions)
+
+
+def paretoKnapsackBatch(instances, executor=None, chunkSize=16, ordered=True, workerCount=0, **paretoKnapsackOptions):
+    return solveBatch(paretoKnapsack, instances, executor, chunkSize, ordered, workerCount, paretoKnapsackOptions)
+
+
+def partitionNBatch(instances, executor=None, chunkSize=16, ordered=True, workerCount=0, **partitionOptions):
+    return solveBatch(partitionN, instances, executor, chunkSize, ordered, workerCount, partitionOptions)
+
+
+async def subsKnapsackAsync(size, items, iterCounter, executor=None, **options):
+    return await solveAsync(subsKnapsack, (size, items, iterCounter), options, executor)
+
+
+async def knapsackAsync(size, items, values, iterCounter, executor=None, **options):
+    return await solveAsync(knapsack, (size, items, values, iterCounter), options, executor)
+
+
+async def hybridKnapsackAsync(size, items, values, iterCounter, executor=None, **options):
+    return await solveAsync(hybridKnapsack, (size, items, values, iterCounter), options, executor)
+
+
+async def paretoKnapsackAsync(size, items, values, iterCounter, executor=None, **options):
+    return await solveAsync(paretoKnapsack, (size, items, values, iterCounter), options, executor)
+
+
+async def hybridParetoKnapsackAsync(size, items, values, iterCounter, executor=None, **options):
+    return await solveAsync(hybridParetoKnapsack, (size, items, values, iterCounter), options, executor)
+
+
+async def subsParetoKnapsackAsync(size, items, iterCounter, executor=None, **options):
+    return await solveAsync(subsParetoKnapsack, (size, items, iterCounter), options, executor)
+
+
+async def knapsackNdAsync(constraints, items, values, iterCounter, executor=None, **options):
+    return await solveAsync(knapsackNd, (constraints, items, values, iterCounter), options, executor)
+
+
+async def hybridKnapsackNdAsync(constraints, items, values, iterCounter, executor=None, **options):
+    return await solveAsync(hybridKnapsackNd, (constraints, items, values, iterCounter), options, executor)
+
+
+async def meetInTheMiddleKnapsackAsync(size, items, values, iterCounter, executor=None, **options):
+    return await solveAsync(meetInTheMiddleKnapsack, (size, items, values, iterCounter), options, executor)
+
+
+async def greedyKnapsackNdAsync(constraints, items, values, iterCounter, executor=None, **options):
+    return await solveAsync(greedyKnapsackNd, (constraints, items, values, iterCounter), options, executor)
+
+
+async def partitionNAsync(items, sizesOrPartitions, groupSize, iterCounter, executor=None, **options):
+    return await solveAsync(partitionN, (items, sizesOrPartitions, groupSize, iterCounter), options, executor)
+
+
+async def hybridPartitionNAsync(items, sizesOrPartitions, groupSize, iterCounter, executor=None, **options):
+    return await solveAsync(hybridPartitionN, (items, sizesOrPartitions, groupSize, iterCounter), options, executor)
@@ -13,13 +13,15 @@ IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMA
 TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 '''
 import sys
-from random import shuffle, randint, seed
+from random import shuffle, randint, seed, Random
 
 import unittest
 import datetime
 import time
 import math
 import csv
+import json
+import tempfile
 import os
 
 from knapsack.greedyNdKnapsack import greedyKnapsackNdSolver
@@ -27,6 +29,11 @@ from tAPI import *
 from tests.helpers import *
 
 from knapsack.knapsack2d_dp import knapsack2d_dp
+from knapsack.solverMetrics import solverMetrics
+from knapsack.layerObserver import layerObserver
+from benchmarks.pisingerBenchmark import runBenchmark, compareWithBaseline
+from knapsack.instanceFile import instanceFile, writeInstanceFile, convertPisingerFile, readPisingerInstances
+from knapsack.searchIndexFile import searchIndexFile, writeSearchIndexFile
 from knapsack.wPoint import wPoint
 
 from tests import randomTestCount, test_data_dir, out_dir, helpers, dtNow, try_redirect_out, restore_out
@@ -117,6 +124,26 @@ class KnapsackTests(unittest.TestCase):
                 opt, optValuesSP = subsParetoKnapsack(s, A, iterCounter)
                 self.assertTrue(listValuesEqual(optValuesSP, expected))
 
+        if verbose:
+            print("Superincreasing weights with arbitrary profits tests.")
+
+        for attempt in range(20):
+
+            V = [randint(1, 1000) for a in A]
+
+            for s in range(0, sum(A), 7):
+
+                expected = max(sum(v for j, v in enumerate(V) if mask & (1 << j)) for mask in range(1 << len(A)) if sum(a for j, a in enumerate(A) if mask & (1 << j)) <= s)
+
+                opt, optDim, optItems, optValues = knapsack(s, A, V, iterCounter)
+                self.assertEqual(expected, opt)
+
+                opt, optDim, optItems, optValues = hybridKnapsack(s, A, V, iterCounter)
+                self.assertEqual(expected, opt)
+
+                opt, optDim, optItems, optValues = knapsackNd(wPoint((s, s)), [wPoint((a, a)) for a in A], V, iterCounter)
+                self.assertEqual(expected, opt)
+
         if verbose:
             print("Superincreasing rational numbers tests.")
 
@@ -863,6 +890,34 @@ class KnapsackTests(unittest.TestCase):
 
                     self.assertTrue(False)
 
+    def test_8_partition_multi_start(self):
+        if verbose: print("Partition optimization multi start runs give the same partition for the same seed.")
+
+        rnd = Random(13)
+
+        for case in range(10):
+
+            partitionCount = rnd.choice([3, 4, 5])
+
+            parts = [[rnd.randint(1, 60) for _ in range(rnd.randint(2, 5))] for _ in range(partitionCount)]
+            size = max(sum(part) for part in parts)
+
+            A = [x for part in parts for x in part + [size - sum(part)] if x > 0]
+            rnd.shuffle(A)
+
+            iterCounter = [0]
+
+            partResult, reminder, optCount = partitionN(A, partitionCount, 0, iterCounter, multiStartCount=4, multiStartSeed=case)
+            partResult2, reminder2, optCount2 = partitionN(A, partitionCount, 0, iterCounter, multiStartCount=4, multiStartSeed=case)
+
+            self.assertEqual(str(partResult), str(partResult2))
+            self.assertEqual(str(reminder), str(reminder2))
+
+            self.assertEqual(sorted(A), sorted([x for p in partResult for x in p.Items] + list(reminder.Items)))
+
+            for p in partResult:
+                self.assertEqual(sum(p.Items), sum(p.Sizes))
+
     # NP complete: 1-0 knapsack for Silvano Martello and Paolo Toth 1990 tests.
     def test_6_Silvano_Paolo_1_0_knapsack(self):
         if verbose:   print("1-0 knapsack solver for Silvano Martello and Paolo Toth 1990 tests.")
@@ -1106,6 +1161,77 @@ class KnapsackTests(unittest.TestCase):
 
                 self.assertTrue(allGood)
 
+    # NP weak: Bitset subset sum engine against DP one for hardinstances_pisinger subset sum test dataset.
+    # @unittest.skip("temp")
+    def test_8_bitset_subset_sum_files(self):
+        if verbose:   print("Run bitset subset sum knapsack for hardinstances_pisinger subset sum test dataset.")
+
+        iterCounter = [0]
+
+        testCase = list()
+        testKnapsack = 0
+        rowToSkip = 0
+
+        files = ["knapPI_16_20_1000", "knapPI_16_50_1000", "knapPI_16_200_1000"]
+
+        for f in files:
+
+            caseNumber = 1
+
+            testFileName = os.path.join(test_data_dir, f"hardinstances_pisinger", f"{f}.csv")
+
+            with open(testFileName, mode='r') as csvfile:
+                csvReader = csv.reader(csvfile, delimiter=',', quotechar='|')
+
+                for row in csvReader:
+
+                    if len(row) == 0:
+                        continue
+
+                    if row[0] == "-----":
+
+                        testCase.sort(reverse=True)
+
+                        t1 = time.perf_counter()
+
+                        opt, optItems = subsKnapsack(testKnapsack, testCase, iterCounter)
+
+                        t2 = time.perf_counter()
+
+                        optBitset, optItemsBitset = subsKnapsack(testKnapsack, testCase, iterCounter, useBitset=True)
+
+                        t3 = time.perf_counter()
+
+                        if verbose:
+                            print(f"{f} case {caseNumber} DP {round(t2 - t1, 4)} BITSET {round(t3 - t2, 4)}")
+
+                        self.assertEqual(opt, optBitset)
+                        self.assertEqual(optBitset, sum(optItemsBitset))
+
+                        for item in optItemsBitset:
+                            testCase.remove(item)
+
+                        testCase = list()
+                        testKnapsack = 0
+
+                        caseNumber += 1
+
+                        if caseNumber > 10:
+                            break
+
+                        continue
+
+                    if row[0].startswith("knapPI"):
+                        rowToSkip = 6
+
+                    if row[0].startswith("z "):
+                        testKnapsack = int(row[0].split(" ")[1])
+
+                    rowToSkip -= 1
+
+                    if rowToSkip <= 0:
+                        testCase.append(int(row[1]))
+
     # NP complete: 1-0 knapsack for hardinstances_pisinger test dataset in case of integer and rational numbers.
     # @unittest.skip("temp")
     def test_8_knapsack_1_0_files(self):
@@ -1362,6 +1488,66 @@ class KnapsackTests(unittest.TestCase):
 
             self.assertTrue(allGood)
 
+    def test_8_pisinger_benchmark(self):
+
+        if verbose:
+            print("Run pisinger benchmark for all solvers and compare results with the baseline.")
+
+        results = runBenchmark(["knapsack", "hybridKnapsack", "paretoKnapsack", "hybridParetoKnapsack", "knapsack2d"], classes=[11, 13], sizes=[20], caseCount=3, repeat=1)
+
+        self.assertEqual(10, len(results))
+        self.assertTrue(all(result["cases"] == 3 and result["failed"] == 0 and result["peakMemory"] > 0 for result in results.values()))
+
+        self.assertEqual([], compareWithBaseline(results, results))
+
+        baseline = {key: dict(result, iterations=result["iterations"] // 2) for key, result in results.items()}
+
+        self.assertEqual(len(results), len(compareWithBaseline(results, baseline)))
+
+    def test_8_instance_file(self):
+
+        if verbose:
+            print("Convert hardinstances_pisinger file to the instance file and solve instances memory-mapped.")
+
+        csvPath = os.path.join(test_data_dir, "hardinstances_pisinger", "knapPI_11_50_1000.csv")
+
+        with tempfile.TemporaryDirectory() as tempDir:
+
+            path = os.path.join(tempDir, "knapPI_11_50_1000.kbi")
+
+            self.assertEqual(100, convertPisingerFile(csvPath, path))
+
+            with instanceFile(path) as instances:
+
+                self.assertEqual(100, len(instances))
+
+                for expected, instance in zip(readPisingerInstances(csvPath), instances):
+
+                    name, capacity, optimum, weights, values = instance
+
+                    self.assertEqual(expected[:3], (name, capacity, optimum))
+                    self.assertEqual(expected[3], list(weights))
+                    self.assertEqual(expected[4], list(values))
+
+                for i in range(0, 100, 10):
+
+                    name, capacity, optimum, weights, values = instances[i]
+
+                    opt, optSize, optItems, optValues = knapsack(capacity, weights, values, [0])
+
+                    self.assertEqual(optimum, opt)
+
+            path = os.path.join(tempDir, "catalog.kbi")
+
+            self.assertEqual(2, writeInstanceFile(path, [("first", 10, None, [1, 2, 3], [4, 5, 6]), ("", 0, 7, [], [])]))
+
+            with instanceFile(path) as instances:
+
+                name, capacity, optimum, weights, values = instances[0]
+
+                self.assertEqual(("first", 10, None, [1, 2, 3], [4, 5, 6]), (name, capacity, optimum, list(weights), list(values)))
+                self.assertEqual(0, len(instances[1][3]))
+
     # NP hard: multidimensional  N=100
     def test_8_multidimensional_100(self):
 
@@ -1417,6 +1603,33 @@ class KnapsackTests(unittest.TestCase):
 
         self.assertTrue(opt >= greedyOptimumValue and optDims <= constraints)
 
+    def test_3_greedy_nd_parallel(self):
+
+        if verbose:
+            print(f"test greedy N dim solver gives the same results in parallel as sequential one")
+
+        for attempt in range(1, 6):
+
+            count = randint(5, 12)
+            dimensions = randint(2, 3)
+
+            items = [wPoint(tuple(randint(1, 50) for d in range(dimensions))) for i in range(count)]
+            values = [randint(1, 100) for i in range(count)]
+
+            constraints = wPoint(tuple(sum(item.getDimension(d) for item in items) // randint(2, 4) for d in range(dimensions)))
+
+            iterCounter = [0]
+
+            opt, optDims, optItems, optValues = greedyKnapsackNd(constraints, items, values, iterCounter)
+            optP, optDimsP, optItemsP, optValuesP = greedyKnapsackNd(constraints, items, values, iterCounter, parallelWorkersCount=2)
+
+            if verbose:
+                print(f"test_3_greedy_nd_parallel: attempt={attempt}; N={count}; D={dimensions}; sequential={opt}; parallel={optP}")
+
+            self.assertEqual(opt, optP)
+            self.assertEqual(optDims, optDimsP)
+            self.assertEqual(optValues, optValuesP)
+
     def test_3_search_index(self):
 
         if verbose:
@@ -1500,3 +1713,1110 @@ class KnapsackTests(unittest.TestCase):
                             print(f"test_3_search_index: indexConstr={indexConstr}; constraint={constraint}; forceUsePareto={forceUsePareto}; sameProfit={sameProfit}; expected - optimized: {opt - testOpt}")
 
                         self.assertTrue(good)
+
+    def test_3_search_index_file(self):
+
+        if verbose:
+            print(f"test search index written to the file gives the same results as the solver index")
+
+        with tempfile.TemporaryDirectory() as tempDir:
+
+            path = os.path.join(tempDir, "index.kbx")
+
+            for attempt in range(1, 21):
+
+                count = randint(2, 40)
+
+                testW = [randint(1, 1000) for i in range(count)]
+                testV = [randint(1, 1000) for i in range(count)]
+                testSize = sum(testW) // 2
+
+                binSearchSolver = knapsackParetoSolver([wPoint1(w) for w in testW], testV, range(count), wPoint1(testSize), paretoPoint1(0, 0), wPoint1(0), [0])
+
+                binSearchSolver.prepareSearchIndex = True
+                binSearchSolver.useColumnFront = attempt % 2 == 0
+
+                binSearchSolver.solve()
+
+                writeSearchIndexFile(path, binSearchSolver)
+
+                with searchIndexFile(path) as index:
+
+                    for constraint in [0, testSize // 4, testSize // 3, testSize // 2, testSize]:
+
+                        opt, optSize, optItems, optValues, optIndex = binSearchSolver.solve(wPoint1(constraint))
+
+                        testOpt, testOptSize, testOptItems, testOptValues, testOptIndex = index.query(constraint)
+
+                        self.assertEqual(opt, testOpt)
+                        self.assertEqual(sorted(optIndex), sorted(testOptIndex))
+                        self.assertTrue(testOptSize <= constraint)
+                        self.assertEqual(testOpt, sum(testV[i] for i in testOptIndex))
+
+    def test_3_search_max_profits(self):
+
+        if verbose:
+            print(f"test batch search of many constraints gives the same results as search of each constraint")
+
+        with tempfile.TemporaryDirectory() as tempDir:
+
+            path = os.path.join(tempDir, "index.kbx")
+
+            for attempt in range(1, 21):
+
+                count = randint(2, 40)
+
+                testW = [randint(1, 1000) for i in range(count)]
+                testV = [randint(1, 1000) for i in range(count)]
+                testSize = sum(testW) // 2
+
+                binSearchSolver = knapsackParetoSolver([wPoint1(w) for w in testW], testV, range(count), wPoint1(testSize), paretoPoint1(0, 0), wPoint1(0), [0])
+
+                binSearchSolver.prepareSearchIndex = True
+                binSearchSolver.useColumnFront = attempt % 2 == 0
+
+                binSearchSolver.solve()
+
+                constraints = [randint(0, testSize) for i in range(20)] + [0, testSize]
+
+                profits, sizes, indexes = binSearchSolver.searchMaxProfits(constraints)
+
+                writeSearchIndexFile(path, binSearchSolver)
+
+                with searchIndexFile(path) as index:
+                    fileProfits, fileSizes, fileIndexes = index.queryMany(constraints)
+
+                # closing twice is no-op.
+                index.close()
+
+                self.assertEqual(profits, fileProfits)
+                self.assertEqual(sizes, fileSizes)
+
+                for constraint, profit, size, optIndex, fileOptIndex in zip(constraints, profits, sizes, indexes, fileIndexes):
+
+                    opt, optSize, optItems, optValues, testOptIndex = binSearchSolver.solve(wPoint1(constraint))
+
+                    self.assertEqual(opt, profit)
+                    self.assertTrue(size <= constraint)
+                    self.assertEqual(sorted(testOptIndex), sorted(optIndex))
+                    self.assertEqual(sorted(testOptIndex), sorted(fileOptIndex))
+
+    def test_3_upper_bound_pruning(self):
+
+        if verbose:
+            print(f"test pareto solver with LP bound pruning gives the same profit as the full pareto front")
+
+        for attempt in range(1, 41):
+
+            count = randint(1, 40)
+
+            testW = [randint(1, 1000) for i in range(count)]
+            testV = [randint(1, 1000) for i in range(count)]
+
+            if attempt % 4 == 1:
+                testV = [max(1, w + randint(-100, 100)) for w in testW]
+
+            if attempt % 2 == 0:
+                DecimalArray(testW)
+                DecimalArray(testV)
+
+            testSize = sum(testW) / 2
+
+            for useColumnFront in [False, True]:
+
+                iterCounter = [0]
+
+                opt, optSize, optItems, optValues = paretoKnapsack(testSize, testW, testV, iterCounter)
+                optB, optSizeB, optItemsB, optValuesB = paretoKnapsack(testSize, testW, testV, iterCounter, useColumnFront=useColumnFront, useUpperBoundPruning=True)
+
+                if verbose:
+                    print(f"test_3_upper_bound_pruning: attempt={attempt}; N={count}; useColumnFront={useColumnFront}; expected - pruned: {opt - optB}")
+
+                self.assertEqual(opt, optB)
+                self.assertTrue(optSizeB <= testSize)
+                self.assertEqual(optB, sum(optValuesB))
+
+    def test_3_item_reduction(self):
+
+        if verbose:
+            print(f"test solvers give the same results with item reduction as without it")
+
+        from knapsack.itemReduction import itemReduction
+
+        for attempt in range(1, 31):
+
+            count = randint(10, 60)
+
+            testW = [randint(1, 1000) for i in range(count)]
+            testV = [randint(1, 1000) for i in range(count)]
+
+            testSize = sum(testW) // randint(2, 4)
+
+            reduction = itemReduction(testSize, testW, testV)
+            reduction.reduce([0])
+
+            self.assertEqual(count, reduction.getFixedCount() + len(reduction.undecided))
+            self.assertTrue(sum(testW[i] for i in reduction.fixedIn) <= testSize)
+
+            results = []
+
+            for useItemReduction in [False, True]:
+
+                iterCounter = [0]
+
+                opt, optSize, optItems, optValues = knapsack(testSize, testW, testV, iterCounter, useItemReduction=useItemReduction)
+
+                self.assertTrue(optSize <= testSize)
+                self.assertEqual(opt, sum(optValues))
+
+                results.append(opt)
+
+                opt, optSize, optItems, optValues = paretoKnapsack(testSize, testW, testV, iterCounter, useItemReduction=useItemReduction)
+
+                results.append(opt)
+
+            if verbose:
+                print(f"test_3_item_reduction: attempt={attempt}; N={count}; fixed={reduction.getFixedCount()}; results={results}")
+
+            self.assertEqual(len(set(results)), 1)
+
+    def test_3_dominance_reduction(self):
+
+        if verbose:
+            print(f"test solvers give the same results with dominance reduction as without it")
+
+        from knapsack.dominanceReduction import dominanceReduction
+
+        for attempt in range(1, 31):
+
+            count = randint(10, 40)
+
+            distinctItems = [(randint(1, 100), randint(1, 100)) for i in range(randint(1, count))]
+            testItems = [distinctItems[randint(0, len(distinctItems) - 1)] for i in range(count)]
+
+            testW = [w for w, v in testItems]
+            testV = [v for w, v in testItems]
+
+            testSize = sum(testW) // randint(2, 4)
+
+            reduction = dominanceReduction(testSize, testW, testV)
+            reduction.reduce([0])
+
+            self.assertEqual(sorted(reduction.restoreIndexes(range(len(reduction.groups))) + reduction.fixedOut), list(range(count)))
+
+            results = []
+
+            for useDominanceReduction in [False, True]:
+
+                iterCounter = [0]
+
+                opt, optSize, optItems, optValues = knapsack(testSize, testW, testV, iterCounter, doSolveSuperInc=False, useDominanceReduction=useDominanceReduction)
+
+                self.assertTrue(optSize <= testSize)
+                self.assertEqual(opt, sum(optValues))
+
+                results.append(opt)
+
+                opt, optSize, optItems, optValues = paretoKnapsack(testSize, testW, testV, iterCounter, useDominanceReduction=useDominanceReduction)
+
+                self.assertEqual(opt, sum(optValues))
+
+                results.append(opt)
+
+            if verbose:
+                print(f"test_3_dominance_reduction: attempt={attempt}; N={count}; reduced={reduction.getFixedCount()}; results={results}")
+
+            self.assertEqual(len(set(results)), 1)
+
+    def test_3_column_front(self):
+
+        if verbose:
+            print(f"test pareto solver with column front gives the same results as paretoPoint1 front")
+
+        for attempt in range(1, 41):
+
+            count = randint(1, 30)
+
+            testW = [randint(1, 1000) for i in range(count)]
+            testV = [randint(1, 1000) for i in range(count)]
+
+            if attempt % 2 == 0:
+                DecimalArray(testW)
+
+            testSize = sum(testW) / 2
+
+            for useRatioSort in [False, True]:
+
+                iterCounter = [0]
+
+                opt, optSize, optItems, optValues = paretoKnapsack(testSize, testW, testV, iterCounter, useRatioSort=useRatioSort)
+                optC, optSizeC, optItemsC, optValuesC = paretoKnapsack(testSize, testW, testV, iterCounter, useRatioSort=useRatioSort, useColumnFront=True)
+
+                optH, optSizeH, optItemsH, optValuesH = hybridParetoKnapsack(testSize, testW, testV, iterCounter, useRatioSort=useRatioSort, useColumnFront=True)
+
+                if verbose:
+                    print(f"test_3_column_front: attempt={attempt}; N={count}; useRatioSort={useRatioSort}; expected - column: {opt - optC}; expected - hybrid column: {opt - optH}")
+
+                self.assertEqual(opt, optC)
+                self.assertEqual(optSize, optSizeC)
+                self.assertEqual(optItems, optItemsC)
+                self.assertEqual(optValues, optValuesC)
+                self.assertEqual(opt, optH)
+                self.assertTrue(optSizeH <= testSize)
+
+            descW, descV = sortReverseBoth(testW, testV)
+
+            iterCounter = [0]
+
+            binSearchSolver = knapsackParetoSolver([wPoint1(w) for w in descW], descV, range(len(descV)), wPoint1(testSize), paretoPoint1(0, 0), wPoint1(0), iterCounter)
+
+            binSearchSolver.prepareSearchIndex = True
+            binSearchSolver.useColumnFront = True
+
+            binSearchSolver.solve()
+
+            for constraint in [testSize / 4, testSize / 3, testSize / 2, testSize]:
+
+                fullSolver = knapsackParetoSolver([wPoint1(w) for w in descW], descV, range(len(descV)), wPoint1(constraint), paretoPoint1(0, 0), wPoint1(0), iterCounter)
+
+                opt, optSize, optItems, optValues, optIndex = fullSolver.solve()
+
+                testOpt, testOptSize, testOptItems, testOptValues, testOptIndex = binSearchSolver.solve(wPoint1(constraint))
+
+                self.assertEqual(opt, testOpt)
+                self.assertTrue(testOptSize <= wPoint1(constraint))
+
+    def test_3_vectorized_merge(self):
+
+        if verbose:
+            print(f"test pareto solver with vectorized merge gives the same results as column merge")
+
+        for attempt in range(1, 41):
+
+            count = randint(1, 40)
+
+            # small weights give many points of equal weight to merge.
+            testW = [randint(1, 50 if attempt % 3 == 0 else 1000) for i in range(count)]
+            testV = [randint(1, 1000) for i in range(count)]
+
+            if attempt % 4 == 0:
+                testV = [v / 7 for v in testV]
+
+            testSize = sum(testW) // 2
+
+            for useRatioSort in [False, True]:
+
+                iterCounter = [0]
+
+                optC, optSizeC, optItemsC, optValuesC = paretoKnapsack(testSize, testW, testV, iterCounter, useRatioSort=useRatioSort, useColumnFront=True)
+                optV, optSizeV, optItemsV, optValuesV = paretoKnapsack(testSize, testW, testV, iterCounter, useRatioSort=useRatioSort, useVectorizedMerge=True)
+
+                self.assertEqual(optC, optV)
+                self.assertEqual(optSizeC, optSizeV)
+                self.assertEqual(optItemsC, optItemsV)
+
+                results = []
+
+                for useVectorizedMerge in [False, True]:
+
+                    solver = knapsackParetoSolver([wPoint1(w) for w in testW], testV, range(len(testV)), wPoint1(testSize), paretoPoint1(0, 0), wPoint1(0), [0])
+
+                    solver.useColumnFront = True
+                    solver.useVectorizedMerge = useVectorizedMerge
+                    solver.vectorizedMergeMinSize = 1
+                    solver.useRatioSort = useRatioSort
+                    solver.prepareSearchIndex = True
+
+                    opt, optSize, optItems, optValues, optIndexes = solver.solve()
+
+                    results.append((opt, optSize, sorted(optIndexes), list(solver.maxProfitPointIndex.weights), list(solver.maxProfitPointIndex.profits), solver.skippedPointsByPareto))
+
+                if verbose:
+                    print(f"test_3_vectorized_merge: attempt={attempt}; N={count}; useRatioSort={useRatioSort}; column - vectorized: {results[0][0] - results[1][0]}")
+
+                self.assertEqual(results[0], results[1])
+
+    def test_3_parallel_shards(self):
+
+        if verbose:
+            print(f"test pareto solver with parallel shards gives the same results as serial one")
+
+        from concurrent.futures import ProcessPoolExecutor
+        from knapsack.paretoShards import paretoShardsSolver
+
+        with ProcessPoolExecutor(max_workers=4) as executor:
+
+            for attempt in range(1, 31):
+
+                count = randint(1, 40)
+
+                testW = [randint(1, 1000) for i in range(count)]
+                testV = [randint(1, 1000) for i in range(count)]
+
+                if attempt % 2 == 0:
+                    DecimalArray(testW)
+
+                testSize = sum(testW) / 2
+
+                iterCounter = [0]
+
+                opt, optSize, optItems, optValues = paretoKnapsack(testSize, testW, testV, iterCounter)
+
+                shardCount = randint(2, 9)
+
+                shardsSolver = paretoShardsSolver(testSize, testW, testV, iterCounter)
+                shardsSolver.shardCount = shardCount
+                shardsSolver.executor = executor
+
+                optS, optSizeS, optIdsS = shardsSolver.solve()
+
+                optP, optSizeP, optItemsP, optValuesP = paretoKnapsack(testSize, testW, testV, iterCounter, parallelShardCount=shardCount, parallelExecutor=executor)
+
+                if verbose:
+                    print(f"test_3_parallel_shards: attempt={attempt}; N={count}; shards={shardCount}; expected - shards: {opt - optS}")
+
+                self.assertEqual(opt, optS)
+                self.assertTrue(optSizeS <= optSize)
+                self.assertEqual(optS, sum(testV[i] for i in optIdsS))
+                self.assertEqual(optSizeS, sum(testW[i] for i in optIdsS))
+
+                # the shards give the lightest item set of the optimal profit, it may differ from the serial one.
+                self.assertEqual(opt, optP)
+                self.assertEqual(optSizeS, optSizeP)
+                self.assertEqual(optP, sum(optValuesP))
+                self.assertEqual(optSizeP, sum(p.getDimension(0) for p in optItemsP))
+                self.assertEqual(sorted(optValuesP), sorted(testV[i] for i in optIdsS))
+
+            optP, optSizeP, optItemsP, optValuesP = paretoKnapsack(testSize, testW, testV, iterCounter, parallelShardCount=3)
+
+            self.assertEqual(opt, optP)
+            self.assertEqual(optP, sum(optValuesP))
+            self.assertTrue(optSizeP <= testSize)
+
+    def test_3_batch_solve(self):
+
+        if verbose:
+            print(f"test batch API gives the same results and iterations as single instance calls")
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        instances = []
+
+        for attempt in range(40):
+
+            count = randint(1, 30)
+
+            testW = [randint(1, 1000) for i in range(count)]
+            testV = [randint(1, 1000) for i in range(count)]
+
+            instances.append((sum(testW) // 2, testW, testV))
+
+        expected = []
+
+        for testSize, testW, testV in instances:
+            iterCounter = [0]
+            opt, optSize, optItems, optValues = knapsack(testSize, testW, testV, iterCounter)
+            expected.append((opt, iterCounter[0]))
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+
+            for chunkSize in [1, 7]:
+
+                results = list(knapsackBatch(iter(instances), executor=executor, chunkSize=chunkSize, workerCount=2))
+
+                self.assertEqual(list(range(len(instances))), [index for index, result, iterations in results])
+
+                for index, (opt, optSize, optItems, optValues), iterations in results:
+                    self.assertEqual(expected[index], (opt, iterations))
+
+                results = list(paretoKnapsackBatch(instances, executor=executor, chunkSize=chunkSize, ordered=False))
+
+                self.assertEqual(list(range(len(instances))), sorted(index for index, result, iterations in results))
+
+                for index, (opt, optSize, optItems, optValues), iterations in results:
+                    self.assertEqual(expected[index][0], opt)
+
+            partitions = list(partitionNBatch([([1, 2, 3, 4, 5, 5], 2, 0)] * 3, executor=executor))
+
+            for index, (partResult, reminder, optCount), iterations in partitions:
+                self.assertEqual(0, len(reminder))
+                self.assertEqual(2, len(partResult))
+
+    def test_3_async_cancellation(self):
+
+        if verbose:
+            print(f"test async API gives the same results as sync one and stops solvers once cancelled")
+
+        import asyncio
+        import threading
+        from concurrent.futures import CancelledError
+
+        testW = [randint(1000, 10000) for i in range(30)]
+        testV = [randint(1000, 10000) for i in range(30)]
+        testSize = sum(testW) // 2
+
+        opt, optSize, optItems, optValues = knapsack(testSize, testW, testV, [0])
+
+        async def solveAll():
+            return await asyncio.gather(knapsackAsync(testSize, testW, testV, [0]),
+                                        paretoKnapsackAsync(testSize, testW, testV, [0]),
+                                        knapsackNdAsync(wPoint((testSize, testSize)), [wPoint((w, w)) for w in testW], testV, [0]))
+
+        for optA, optSizeA, optItemsA, optValuesA in asyncio.run(solveAll()):
+            self.assertEqual(opt, optA)
+
+        cancellation = threading.Event()
+        cancellation.set()
+
+        with self.assertRaises(CancelledError):
+            knapsack(testSize, testW, testV, [0], cancellation=cancellation)
+
+        with self.assertRaises(CancelledError):
+            paretoKnapsack(testSize, testW, testV, [0], cancellation=cancellation)
+
+        with self.assertRaises(CancelledError):
+            subsParetoKnapsack(testSize, testW, [0], cancellation=cancellation)
+
+        with self.assertRaises(CancelledError):
+            subsKnapsack(testSize, testW, [0], cancellation=cancellation)
+
+        with self.assertRaises(CancelledError):
+            meetInTheMiddleKnapsack(testSize, testW, testV, [0], cancellation=cancellation)
+
+        smallItems = [wPoint((randint(1, 50), randint(1, 50))) for i in range(6)]
+        smallValues = [randint(1, 100) for i in range(6)]
+        smallSize = wPoint((60, 60))
+
+        with self.assertRaises(CancelledError):
+            greedyKnapsackNd(smallSize, smallItems, smallValues, [0], cancellation=cancellation)
+
+        with self.assertRaises(CancelledError):
+            partitionN(testW, 3, 0, [0], cancellation=cancellation)
+
+        with self.assertRaises(CancelledError):
+            hybridPartitionN(testW, 3, 0, [0], cancellation=cancellation)
+
+        async def solveOthers():
+            return await asyncio.gather(meetInTheMiddleKnapsackAsync(testSize, testW, testV, [0]),
+                                        greedyKnapsackNdAsync(smallSize, smallItems, smallValues, [0]))
+
+        (optM, optSizeM, optItemsM, optValuesM), (optG, optSizeG, optItemsG, optValuesG) = asyncio.run(solveOthers())
+
+        self.assertEqual(opt, optM)
+        self.assertEqual(greedyKnapsackNd(smallSize, smallItems, smallValues, [0])[0], optG)
+
+        partitionItems = [randint(1, 100) for i in range(12)]
+
+        seed(1)
+        quotients, reminder, optimizationCount = partitionN(list(partitionItems), 3, 0, [0])
+        seed(1)
+        quotientsA, reminderA, optimizationCountA = asyncio.run(partitionNAsync(list(partitionItems), 3, 0, [0]))
+
+        self.assertEqual(len(reminder), len(reminderA))
+
+        quotients, reminder, optimizationCount = hybridPartitionN(list(partitionItems), 3, 0, [0])
+        quotientsA, reminderA, optimizationCountA = asyncio.run(hybridPartitionNAsync(list(partitionItems), 3, 0, [0]))
+
+        self.assertEqual(len(reminder), len(reminderA))
+
+        testW = [randint(10 ** 6, 10 ** 7) for i in range(400)]
+        testV = [w + randint(0, 1000) for w in testW]
+
+        async def solveWithTimeout():
+            await asyncio.wait_for(paretoKnapsackAsync(sum(testW) // 2, testW, testV, [0]), 0.2)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(solveWithTimeout())
+
+    def test_3_anytime_budget(self):
+
+        if verbose:
+            print(f"test solvers stopped by iteration budget return valid solutions, proven optimal ones are optimal")
+
+        for attempt in range(1, 101):
+
+            count = randint(1, 40)
+
+            testW = [randint(1, 1000) for i in range(count)]
+            testV = [randint(1, 1000) for i in range(count)]
+            testSize = sum(testW) // 2
+
+            opt, optSize, optItems, optValues = paretoKnapsack(testSize, testW, testV, [0])
+
+            for useColumnFront in [False, True]:
+
+                optB, optSizeB, optItemsB, optValuesB, isOptimal = paretoKnapsack(testSize, testW, testV, [0], useColumnFront=useColumnFront, useUpperBoundPruning=attempt % 2 == 0, iterationLimit=randint(1, 2000))
+
+                self.assertTrue(optSizeB <= testSize)
+                self.assertEqual(optB, sum(optValuesB))
+                self.assertTrue(optB <= opt)
+
+                if isOptimal:
+                    self.assertEqual(opt, optB)
+
+            optB, optSizeB, optItemsB, optValuesB, isOptimal = paretoKnapsack(testSize, testW, testV, [0], iterationLimit=10 ** 12)
+
+            self.assertEqual(opt, optB)
+            self.assertTrue(isOptimal)
+
+        for attempt in range(1, 11):
+
+            count = randint(3, 12)
+
+            testItems = [wPoint((randint(1, 50), randint(1, 50))) for i in range(count)]
+            testV = [randint(1, 100) for i in range(count)]
+            testSize = wPoint((sum(item.getDimension(0) for item in testItems) // 2, sum(item.getDimension(1) for item in testItems) // 2))
+
+            # the exhaustive search, knapsackNd itself may miss the optimum of 2D instances.
+            opt = max(sum(testV[i] for i in range(count) if (mask >> i) & 1)
+                      for mask in range(1 << count)
+                      if all(sum(testItems[i].getDimension(d) for i in range(count) if (mask >> i) & 1) <= testSize.getDimension(d) for d in range(2)))
+
+            optG, optSizeG, optItemsG, optValuesG, isOptimal = greedyKnapsackNd(testSize, testItems, testV, [0], iterationLimit=10 ** 12)
+
+            self.assertTrue(optG <= opt)
+
+            if isOptimal:
+                self.assertEqual(opt, optG)
+
+            optG, optSizeG, optItemsG, optValuesG, isOptimal = greedyKnapsackNd(testSize, testItems, testV, [0], iterationLimit=1)
+
+            # the preprocessing exceeds the limit, 1D solvers of dimensions are not started.
+            self.assertEqual(0, optG)
+            self.assertEqual(optG, sum(optValuesG))
+
+    def test_3_solver_metrics(self):
+
+        if verbose:
+            print(f"test solver metrics passed instead of iteration counter give the same results and iterations")
+
+        for attempt in range(1, 21):
+
+            count = randint(5, 30)
+
+            testW = [randint(1, 1000) for i in range(count)]
+            testV = [randint(1, 1000) for i in range(count)]
+            testSize = sum(testW) // 2
+
+            for solve in [knapsack, paretoKnapsack]:
+
+                iterCounter, metrics = [0], solverMetrics()
+
+                opt = solve(testSize, testW, testV, iterCounter)
+                optM = solve(testSize, testW, testV, metrics)
+
+                self.assertEqual(opt[0], optM[0])
+                self.assertEqual(iterCounter[0], metrics.iterations)
+                self.assertTrue(len(metrics.phases) > 0)
+
+                if metrics.layerPointCounts:
+                    self.assertEqual(max(metrics.layerPointCounts), metrics.peakPointCount)
+
+                self.assertEqual(metrics.iterations, json.loads(metrics.toJson())["iterations"])
+                self.assertTrue(f"knapsack_solver_iterations_total {metrics.iterations}" in metrics.toPrometheus())
+
+            subsetSize = sum(testW) // 2 + 1
+
+            for solve in [lambda counter: subsKnapsack(subsetSize, testW, counter),
+                          lambda counter: subsKnapsack(subsetSize, testW, counter, useBitset=True),
+                          lambda counter: subsParetoKnapsack(subsetSize, testW, counter)]:
+
+                iterCounter, metrics = [0], solverMetrics()
+
+                self.assertEqual(solve(iterCounter)[0], solve(metrics)[0])
+                self.assertEqual(iterCounter[0], metrics.iterations)
+                self.assertTrue(len(metrics.layerPointCounts) > 0 or "superIncreasing" in metrics.phases)
+
+            testItems = [wPoint((randint(1, 50), randint(1, 50))) for i in range(randint(3, 12))]
+            testItemsV = [randint(1, 100) for item in testItems]
+            testSize2d = wPoint((sum(item.getDimension(0) for item in testItems) // 2, sum(item.getDimension(1) for item in testItems) // 2))
+
+            iterCounter, metrics = [0], solverMetrics()
+
+            self.assertEqual(greedyKnapsackNd(testSize2d, testItems, testItemsV, iterCounter)[0], greedyKnapsackNd(testSize2d, testItems, testItemsV, metrics)[0])
+            self.assertEqual(iterCounter[0], metrics.iterations)
+            self.assertTrue("dimensions" in metrics.phases)
+
+            iterCounter, metrics = [0], solverMetrics()
+
+            # the partition optimization uses the global random generator, so both solves start from the same seed.
+            seed(attempt)
+            partition = partitionN(testW, 3, 0, iterCounter)
+            seed(attempt)
+
+            self.assertEqual(str(partition), str(partitionN(testW, 3, 0, metrics)))
+            self.assertEqual(iterCounter[0], metrics.iterations)
+            self.assertTrue("grouping" in metrics.phases)
+
+        prometheus = solverMetrics().toPrometheus(labels={"instance": 'a"b\\c\nd'})
+
+        self.assertTrue('knapsack_solver_iterations_total{instance="a\\"b\\\\c\\nd"} 0' in prometheus)
+
+    def test_3_layer_observer(self):
+
+        if verbose:
+            print(f"test layer observer is called once per item layer and does not change results")
+
+        class layerRecorder(layerObserver):
+
+            def __init__(self):
+                self.layers = []
+
+            def onLayer(self, layerIndex, pointCount, skippedPointsByMap, skippedPointsByLimits, skippedPointsBySize, skippedPointsByPareto, elapsed, bestProfit):
+                self.layers.append((layerIndex, pointCount, bestProfit))
+
+        for attempt in range(1, 21):
+
+            count = randint(5, 30)
+
+            testW = [randint(1, 1000) for i in range(count)]
+            testV = [randint(1, 1000) for i in range(count)]
+            testSize = sum(testW) // 2
+
+            for solve in [knapsack, paretoKnapsack, hybridParetoKnapsack]:
+
+                iterCounter, iterCounterO, observer = [0], [0], layerRecorder()
+
+                opt = solve(testSize, testW, testV, iterCounter)
+                optO = solve(testSize, testW, testV, iterCounterO, observer=observer)
+
+                self.assertEqual(opt[0], optO[0])
+                self.assertEqual(iterCounter[0], iterCounterO[0])
+                self.assertTrue(len(observer.layers) > 0)
+
+                layerIndexes = [layer[0] for layer in observer.layers]
+
+                self.assertEqual(sorted(layerIndexes), layerIndexes)
+                self.assertTrue(observer.layers[-1][2] <= opt[0])
+
+    def test_3_source_link_compaction(self):
+
+        if verbose:
+            print(f"test pareto solver gives the same items when source link arena is compacted after each item")
+
+        for attempt in range(1, 21):
+
+            count = randint(1, 30)
+
+            testW = [randint(1, 1000) for i in range(count)]
+            testV = [randint(1, 1000) for i in range(count)]
+
+            testSize = max(1, sum(testW) // 2)
+
+            for forceUsePareto, useColumnFront in [(True, False), (False, False), (True, True)]:
+
+                results = []
+
+                for compactionSize in [2 ** 16, 0]:
+
+                    iterCounter = [0]
+
+                    solver = knapsackParetoSolver([wPoint1(w) for w in testW], testV, range(count), wPoint1(testSize), paretoPoint1(0, 0), wPoint1(0), iterCounter)
+
+                    solver.forceUsePareto = forceUsePareto
+                    solver.useColumnFront = useColumnFront
+                    solver.sourceLinksCompactionSize = compactionSize
+
+                    opt, optSize, optItems, optValues, optIndex = solver.solve()
+
+                    self.assertEqual(opt, sum(testV[i] for i in optIndex))
+                    self.assertEqual(optSize, wPoint1(sum(testW[i] for i in optIndex)))
+
+                    results.append((opt, sorted(optIndex)))
+
+                if verbose:
+                    print(f"test_3_source_link_compaction: attempt={attempt}; N={count}; forceUsePareto={forceUsePareto}; useColumnFront={useColumnFront}; results={results}")
+
+                self.assertEqual(results[0], results[1])
+
+            coreResults = []
+
+            for compactionSize in [2 ** 16, 0]:
+
+                coreSolver = expandingCoreSolver(testSize, testW, testV, [0])
+                coreSolver.sourceLinksCompactionSize = compactionSize
+
+                coreOpt, coreSize, coreItems = coreSolver.solve()
+
+                self.assertEqual(coreOpt, sum(testV[i] for i in coreItems))
+                self.assertEqual(coreSize, sum(testW[i] for i in coreItems))
+
+                coreResults.append((coreOpt, coreItems))
+
+            self.assertEqual(coreResults[0], coreResults[1])
+            self.assertEqual(coreResults[0][0], results[0][0])
+
+    def test_1_integer_scaling(self):
+
+        if verbose:
+            print(f"test Decimal instance scaled to int gives the same results as the Decimal one")
+
+        from knapsack.integerScaling import integerScaling, toScaledInt
+
+        self.assertEqual(toScaledInt(Decimal("1.25"), 3), 1250)
+        self.assertEqual(toScaledInt(Decimal("1.2567"), 2), 125)
+        self.assertEqual(toScaledInt(Decimal("-1.2567"), 2), -126)
+        self.assertEqual(toScaledInt(Decimal("1E+2"), 1), 1000)
+
+        self.assertFalse(integerScaling(10, [1, 2], [1, 2]).tryScale())
+        self.assertFalse(integerScaling(Decimal("1.5"), [Decimal("1.5"), 0.5], [1, 2]).tryScale())
+        self.assertFalse(integerScaling(Decimal("1.5"), [Decimal("1E-30")], [1]).tryScale())
+
+        for attempt in range(1, 21):
+
+            count = randint(1, 20)
+
+            testW = [Decimal(randint(1, 100000)) / 10 ** randint(0, 5) for i in range(count)]
+            testV = [Decimal(randint(1, 100000)) / 10 ** randint(0, 3) for i in range(count)]
+
+            testSize = sum(testW) / 3
+
+            scaling = integerScaling(testSize, testW, testV)
+
+            self.assertTrue(scaling.tryScale())
+            self.assertTrue(all(type(w) is int for w in scaling.scaledItems))
+
+            iterCounter = [0]
+
+            opt, optSize, optItems, optValues = paretoKnapsack(testSize, testW, testV, iterCounter)
+
+            solver = knapsackSolver(scaling.scaledSize, scaling.scaledItems, scaling.scaledValues, iterCounter, forceUseLimits=False)
+            solver.forceUseDpSolver = True
+
+            scaledOpt, scaledSize, scaledItems, scaledValues, scaledIndexes = solver.solve()
+
+            testOpt, testSize2, testItems, testValues = scaling.restore(scaledIndexes)
+
+            if verbose:
+                print(f"test_1_integer_scaling: attempt={attempt}; N={count}; itemsScale={scaling.itemsScale}; valuesScale={scaling.valuesScale}; expected - scaled: {opt - testOpt}")
+
+            self.assertEqual(opt, testOpt)
+            self.assertTrue(testSize2 <= testSize)
+            self.assertEqual(testSize2, sum(testItems))
+            self.assertTrue(all(type(w) is Decimal for w in testItems))
+
+            scaling = integerScaling(testSize, testW)
+
+            self.assertTrue(scaling.tryScale())
+
+            opt, optItems = subsKnapsack(testSize, testW, iterCounter)
+
+            scaledOpt, scaledItems = subsKnapsack(scaling.scaledSize, scaling.scaledItems, iterCounter)
+
+            testOpt, testItems = scaling.restoreItems(scaledItems)
+
+            self.assertEqual(opt, testOpt)
+            self.assertEqual(testOpt, sum(testItems))
+
+    def test_1_integer_scaling_api(self):
+
+        if verbose:
+            print(f"test API solves Decimal instances on scaled ints and restores original values and items")
+
+        import API.main as api
+
+        def assertOriginals(chosen, originals):
+            self.assertTrue(all(type(n) is Decimal for n in chosen))
+
+            rest = list(originals)
+
+            for n in chosen:
+                rest.remove(n)
+
+        for attempt in range(1, 11):
+
+            count = randint(2, 12)
+
+            testW = [Decimal(randint(1, 100000)) / 10 ** randint(0, 4) for i in range(count)]
+            testV = [Decimal(randint(1, 100000)) / 10 ** randint(0, 3) for i in range(count)]
+            testVol = [Decimal(randint(1, 1000)) / 10 ** randint(0, 2) for i in range(count)]
+
+            testSize = sum(testW) / 3
+
+            iterCounter = [0]
+
+            opt, optSize, optItems, optValues = knapsack(testSize, testW, testV, iterCounter)
+
+            for solve in [api.knapsack, api.hybridKnapsack, api.paretoKnapsack]:
+
+                testOpt, testSize2, testItems, testValues = solve(testSize, testW, testV, iterCounter)
+
+                self.assertEqual(opt, testOpt)
+                self.assertEqual(testOpt, sum(testValues))
+                self.assertEqual(testSize2, sum(testItems))
+                self.assertTrue(testSize2 <= testSize)
+                assertOriginals(testItems, testW)
+                assertOriginals(testValues, testV)
+
+            opt, optItems = subsKnapsack(testSize, testW, iterCounter)
+            testOpt, testItems = api.subsKnapsack(testSize, testW, iterCounter)
+
+            self.assertEqual(opt, testOpt)
+            self.assertEqual(testOpt, sum(testItems))
+            assertOriginals(testItems, testW)
+
+            testItems2d = [wPoint((w, v)) for w, v in zip(testW, testVol)]
+            testSize2d = wPoint((testSize, sum(testVol) / 2))
+
+            opt, optSize, optItems, optValues = knapsackNd(testSize2d, testItems2d, testV, iterCounter)
+
+            for solve in [api.knapsackNd, api.greedyKnapsackNd]:
+
+                testOpt, testSize2, testItems, testValues = solve(testSize2d, testItems2d, testV, iterCounter)
+
+                if solve == api.knapsackNd:
+                    self.assertEqual(opt, testOpt)
+
+                self.assertEqual(testOpt, sum(testValues))
+                testDims = [p if isinstance(p, tuple) else p.getDimensions() for p in testItems]
+
+                self.assertEqual(testSize2, wPoint((sum(p[0] for p in testDims), sum(p[1] for p in testDims))))
+                self.assertTrue(testSize2.getDimension(0) <= testSize and testSize2.getDimension(1) <= testSize2d.getDimension(1))
+                assertOriginals(testValues, testV)
+                assertOriginals([p[0] for p in testDims], testW)
+
+            partSum = Decimal(randint(1000, 100000)) / 100
+            partItems = []
+
+            for part in range(3):
+                cuts = sorted(Decimal(randint(1, int(partSum * 100) - 1)) / 100 for i in range(randint(1, 3)))
+                partItems.extend(b - a for a, b in zip([Decimal(0)] + cuts, cuts + [partSum]) if b > a)
+
+            shuffle(partItems)
+
+            for solve in [api.partitionN, api.hybridPartitionN]:
+
+                quotients, reminder, optCount = solve(partItems, 3, 0, iterCounter)
+
+                for quotient in quotients:
+                    self.assertEqual(sum(quotient.Items), sum(quotient.Sizes))
+                    self.assertEqual([partSum], quotient.Sizes)
+
+                partitioned = [n for q in quotients for n in q.Items] + list(reminder.Items)
+
+                self.assertEqual(sorted(partItems), sorted(partitioned))
+                assertOriginals(partitioned, partItems)
+
+    def test_1_meet_in_the_middle(self):
+
+        if verbose:
+            print(f"test meet in the middle gives the same results as the pareto solver for Decimal instances")
+
+        for attempt in range(1, 31):
+
+            count = randint(1, 30)
+
+            testW = [Decimal(randint(1, 10 ** 8)) / 1000 for i in range(count)]
+            testV = [Decimal(randint(1, 10 ** 8)) / 1000 for i in range(count)]
+
+            testSize = sum(testW) / randint(1, 4)
+
+            iterCounter = [0]
+
+            opt, optSize, optItems, optValues = paretoKnapsack(testSize, testW, testV, iterCounter)
+
+            mitmOpt, mitmSize, mitmItems, mitmValues = meetInTheMiddleKnapsack(testSize, testW, testV, iterCounter)
+
+            hybridOpt, hybridSize, hybridItems, hybridValues = hybridKnapsack(testSize, testW, testV, iterCounter, useMeetInTheMiddle=True)
+
+            if verbose:
+                print(f"test_1_meet_in_the_middle: attempt={attempt}; N={count}; results={opt}, {mitmOpt}, {hybridOpt}")
+
+            self.assertEqual(opt, mitmOpt)
+            self.assertEqual(opt, hybridOpt)
+            self.assertTrue(mitmSize <= testSize)
+            self.assertEqual(mitmSize, sum(mitmItems))
+            self.assertEqual(mitmOpt, sum(mitmValues))
+
+    def test_5_dense_dp(self):
+
+        if verbose:
+            print(f"test dense rolling array DP gives the same results as the sparse DP")
+
+        for attempt in range(1, 51):
+
+            count = randint(1, 40)
+
+            testW = [randint(0, 1000) for i in range(count)]
+            testV = [randint(0, 1000) for i in range(count)]
+
+            testSize = randint(0, sum(testW))
+
+            results = []
+
+            for useDenseDp in [False, True]:
+
+                iterCounter = [0]
+
+                solver = knapsackSolver(testSize, list(testW), list(testV), iterCounter, forceUseLimits=False)
+                solver.forceUseDpSolver = True
+                solver.useDenseDp = useDenseDp
+                solver.denseDpFillRate = 0
+
+                opt, optSize, optItems, optValues, optIndexes = solver.solve()
+
+                self.assertTrue(optSize <= testSize)
+                self.assertEqual(optSize, sum(optItems))
+                self.assertEqual(opt, sum(optValues))
+                self.assertEqual(optItems, [testW[i] for i in optIndexes])
+
+                results.append(opt)
+
+            denseOpt, denseSize, denseItems, denseValues = knapsack(testSize, list(testW), list(testV), [0], useDenseDp=True)
+
+            results.append(denseOpt)
+
+            if verbose:
+                print(f"test_5_dense_dp: attempt={attempt}; N={count}; size={testSize}; results={results}")
+
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(results[0], results[2])
+
+        # the engine is picked by the fill rate: small weights fill DP layers densely, large ones leave them sparse.
+        for weightRange, expectDense in [(10, True), (10 ** 6, False)]:
+
+            testW = [randint(1, weightRange) for i in range(30)]
+            testV = [randint(1, 1000) for i in range(30)]
+
+            metrics = solverMetrics()
+
+            opt, optSize, optItems, optValues = hybridKnapsack(sum(testW) // 2, testW, testV, metrics)
+            sparseOpt, sparseSize, sparseItems, sparseValues = hybridKnapsack(sum(testW) // 2, testW, testV, [0], useDenseDp=False)
+
+            self.assertEqual(sparseOpt, opt)
+            self.assertEqual(expectDense, "denseDp" in metrics.phases)
+
+    def test_6_expanding_core_files(self):
+        if verbose:   print("Run expanding core 1-0 knapsack for hardinstances_pisinger test dataset.")
+
+        testCaseW = list()
+        testCaseV = list()
+        testKnapsack = 0
+        testOpt = 0
+        rowToSkip = 0
+
+        files = [f"knapPI_{t}_100_1000" for t in range(11, 17)]
+
+        for f in files:
+
+            caseNumber = 1
+
+            testFileName = os.path.join(test_data_dir, f"hardinstances_pisinger", f"{f}.csv")
+
+            with open(testFileName, mode='r') as csvfile:
+                csvReader = csv.reader(csvfile, delimiter=',', quotechar='|')
+
+                for row in csvReader:
+
+                    if len(row) == 0:
+                        continue
+
+                    if row[0] == "-----":
+
+                        iterCounter = [0]
+
+                        t1 = time.perf_counter()
+
+                        opt, optSize, optItems, optValues = hybridKnapsack(testKnapsack, testCaseW, testCaseV, iterCounter, useExpandingCore=True)
+
+                        t2 = time.perf_counter()
+
+                        if verbose:
+                            print(f"{f} case {caseNumber} CORE {round(t2 - t1, 4)} iter {iterCounter[0]}")
+
+                        self.assertEqual(testOpt, opt)
+                        self.assertTrue(optSize <= testKnapsack)
+                        self.assertEqual(optSize, sum(optItems))
+                        self.assertEqual(opt, sum(optValues))
+
+                        testCaseW = list()
+                        testCaseV = list()
+                        testKnapsack = 0
+
+                        caseNumber += 1
+
+                        if caseNumber > 5:
+                            break
+
+                        continue
+
+                    if row[0].startswith("knapPI"):
+                        rowToSkip = 6
+
+                    if row[0].startswith("c "):
+                        testKnapsack = int(row[0].split(" ")[1])
+
+                    if row[0].startswith("z "):
+                        testOpt = int(row[0].split(" ")[1])
+
+                    rowToSkip -= 1
+
+                    if rowToSkip <= 0:
+                        testCaseW.append(int(row[2]))
+                        testCaseV.append(int(row[1]))
+
+    def test_5_decision_history(self):
+
+        if verbose:
+            print(f"test DP solvers give the same results with decision history as with full DP layers")
+
+        for attempt in range(1, 51):
+
+            count = randint(1, 18)
+
+            testW = [randint(0, 1000) for i in range(count)]
+            testV = [randint(0, 1000) for i in range(count)]
+            testD = [wPoint((w, randint(0, 1000))) for w in testW]
+
+            testSize = randint(0, sum(testW))
+            testConstraints = wPoint((testSize, randint(0, sum(testW))))
+
+            if attempt % 2 == 0:
+                testW, testV = sortReverseBoth(testW, testV)
+
+            results = []
+
+            for useDecisionHistory in [False, True]:
+
+                solver = knapsackSolver(testSize, list(testW), list(testV), [0], forceUseLimits=False)
+                solver.forceUseDpSolver = True
+                solver.useDenseDp = False
+                solver.useDecisionHistory = useDecisionHistory
+
+                opt, optSize, optItems, optValues, optIndexes = solver.solve()
+
+                subsSolver = subsetSumKnapsackSolver(testSize, list(testW), [0], forceUseLimits=False)
+                subsSolver.useDecisionHistory = useDecisionHistory
+
+                subsOpt, subsItems = subsSolver.solve()
+
+                ndSolver = knapsackNSolver(testConstraints, list(testD), list(testV), [0], wPoint((0, 0)), forceUseLimits=False)
+                ndSolver.forceUseDpSolver = True
+                ndSolver.useDecisionHistory = useDecisionHistory
+
+                ndOpt, ndSize, ndItems, ndValues = ndSolver.solve()
+
+                # the back trace when size reached stops at the first point of full size, history keeps the layers solved so far.
+                earlySolver = knapsackSolver(testSize, list(testW), list(testV), [0], forceUseLimits=False)
+                earlySolver.forceUseDpSolver = True
+                earlySolver.useDecisionHistory = useDecisionHistory
+                earlySolver.canBackTraceWhenSizeReached = True
+
+                earlyOpt, earlySize, earlyItems, earlyValues, earlyIndexes = earlySolver.solve()
+
+                self.assertTrue(earlySize <= testSize)
+                self.assertEqual(earlyOpt, sum(earlyValues))
+
+                earlyNdSolver = knapsackNSolver(testConstraints, list(testD), list(testV), [0], wPoint((0, 0)), forceUseLimits=False)
+                earlyNdSolver.forceUseDpSolver = True
+                earlyNdSolver.useDecisionHistory = useDecisionHistory
+                earlyNdSolver.canBackTraceWhenSizeReached = True
+
+                earlyNdOpt, earlyNdSize, earlyNdItems, earlyNdValues = earlyNdSolver.solve()
+
+                results.append((opt, optSize, optIndexes, subsOpt, subsItems, ndOpt, ndItems, ndValues, earlyOpt, earlyIndexes, earlyNdOpt, earlyNdItems, earlyNdValues))
+
+            if verbose:
+                print(f"test_5_decision_history: attempt={attempt}; N={count}; size={testSize}; results={results[1][0]}, {results[1][3]}, {results[1][5]}")
+
+            self.assertEqual(results[0], results[1])
@@ -112,27 +112,29 @@ class PartitionTests(unittest.TestCase):
                 if verbose:
                     print(f"case {case}", end=" ")
 
-                t1 = time.perf_counter()
+                for useBitsetGrouping in [False, True]:
 
-                partResult, reminder, optCount = partitionN(A, NU, 0, iterCounter)
+                    t1 = time.perf_counter()
 
-                tt = round(time.perf_counter() - t1, 4)
+                    partResult, reminder, optCount = partitionN(list(A), NU, 0, iterCounter, useBitsetGrouping=useBitsetGrouping)
 
-                print(f" time {tt}")
+                    tt = round(time.perf_counter() - t1, 4)
 
-                if len(reminder) != 0 or len(partResult) != NU:
+                    print(f" time {tt}; useBitsetGrouping={useBitsetGrouping}")
 
-                    if verbose:
-                        print(f"case {case}")
-                        print(f"items {A}")
-                        print(f"part result {partResult}")
-                        print(f"part reminder  {reminder}")
-                        print(f"optCount {optCount}")
-                        print(f"len {len(A)}")
-                        print(f"sum {sum(A)}")
-                        print(f"iter {iterCounter[0]}")
+                    if len(reminder) != 0 or len(partResult) != NU:
 
-                    self.assertTrue(False)
+                        if verbose:
+                            print(f"case {case}")
+                            print(f"items {A}")
+                            print(f"part result {partResult}")
+                            print(f"part reminder  {reminder}")
+                            print(f"optCount {optCount}")
+                            print(f"len {len(A)}")
+                            print(f"sum {sum(A)}")
+                            print(f"iter {iterCounter[0]}")
+
+                        self.assertTrue(False)
 
         seed(dtNow)
 